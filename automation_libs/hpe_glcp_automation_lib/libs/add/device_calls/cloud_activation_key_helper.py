@@ -1,11 +1,17 @@
 import io
-import json
 import logging
 import os
-import socket
+import warnings
 from os import path
 
-import requests
+from hpe_glcp_automation_lib.libs.add.device_calls.device_resolver import (
+    DEVICE_RESOLVER,
+    create_device_session,
+)
+from hpe_glcp_automation_lib.libs.authn.user_api.session.core.topology import (  # noqa: F401
+    CLUSTER_INFO_FILE,
+    CLUSTER_TOPOLOGY,
+)
 
 if os.getenv("POD_NAMESPACE") is not None:
     import hashlib
@@ -15,7 +21,6 @@ if os.getenv("POD_NAMESPACE") is not None:
 log = logging.getLogger(__name__)
 
 CLUSTER_PORT = 443
-CLUSTER_INFO_FILE = "/configmap/data/infra_clusterinfo.json"
 
 
 class CloudActivationKeyHelper:
@@ -24,56 +29,58 @@ class CloudActivationKeyHelper:
         self.activate_v1_device_url = "device.arubanetworks.com"
         self.DEVICE_PROVISION_URL = None
         self.CCS_DEVICE_URL = None
+        self.session = create_device_session()
 
     def resolve_device_hostname_to_IP(self, device_type=None):
         """
-        Resolves DNS name for CCS_DEVICE_URL to IP address
+        Resolves DNS name for CCS_DEVICE_URL to IP address (cached in-process)
         :return: IP address resolved to CCS_DEVICE_URL
         """
         device_endpoint_ip = None
         log.info("\nEntering resolve_device_hostname_to_IP")
 
-        with open(CLUSTER_INFO_FILE) as cluster_info:
-            cluster_info_json = cluster_info.read()
-            log.debug("Read cluster_info file as:\n {}.".format(cluster_info_json))
-            cluster_info_dict = json.loads(cluster_info_json)
-            envs = cluster_info_dict["clusterinfo"]["HOSTNAMES"]
-            if device_type == "SWITCH":
-                self.CCS_DEVICE_URL = (
-                    envs[cluster_info_dict["clusterinfo"]["READ_WRITE_REGION"]][
-                        "ccs_activate-v2_hostname"
-                    ]
-                    if "READ_WRITE_REGION" in cluster_info_dict["clusterinfo"]
-                    else envs["ccs_activate-v2_hostname"]
-                )
-            else:
-                self.CCS_DEVICE_URL = (
-                    envs[cluster_info_dict["clusterinfo"]["READ_WRITE_REGION"]][
-                        "ccs_activate-v1_hostname"
-                    ]
-                    if "READ_WRITE_REGION" in cluster_info_dict["clusterinfo"]
-                    else envs["ccs_activate-v1_hostname"]
-                )
+        hostnames = CLUSTER_TOPOLOGY.get_topology().hostnames
+        if device_type == "SWITCH":
+            self.CCS_DEVICE_URL = hostnames["ccs_activate-v2_hostname"]
+        else:
+            self.CCS_DEVICE_URL = hostnames["ccs_activate-v1_hostname"]
 
         log.info("\nAttempting to resolve: {}".format(self.CCS_DEVICE_URL))
-        device_endpoint_ip = socket.gethostbyname(self.CCS_DEVICE_URL)
+        device_endpoint_ip = DEVICE_RESOLVER.lookup(self.CCS_DEVICE_URL)
         log.info("\nDevice endpoint IP : {}".format(device_endpoint_ip))
         return device_endpoint_ip
 
+    def pin_device_endpoint(self, device_endpoint_ip, device_endpoint_url):
+        """
+        Pin Hostname to IP in-process for the requests of this helper
+        (/etc/hosts file is not modified)
+        :param device_endpoint_ip: IP address resolved to CCS_DEVICE_URL
+        :param device_endpoint_url: hpe_device_url or aruba_device_url
+        """
+        if device_endpoint_ip is None:
+            log.error(
+                f"\nUnable to pin {device_endpoint_url}, device endpoint IP is unknown!\n"
+            )
+            return
+        DEVICE_RESOLVER.pin(device_endpoint_url, device_endpoint_ip)
+
     def make_entry_in_pods_hosts_file(self, device_endpoint_ip, device_endpoint_url):
         """
-        add Hostname and IP to /etc/hosts file
-        :param device_endpoint_ip: CCS_DEVICE_URL
+        Deprecated, use pin_device_endpoint(). /etc/hosts is no longer modified:
+        the URL is pinned for the requests of self.session only, plain requests
+        calls and other clients resolve it via DNS.
+        :param device_endpoint_ip: IP address resolved to CCS_DEVICE_URL
         :param device_endpoint_url: hpe_device_url or aruba_device_url
         """
-        try:
-            with open("/etc/hosts", "a") as f:
-                f.write("\n{} {}".format(device_endpoint_ip, device_endpoint_url))
-            with open("/etc/hosts", "r") as f:
-                hosts_file = f.read()
-                log.info("IP : {}".format(hosts_file))
-        except Exception as e:
-            log.error("\nUnable to add Hostname and IP to /etc/hosts file!\n".format(e))
+        message = (
+            "make_entry_in_pods_hosts_file() is deprecated and does not modify "
+            f"/etc/hosts anymore, {device_endpoint_url} is pinned to "
+            f"{device_endpoint_ip} for the requests of self.session only, "
+            "use pin_device_endpoint()"
+        )
+        warnings.warn(message, DeprecationWarning, stacklevel=2)
+        log.warning(message)
+        self.pin_device_endpoint(device_endpoint_ip, device_endpoint_url)
 
     def get_cloud_activation_key_for_switch_device(
         self, serial_number, mac_address, part_number, certs
@@ -111,16 +118,14 @@ class CloudActivationKeyHelper:
             "request_body": {},
             "cert": certs,
         }
-        self.make_entry_in_pods_hosts_file(
+        self.pin_device_endpoint(
             device_endpoint_ip=cluster_device_endpoint_ip,
             device_endpoint_url=self.activate_v2_device_url,
         )
         self.DEVICE_PROVISION_URL = (
             f"https://{self.activate_v2_device_url}:{CLUSTER_PORT}"
         )
-        log.info(
-            "\nRESOLVED IP FOR DEVICE ENDPOINT AND MADE ENTRY IN ETC/HOSTS FILE FOR POD\n"
-        )
+        log.info("\nRESOLVED IP FOR DEVICE ENDPOINT AND PINNED IT FOR DEVICE REQUESTS\n")
 
         response = getattr(self, method.lower())(
             endpoint,
@@ -152,7 +157,7 @@ class CloudActivationKeyHelper:
         """
 
         cluster_device_endpoint_ip = self.resolve_device_hostname_to_IP(device_type="IAP")
-        self.make_entry_in_pods_hosts_file(
+        self.pin_device_endpoint(
             device_endpoint_ip=cluster_device_endpoint_ip,
             device_endpoint_url=self.activate_v1_device_url,
         )
@@ -170,7 +175,7 @@ class CloudActivationKeyHelper:
             "X-Ap-Info": ap_info,
             "Connection": "Keep-Alive",
         }
-        resp = requests.post(act_url, verify=False, headers=headers)
+        resp = self.session.post(act_url, verify=False, headers=headers)
         session_id = resp.headers.get("X-Session-Id")
         challenge = resp.headers.get("X-Challenge")
         challenge1 = challenge.encode("utf-8")
@@ -201,7 +206,7 @@ class CloudActivationKeyHelper:
             "Connection": "close",
         }
         log.debug("Request from client for challenge {}".format(headers))
-        resp = requests.post(act_url, verify=False, headers=headers, data=data)
+        resp = self.session.post(act_url, verify=False, headers=headers, data=data)
         log.debug(
             "Response from server for final provision {} {} {}".format(
                 resp.headers, resp.status_code, session_id
@@ -228,7 +233,7 @@ class CloudActivationKeyHelper:
                 path.join(self.DEVICE_PROVISION_URL, endpoint), headers
             )
         )
-        response = requests.post(
+        response = self.session.post(
             path.join(self.DEVICE_PROVISION_URL, endpoint),
             cert=(cert, key),
             headers=headers,
@@ -4,10 +4,13 @@ Activate Device Direct Provisioning API Library
 import io
 import logging
 import os
-import socket
+import warnings
 from os import path
 
-import requests
+from hpe_glcp_automation_lib.libs.add.device_calls.device_resolver import (
+    DEVICE_RESOLVER,
+    create_device_session,
+)
 
 if os.getenv("POD_NAMESPACE") is not None:
     import hashlib
@@ -59,35 +62,51 @@ class NetworkStorageComputeDeviceProvisionHelper(object):
         self.mac_address = mac_address
         self.CLUSTER_PORT = CLUSTER_PORT
         self.device_ca_file = False
+        self.session = create_device_session()
 
     def resolve_device_hostname_to_IP(self):
         """
-        Resolves DNS name for CCS_DEVICE_URL to IP address
+        Resolves DNS name for CCS_DEVICE_URL to IP address (cached in-process)
         :return: IP address resolves to CCS_DEVICE_URL
         """
         try:
-            device_endpoint_ip = socket.gethostbyname(self.CCS_DEVICE_URL)
+            device_endpoint_ip = DEVICE_RESOLVER.lookup(self.CCS_DEVICE_URL)
             log.info("\nDevice endpoint IP : {}".format(device_endpoint_ip))
             return device_endpoint_ip
         except Exception as e:
             log.error("\nUnable to get Hostname and IP!\n".format(e))
 
+    def pin_device_endpoint(self, device_endpoint_ip, device_endpoint_url):
+        """
+        Pin Hostname to IP in-process for the requests of this helper
+        (/etc/hosts file is not modified)
+        :param device_endpoint_ip: IP address resolved to CCS_DEVICE_URL
+        :param device_endpoint_url: hpe_device_url or aruba_device_url
+        """
+        if device_endpoint_ip is None:
+            log.error(
+                f"\nUnable to pin {device_endpoint_url}, device endpoint IP is unknown!\n"
+            )
+            return
+        DEVICE_RESOLVER.pin(device_endpoint_url, device_endpoint_ip)
+
     def make_entry_in_pods_hosts_file(self, device_endpoint_ip, device_endpoint_url):
         """
-        add Hostname and IP to /etc/hosts file
-        :param device_endpoint_ip: CCS_DEVICE_URL
+        Deprecated, use pin_device_endpoint(). /etc/hosts is no longer modified:
+        the URL is pinned for the requests of self.session only, plain requests
+        calls and other clients resolve it via DNS.
+        :param device_endpoint_ip: IP address resolved to CCS_DEVICE_URL
         :param device_endpoint_url: hpe_device_url or aruba_device_url
         """
-        try:
-            with open("/etc/hosts", "a") as f:
-                f.write("\n{} {}".format(device_endpoint_ip, device_endpoint_url))
-                f.close()
-            with open("/etc/hosts", "r") as f:
-                hosts_file = f.read()
-                log.info("IP : {}".format(hosts_file))
-                f.close()
-        except Exception as e:
-            log.error("\nUnable to add Hostname and IP to /etc/hosts file!\n".format(e))
+        message = (
+            "make_entry_in_pods_hosts_file() is deprecated and does not modify "
+            f"/etc/hosts anymore, {device_endpoint_url} is pinned to "
+            f"{device_endpoint_ip} for the requests of self.session only, "
+            "use pin_device_endpoint()"
+        )
+        warnings.warn(message, DeprecationWarning, stacklevel=2)
+        log.warning(message)
+        self.pin_device_endpoint(device_endpoint_ip, device_endpoint_url)
 
     def make_device_provision_request(self):
         """
@@ -98,7 +117,7 @@ class NetworkStorageComputeDeviceProvisionHelper(object):
         method = "get"
         headers = {}
         api_path = None
-        self.make_entry_in_pods_hosts_file(
+        self.pin_device_endpoint(
             device_endpoint_ip=cluster_device_endpoint_ip,
             device_endpoint_url=self.hpe_device_url,
         )
@@ -141,7 +160,7 @@ class NetworkStorageComputeDeviceProvisionHelper(object):
                 api_path = "storage-provision"
                 headers["X-Mode"] = "STORAGE"
             elif self.certs["type"] == "sdwan_device_wrong_mode_with_x_ap_info":
-                self.make_entry_in_pods_hosts_file(
+                self.pin_device_endpoint(
                     device_endpoint_ip=cluster_device_endpoint_ip,
                     device_endpoint_url=self.devices_v2_url,
                 )
@@ -159,9 +178,7 @@ class NetworkStorageComputeDeviceProvisionHelper(object):
             "request_body": {},
             "cert": self.certs,
         }
-        log.info(
-            "\nRESOLVED IP FOR DEVICE ENDPOINT AND MADE ENTRY IN ETC/HOSTS FILE FOR POD\n"
-        )
+        log.info("\nRESOLVED IP FOR DEVICE ENDPOINT AND PINNED IT FOR DEVICE REQUESTS\n")
 
         response = getattr(self, method.lower())(
             api_path,
@@ -195,7 +212,7 @@ class NetworkStorageComputeDeviceProvisionHelper(object):
                 path.join(self.DEVICE_PROVISION_URL, api_path), headers, cert
             )
         )
-        response = requests.get(
+        response = self.session.get(
             path.join(self.DEVICE_PROVISION_URL, api_path),
             cert=(cert, key),
             headers=headers,
@@ -209,7 +226,7 @@ class NetworkStorageComputeDeviceProvisionHelper(object):
         :return: provision response for provision request
         """
         cluster_device_endpoint_ip = self.resolve_device_hostname_to_IP()
-        self.make_entry_in_pods_hosts_file(
+        self.pin_device_endpoint(
             device_endpoint_ip=cluster_device_endpoint_ip,
             device_endpoint_url=self.aruba_device_url,
         )
@@ -230,7 +247,7 @@ class NetworkStorageComputeDeviceProvisionHelper(object):
         ap_info = self.serial_number + "," + self.mac_address + "," + self.part_number
         headers["X-Ap-Info"] = ap_info
         headers["Connection"] = "Keep-Alive"
-        resp = requests.post(act_url, verify=False, headers=headers)
+        resp = self.session.post(act_url, verify=False, headers=headers)
         session = resp.headers.get("X-Session-Id")
         challenge = resp.headers.get("X-Challenge")
         challenge1 = challenge.encode("utf-8")
@@ -263,7 +280,7 @@ class NetworkStorageComputeDeviceProvisionHelper(object):
         headers["X-Challenge-Hash"] = "SHA-1"
         headers["Connection"] = "close"
         logging.info("Response from client for challenge {} {}".format(headers, session))
-        resp = requests.post(act_url, verify=False, headers=headers, data=data)
+        resp = self.session.post(act_url, verify=False, headers=headers, data=data)
         logging.info(
             "response from server for final provision {} {} {}".format(
                 resp.headers, resp.status_code, session
@@ -281,7 +298,7 @@ class NetworkStorageComputeDeviceProvisionHelper(object):
          :return: firmware response for firmware request
         """
         cluster_device_endpoint_ip = self.resolve_device_hostname_to_IP()
-        self.make_entry_in_pods_hosts_file(
+        self.pin_device_endpoint(
             device_endpoint_ip=cluster_device_endpoint_ip,
             device_endpoint_url=self.aruba_device_url,
         )
@@ -307,7 +324,7 @@ class NetworkStorageComputeDeviceProvisionHelper(object):
                 act_url, headers
             )
         )
-        resp = requests.post(act_url, verify=False, headers=headers)
+        resp = self.session.post(act_url, verify=False, headers=headers)
         session = resp.headers.get("X-Session-Id")
         challenge = resp.headers.get("X-Challenge")
         challenge1 = challenge.encode("utf-8")
@@ -346,7 +363,7 @@ class NetworkStorageComputeDeviceProvisionHelper(object):
                 headers, session
             )
         )
-        resp = requests.post(act_url, verify=False, headers=headers, data=data)
+        resp = self.session.post(act_url, verify=False, headers=headers, data=data)
         logging.info(
             "\nresponse from server for final provision: {} \nheaders: {} \nstatus_code: {} session: {}".format(
                 resp.text, resp.headers, resp.status_code, session
@@ -386,16 +403,14 @@ class NetworkStorageComputeDeviceProvisionHelper(object):
             "request_body": {},
             "cert": self.certs,
         }
-        self.make_entry_in_pods_hosts_file(
+        self.pin_device_endpoint(
             device_endpoint_ip=cluster_device_endpoint_ip,
             device_endpoint_url=self.activate_v2_device_url,
         )
         self.DEVICE_PROVISION_URL = "https://{}:{}".format(
             self.activate_v2_device_url, self.CLUSTER_PORT
         )
-        log.info(
-            "\nRESOLVED IP FOR DEVICE ENDPOINT AND MADE ENTRY IN ETC/HOSTS FILE FOR POD\n"
-        )
+        log.info("\nRESOLVED IP FOR DEVICE ENDPOINT AND PINNED IT FOR DEVICE REQUESTS\n")
         response = getattr(self, method.lower())(
             endpoint,
             headers=headers,
@@ -418,7 +433,7 @@ class NetworkStorageComputeDeviceProvisionHelper(object):
            :return: est provision response for VGW device.
         """
         cluster_device_endpoint_ip = self.resolve_device_hostname_to_IP()
-        self.make_entry_in_pods_hosts_file(
+        self.pin_device_endpoint(
             device_endpoint_ip=cluster_device_endpoint_ip,
             device_endpoint_url=self.aruba_device_url,
         )
@@ -439,7 +454,7 @@ class NetworkStorageComputeDeviceProvisionHelper(object):
                 act_url, headers
             )
         )
-        resp = requests.post(act_url, verify=False, headers=headers)
+        resp = self.session.post(act_url, verify=False, headers=headers)
         log.info(
             "\nAPI RESPONSE : status: {}, response_text: {}, response_headers: {}\n".format(
                 resp.status_code, resp.text, resp.headers
@@ -455,7 +470,7 @@ class NetworkStorageComputeDeviceProvisionHelper(object):
            :return: est verify challenge response for VGW device.
         """
         cluster_device_endpoint_ip = self.resolve_device_hostname_to_IP()
-        self.make_entry_in_pods_hosts_file(
+        self.pin_device_endpoint(
             device_endpoint_ip=cluster_device_endpoint_ip,
             device_endpoint_url=self.aruba_device_url,
         )
@@ -475,7 +490,7 @@ class NetworkStorageComputeDeviceProvisionHelper(object):
                 act_url, verify_est_body, headers
             )
         )
-        resp = requests.post(
+        resp = self.session.post(
             act_url, data=verify_est_body, headers=headers, params=params, verify=False
         )
         logging.info(
@@ -507,7 +522,7 @@ class NetworkStorageComputeDeviceProvisionHelper(object):
             )
         )
 
-        response = requests.post(
+        response = self.session.post(
             path.join(self.DEVICE_PROVISION_URL, endpoint),
             cert=(cert, key),
             headers=headers,
@@ -0,0 +1,25 @@
+"""
+In-process Resolver of the Device Provisioning Endpoints
+"""
+import requests
+
+from hpe_glcp_automation_lib.libs.authn.user_api.session.core.resolver import (
+    DNSResolver,
+    PinnedHTTPAdapter,
+)
+
+# Public device URLs (Aruba, HPE, activate) pinned to the device URL of the
+# cluster under test, shared by all device provisioning helpers of the process
+DEVICE_RESOLVER = DNSResolver()
+DEVICE_ADAPTER = PinnedHTTPAdapter(DEVICE_RESOLVER)
+
+
+def create_device_session():
+    """
+    Create requests.Session connecting the pinned device URLs to the cluster under test
+    :return: requests.Session object
+    """
+    session = requests.Session()
+    session.mount("https://", DEVICE_ADAPTER)
+    session.mount("http://", DEVICE_ADAPTER)
+    return session
@@ -5,6 +5,10 @@ import logging
 import time
 import uuid
 
+from hpe_glcp_automation_lib.libs.authn.user_api.session.core.pagination import (
+    PAGE,
+    Paginator,
+)
 from hpe_glcp_automation_lib.libs.commons.app_api.app_session import AppSession
 
 log = logging.getLogger(__name__)
@@ -146,28 +150,53 @@ class ActivateInventory(AppSession):
         :param device_part_number: part_number of a device
         :return: True is serial_number is in response, False otherwise
         """
-        page_num = 0
-        found_device = False
-        total_count = 1
-        count_per_page = 0
-
-        # Check if serial exists in each page, if not increament page and make another call
-        while (total_count > count_per_page) and found_device == False:
-            url = f"{self.base_url}{self.base_path}{self.api_version}/devices/{platform_customer_id}?page={page_num}"
-            resp = self.get(url=url)
-            # log.info(resp)
-            total_count = resp["pagination"]["total_count"]
-            count_per_page = resp["pagination"]["count_per_page"]
-            page_num += 1
-            devices_list = resp["devices"]
-            if len(devices_list) == 0:
-                log.info("device is not found")
-                return False
-            for device in devices_list:
-                if device_serial_number == device["serial_number"]:
-                    found_device = True
-                    break
-        return found_device
+        # Pages are requested only until the serial is found
+        for device in self.iter_devices_by_pcid(platform_customer_id):
+            if device_serial_number == device["serial_number"]:
+                return True
+        log.info("device is not found")
+        return False
+
+    def iter_devices_by_pcid(
+        self,
+        platform_customer_id,
+        limit=2000,
+        device_type=None,
+        archived_only=None,
+        concurrency=1,
+        ordered=True,
+    ):
+        """
+        Lazily iterate over the devices of a platform customer across all pages,
+        requesting the next page only when the devices of the previous one are consumed
+        :param platform_customer_id: platform_customer_id of the customer
+        :param limit: limit per page
+        :param device_type: string Enum: "AP" "SWITCH" "GATEWAY" "STORAGE" "DHCI_STORAGE" "COMPUTE" "DHCI_COMPUTE" "NW_THIRD_PARTY"
+        :param archived_only: string Enum: "HIDE_ARCHIVED" "ARCHIVED_ONLY" "ALL"
+        :param concurrency: max number of pages fetched in parallel after the first one
+        :param ordered: yield the devices in the page order (False - as pages arrive)
+        :return: Paginator object (iterable of the devices)
+        """
+
+        def fetch(paging_params):
+            resp = self.get_devices_by_pcid(
+                platform_customer_id,
+                limit=paging_params["limit"],
+                page=paging_params["page"],
+                device_type=device_type,
+                archived_only=archived_only,
+            )
+            resp.raise_for_status()
+            return resp
+
+        return Paginator(
+            fetch,
+            items_key="devices",
+            style=PAGE,
+            page_size=limit,
+            concurrency=concurrency,
+            ordered=ordered,
+        )
 
     # **************************
     # Base APP API calls go here
@@ -449,13 +478,13 @@ class ActivateInventory(AppSession):
             local_headers["CCS-Platform-Customer-Id"] = platform_customer_id
         if username:
             local_headers["CCS-Username"] = username
-        if local_headers:
-            self.session.headers.update(local_headers)
 
-        log.info(f"****Headers prov app to device: {self.session.headers}")
+        log.info(f"****Headers prov app to device: {local_headers}")
         url_prov = f"{self.base_url}{self.base_path}{self.api_version}/devices/application/{acid}/provision"
         log.info(f"Prov device to acid url:{url_prov}  payload:{payload}  acid:{acid}")
-        res = self.post(url=url_prov, json=payload, ignore_handle_response=True)
+        res = self.post(
+            url=url_prov, headers=local_headers, json=payload, ignore_handle_response=True
+        )
         log.info(f"************************* app provision Res ** :{vars(res)}")
         return res
 
@@ -561,15 +590,12 @@ class ActivateInventory(AppSession):
         claim_verify_url = (
             f"{self.base_url}{self.base_path}{self.api_version}/devices/verify_claim"
         )
-        if not headers:
-            verify_res = self.post(
-                url=claim_verify_url, json=payload, ignore_handle_response=True
-            )
-        else:
-            self.session.headers.update(headers)
-            verify_res = self.post(
-                url=claim_verify_url, json=payload, ignore_handle_response=True
-            )
+        verify_res = self.post(
+            url=claim_verify_url,
+            headers=headers,
+            json=payload,
+            ignore_handle_response=True,
+        )
 
         log.info(f"response claim Verify: {verify_res}")
         return verify_res
@@ -644,11 +670,11 @@ class ActivateInventory(AppSession):
         :param pcid: plaform_customer_id
         :param devices: list of devices e.g. {"devices": [{"serial_number": serial_number,"archive": boolean}]}
         """
-        self.session.headers.update({"CCS-Platform-Customer-Id": pcid})
+        headers = {"CCS-Platform-Customer-Id": pcid}
         url = f"{self.base_url}{self.base_path}{self.api_version}/devices/archive"
         log.info(url)
         log.info(devices)
-        resp = self.patch(url, json=devices, ignore_handle_response=True)
+        resp = self.patch(url, headers=headers, json=devices, ignore_handle_response=True)
         return resp
 
     def move_device_to_folder(
@@ -740,10 +766,11 @@ class ActivateInventory(AppSession):
         if username:
             headers["CCS-Username"] = username
 
-        self.session.headers.update(headers)
         url = f"{self.base_url}{self.base_path}{self.api_version}/devices/application/{application_customer_id}/device"
         payload = {"device_type": device_type, "part_number": part_number}
-        response = self.post(url=url, json=payload, ignore_handle_response=True)
+        response = self.post(
+            url=url, headers=headers, json=payload, ignore_handle_response=True
+        )
         log.info(f"Response from create delete vgw devices {vars(response)}")
         log.info(
             f"This is the whole response after creating the device: {response.json()}"
@@ -822,14 +849,14 @@ class ActivateInventory(AppSession):
             local_headers["CCS-Platform-Customer-Id"] = platform_customer_id
         if username:
             local_headers["CCS-Username"] = username
-        if local_headers:
-            self.session.headers.update(local_headers)
 
         # Build the URL
         url = f"{self.base_url}{self.base_path}{self.api_version}/devices/application/unprovision"
 
         # Make the POST request and get the response
-        response = self.post(url=url, json=payload, ignore_handle_response=True)
+        response = self.post(
+            url=url, headers=local_headers, json=payload, ignore_handle_response=True
+        )
 
         # Log the response and return it
         log.info(f"response from unprovision device from application: {response.text}")
@@ -894,11 +921,9 @@ class ActivateInventory(AppSession):
             local_headers["CCS-Platform-Customer-Id"] = platform_customer_id
         if username:
             local_headers["CCS-Username"] = username
-        if local_headers:
-            self.session.headers.update(local_headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/application-instances/{application_instance_id}"
-        response = self.get(url=url, ignore_handle_response=True)
+        response = self.get(url=url, headers=local_headers, ignore_handle_response=True)
         log.debug(f"response from get application instance: {response.text}")
         return response
 
@@ -915,8 +940,6 @@ class ActivateInventory(AppSession):
         local_headers = {"CCS-Transaction-Id": "app_get_rules_" + uuid.uuid1().hex}
         if pcid:
             local_headers["CCS-Platform-Customer-Id"] = pcid
-        if local_headers:
-            self.session.headers.update(local_headers)
 
         query_param = {"limit": limit, "page": page}
         if search_string:
@@ -926,7 +949,12 @@ class ActivateInventory(AppSession):
             query_param["folder_ids"] = folder_ids
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/rules"
-        res = self.get(url=url, params=query_param, ignore_handle_response=True)
+        res = self.get(
+            url=url,
+            headers=local_headers,
+            params=query_param,
+            ignore_handle_response=True,
+        )
         return res
 
     def create_rule(self, pcid, payload):
@@ -939,11 +967,11 @@ class ActivateInventory(AppSession):
         local_headers = {"CCS-Transaction-Id": "app_create_rules_" + uuid.uuid1().hex}
         if pcid:
             local_headers["CCS-Platform-Customer-Id"] = pcid
-        if local_headers:
-            self.session.headers.update(local_headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/rules"
-        res = self.post(url=url, json=payload, ignore_handle_response=True)
+        res = self.post(
+            url=url, headers=local_headers, json=payload, ignore_handle_response=True
+        )
         return res
 
     def update_rule(self, pcid, rule_id, payload):
@@ -957,11 +985,11 @@ class ActivateInventory(AppSession):
         local_headers = {"CCS-Transaction-Id": "app_update_rules_" + uuid.uuid1().hex}
         if pcid:
             local_headers["CCS-Platform-Customer-Id"] = pcid
-        if local_headers:
-            self.session.headers.update(local_headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/rules/{rule_id}"
-        res = self.put(url=url, json=payload, ignore_handle_response=True)
+        res = self.put(
+            url=url, headers=local_headers, json=payload, ignore_handle_response=True
+        )
         return res
 
     def delete_rule(self, pcid, rule_id):
@@ -974,11 +1002,9 @@ class ActivateInventory(AppSession):
         local_headers = {"CCS-Transaction-Id": "app_delete_rules_" + uuid.uuid1().hex}
         if pcid:
             local_headers["CCS-Platform-Customer-Id"] = pcid
-        if local_headers:
-            self.session.headers.update(local_headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/rules/{rule_id}"
-        res = self.delete(url=url, ignore_handle_response=True)
+        res = self.delete(url=url, headers=local_headers, ignore_handle_response=True)
         return res
 
     def get_folders(
@@ -1008,8 +1034,6 @@ class ActivateInventory(AppSession):
         local_headers = {"CCS-Transaction-Id": "app_get_rules_" + uuid.uuid1().hex}
         if pcid:
             local_headers["CCS-Platform-Customer-Id"] = pcid
-        if local_headers:
-            self.session.headers.update(local_headers)
 
         query_param = {"limit": limit, "page": page}
         if folder_name:
@@ -1028,7 +1052,12 @@ class ActivateInventory(AppSession):
             query_param["sort_order"] = sort_order
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/folders"
-        res = self.get(url=url, params=query_param, ignore_handle_response=True)
+        res = self.get(
+            url=url,
+            headers=local_headers,
+            params=query_param,
+            ignore_handle_response=True,
+        )
         return res
 
     def create_folder(self, pcid, payload):
@@ -1041,11 +1070,11 @@ class ActivateInventory(AppSession):
         local_headers = {"CCS-Transaction-Id": "app_create_rules_" + uuid.uuid1().hex}
         if pcid:
             local_headers["CCS-Platform-Customer-Id"] = pcid
-        if local_headers:
-            self.session.headers.update(local_headers)
         url = f"{self.base_url}{self.base_path}{self.api_version}/folders"
         log.info(f"Url: {url} , payload: {payload}")
-        res = self.post(url=url, json=payload, ignore_handle_response=True)
+        res = self.post(
+            url=url, headers=local_headers, json=payload, ignore_handle_response=True
+        )
         return res
 
     def update_folder(self, pcid, folder_id, payload):
@@ -1059,11 +1088,11 @@ class ActivateInventory(AppSession):
         local_headers = {"CCS-Transaction-Id": "app_update_folder_" + uuid.uuid1().hex}
         if pcid:
             local_headers["CCS-Platform-Customer-Id"] = pcid
-        if local_headers:
-            self.session.headers.update(local_headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/folders/{folder_id}"
-        res = self.put(url=url, json=payload, ignore_handle_response=True)
+        res = self.put(
+            url=url, headers=local_headers, json=payload, ignore_handle_response=True
+        )
         return res
 
     def delete_folder(self, pcid, folder_id):
@@ -1076,11 +1105,9 @@ class ActivateInventory(AppSession):
         local_headers = {"CCS-Transaction-Id": "app_delete_folder_" + uuid.uuid1().hex}
         if pcid:
             local_headers["CCS-Platform-Customer-Id"] = pcid
-        if local_headers:
-            self.session.headers.update(local_headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/folders/{folder_id}"
-        res = self.delete(url=url, ignore_handle_response=True)
+        res = self.delete(url=url, headers=local_headers, ignore_handle_response=True)
         return res
 
     def get_rule_of_folder(self, pcid, folder_id, rule_name):
@@ -1096,11 +1123,9 @@ class ActivateInventory(AppSession):
         local_headers = {"CCS-Transaction-Id": "app_get_rules_" + uuid.uuid1().hex}
         if pcid:
             local_headers["CCS-Platform-Customer-Id"] = pcid
-        if local_headers:
-            self.session.headers.update(local_headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/folders/{folder_id}/rules/{rule_name}"
-        res = self.get(url=url, ignore_handle_response=True)
+        res = self.get(url=url, headers=local_headers, ignore_handle_response=True)
         return res
 
     def create_activate_device_token(self, pcid, user_name):
@@ -1115,9 +1140,8 @@ class ActivateInventory(AppSession):
             "Content-Type": "application/json",
             "CCS-Platform-Customer-Id": pcid,
         }
-        self.session.headers.update(headers)
         url = f"{self.base_url}/activate-bridge/internal{self.api_version}/token?email={user_name}"
-        res = self.post(url=url, ignore_handle_response=True)
+        res = self.post(url=url, headers=headers, ignore_handle_response=True)
         return res
 
     def create_simulated_device(
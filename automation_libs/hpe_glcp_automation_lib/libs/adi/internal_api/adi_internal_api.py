@@ -12,6 +12,10 @@ from functools import wraps
 
 import jwt
 
+from hpe_glcp_automation_lib.libs.authn.user_api.session.core.pagination import (
+    PAGE,
+    Paginator,
+)
 from hpe_glcp_automation_lib.libs.authn.user_api.session.core.session import Session
 from hpe_glcp_automation_lib.libs.commons.common_testbed_data.settings import Settings
 
@@ -187,25 +191,57 @@ class ActivateInventoryInternal(Session):
         # Set headers
         if transaction_id is None:
             transaction_id = f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}"
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_id,
-                "CCS-Transaction-Id": transaction_id,
-                "Content-Type": "application/json",
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_id,
+            "CCS-Transaction-Id": transaction_id,
+            "Content-Type": "application/json",
+        }
 
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/devices"
         log.info(f"{url}")
         if self.is_onprem:
             response = self.get(
-                url=url, params=qparams, ignore_handle_response=True, verify=False
+                url=url,
+                params=qparams,
+                headers=headers,
+                ignore_handle_response=True,
+                verify=False,
             )
         else:
-            response = self.get(url=url, params=qparams, ignore_handle_response=True)
+            response = self.get(
+                url=url, params=qparams, headers=headers, ignore_handle_response=True
+            )
         log.info(f"Response of API request[tx:{transaction_id}]: {response}")
         return response
 
+    def iter_devices_by_pcid(
+        self, platform_id, limit=2000, concurrency=1, ordered=True, **filters
+    ):
+        """
+        Lazily iterate over the devices of the given platform_id across all pages,
+        requesting the next page only when the devices of the previous one are consumed
+        :param platform_id: platform_id
+        :param limit: limit per page
+        :param concurrency: max number of pages fetched in parallel after the first one
+        :param ordered: yield the devices in the page order (False - as pages arrive)
+        :param filters: Filter params of get_devices_by_pcid (device_type, serial_number, ...)
+        :return: Paginator object (iterable of the devices)
+        """
+
+        def fetch(paging_params):
+            response = self.get_devices_by_pcid(platform_id, **paging_params, **filters)
+            response.raise_for_status()
+            return response
+
+        return Paginator(
+            fetch,
+            items_key="devices",
+            style=PAGE,
+            page_size=limit,
+            concurrency=concurrency,
+            ordered=ordered,
+        )
+
     @_log_response
     def get_device_history(self, **params):
         """
@@ -220,22 +256,22 @@ class ActivateInventoryInternal(Session):
         API Example : /activate-inventory/internal/v1/device-history?start-time=1683194757630& \
                       end-time=1683194757640&countries=US,IN&limit=1000&offset=0&distinct=false
         """
-        self.session.headers.update(
-            {
-                "accept": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
-        log.info("Session : {}".format(self.session.headers))
+        headers = {
+            "accept": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
+        log.info("Headers : {}".format(headers))
         if self.is_onprem:
             return self.get(
                 url=self._get_path_v1("device-history"),
+                headers=headers,
                 params=params,
                 ignore_handle_response=True,
                 verify=False,
             )
         return self.get(
             url=self._get_path_v1("device-history"),
+            headers=headers,
             params=params,
             ignore_handle_response=True,
         )
@@ -250,22 +286,22 @@ class ActivateInventoryInternal(Session):
         API Example: /activate-inventory/internal/v1/firmware-blocked-devices?\
                      limit=1000&offset=0
         """
-        self.session.headers.update(
-            {
-                "accept": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
-        log.info("Session : {}".format(self.session.headers))
+        headers = {
+            "accept": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
+        log.info("Headers : {}".format(headers))
         if self.is_onprem:
             return self.get(
                 url=self._get_path_v1("firmware-blocked-devices"),
+                headers=headers,
                 params=params,
                 ignore_handle_response=True,
                 verify=False,
             )
         return self.get(
             url=self._get_path_v1("firmware-blocked-devices"),
+            headers=headers,
             params=params,
             ignore_handle_response=True,
         )
@@ -282,23 +318,23 @@ class ActivateInventoryInternal(Session):
         API Example: /activate-inventory/internal/v1/firmware-blocked-devices?operation=firmware_lock
         """
 
-        self.session.headers.update(
-            {
-                "accept": "application/json",
-                "Content-Type": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
-        log.info("Session : {}".format(self.session.headers))
+        headers = {
+            "accept": "application/json",
+            "Content-Type": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
+        log.info("Headers : {}".format(headers))
         if self.is_onprem:
             return self.patch(
                 url=self._get_path_v1("firmware-blocked-devices"),
+                headers=headers,
                 params=operation,
                 json=device_payload,
                 ignore_handle_response=True,
             )
         return self.patch(
             url=self._get_path_v1("firmware-blocked-devices"),
+            headers=headers,
             params=operation,
             json=device_payload,
             ignore_handle_response=True,
@@ -318,23 +354,23 @@ class ActivateInventoryInternal(Session):
             select : Can be set to 'application', 'childDevices', 'folder', 'tags' or 'subscription'
             sort : Sort the results by asc or desc. Default asc
         """
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": pcid,
-                "Content-Type": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
-        log.info("Session : {}".format(self.session.headers))
+        headers = {
+            "CCS-Platform-Customer-Id": pcid,
+            "Content-Type": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
+        log.info("Headers : {}".format(headers))
         if self.is_onprem:
             return self.get(
                 url=self._get_path_v2("devices"),
+                headers=headers,
                 params=params,
                 ignore_handle_response=True,
                 verify=False,
             )
         return self.get(
             url=self._get_path_v2("devices"),
+            headers=headers,
             params=params,
             ignore_handle_response=True,
         )
@@ -348,24 +384,26 @@ class ActivateInventoryInternal(Session):
         username : Customer username
         data: Payload data which has device inventory info
         """
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": pcid,
-                "CCS-Username": username,
-                "Content-Type": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
-        log.info("Session : {}".format(self.session.headers))
+        headers = {
+            "CCS-Platform-Customer-Id": pcid,
+            "CCS-Username": username,
+            "Content-Type": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
+        log.info("Headers : {}".format(headers))
         if self.is_onprem:
             return self.post(
                 url=self._get_path_v2("devices"),
+                headers=headers,
                 json=data,
                 ignore_handle_response=True,
                 verify=False,
             )
         return self.post(
-            url=self._get_path_v2("devices"), json=data, ignore_handle_response=True
+            url=self._get_path_v2("devices"),
+            headers=headers,
+            json=data,
+            ignore_handle_response=True,
         )
 
     @_log_response
@@ -374,21 +412,21 @@ class ActivateInventoryInternal(Session):
         Get the async operation status
         task_id : Task ID of the task (upload_device_inventory)
         """
-        self.session.headers.update(
-            {
-                "accept": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
-        log.info("Session : {}".format(self.session.headers))
+        headers = {
+            "accept": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
+        log.info("Headers : {}".format(headers))
         if self.is_onprem:
             return self.get(
                 url=self._get_path_v2(f"async-operations/{task_id}"),
+                headers=headers,
                 ignore_handle_response=True,
                 verify=False,
             )
         return self.get(
             url=self._get_path_v2(f"async-operations/{task_id}"),
+            headers=headers,
             ignore_handle_response=True,
         )
 
@@ -399,19 +437,17 @@ class ActivateInventoryInternal(Session):
         platform customer id is in the header of the request
         """
 
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_id,
-                "CCS-Transaction-Id": uuid.uuid1().hex,
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_id,
+            "CCS-Transaction-Id": uuid.uuid1().hex,
+        }
         data = {"devices": [{"serial": serial, "entitlement_id": serial}]}
         url = f"{self.base_url}/activate-inventory/internal/v1/devices/claim-serialentitlement"
         log.info(url)
         if self.is_onprem:
-            resp = self.get(url=url, json=data, verify=False)
+            resp = self.get(url=url, headers=headers, json=data, verify=False)
         else:
-            resp = self.get(url=url, json=data)
+            resp = self.get(url=url, headers=headers, json=data)
         log.info(resp)
         return resp
 
@@ -428,8 +464,6 @@ class ActivateInventoryInternal(Session):
             "Content-Type": "application/json",
         }
 
-        self.session.headers.update(headers)
-
         data = {
             "action": "register",
             "device": {
@@ -446,9 +480,13 @@ class ActivateInventoryInternal(Session):
         log.info(data)
         if self.is_onprem:
             return self.post(
-                url=url, json=data, ignore_handle_response=True, verify=False
+                url=url,
+                headers=headers,
+                json=data,
+                ignore_handle_response=True,
+                verify=False,
             )
-        return self.post(url=url, json=data, ignore_handle_response=True)
+        return self.post(url=url, headers=headers, json=data, ignore_handle_response=True)
 
     def get_device_tags_for_pcid(
         self,
@@ -492,14 +530,18 @@ class ActivateInventoryInternal(Session):
         url = f"{self.base_url}/activate-inventory/internal/v1/devices/tags"
 
         # Set the headers for the request.
-        self.session.headers["CCS-Platform-Customer-Id"] = pcid
-        self.session.headers["CCS-Transaction-ID"] = uuid.uuid1().hex
+        headers = {
+            "CCS-Platform-Customer-Id": pcid,
+            "CCS-Transaction-ID": uuid.uuid1().hex,
+        }
         # Send the request and store the response.
 
         if self.is_onprem:
-            response = self.get(url=url, ignore_handle_response=True, verify=False)
+            response = self.get(
+                url=url, headers=headers, ignore_handle_response=True, verify=False
+            )
         else:
-            response = self.get(url=url, ignore_handle_response=True)
+            response = self.get(url=url, headers=headers, ignore_handle_response=True)
         # Return the response.
         return response
 
@@ -530,9 +572,11 @@ class ActivateInventoryInternal(Session):
         url = f"{self.base_url}/activate-inventory/internal/v1/devices/tags"
 
         # Set the headers for the request.
-        self.session.headers["CCS-Platform-Customer-Id"] = pcid
-        self.session.headers["CCS-Transaction-ID"] = uuid.uuid1().hex
-        self.session.headers["only_validate"] = only_validate
+        headers = {
+            "CCS-Platform-Customer-Id": pcid,
+            "CCS-Transaction-ID": uuid.uuid1().hex,
+            "only_validate": only_validate,
+        }
 
         # Build the payload for the request.
         payload = {}
@@ -549,10 +593,16 @@ class ActivateInventoryInternal(Session):
         # Send the request and store the response.
         if self.is_onprem:
             response = self.put(
-                url=url, json=payload, ignore_handle_response=True, verify=False
+                url=url,
+                headers=headers,
+                json=payload,
+                ignore_handle_response=True,
+                verify=False,
             )
         else:
-            response = self.put(url=url, json=payload, ignore_handle_response=True)
+            response = self.put(
+                url=url, headers=headers, json=payload, ignore_handle_response=True
+            )
 
         # Return the response.
         return response
@@ -608,7 +658,11 @@ class ActivateInventoryInternal(Session):
         log.info(f"url: {url}, payload: {payload}")
         if self.is_onprem:
             response = self.post(
-                url=url, json=payload, ignore_handle_response=True, verify=False
+                url=url,
+                headers=headers,
+                json=payload,
+                ignore_handle_response=True,
+                verify=False,
             )
         else:
             response = self.post(
@@ -640,13 +694,11 @@ class ActivateInventoryInternal(Session):
 
         """
         # Set headers for the request
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "CCS-Username": username,
-                "CCS-Transaction-Id": uuid.uuid1().hex,
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "CCS-Username": username,
+            "CCS-Transaction-Id": uuid.uuid1().hex,
+        }
         data = {"devices": devices}
 
         # Build the URL
@@ -669,10 +721,16 @@ class ActivateInventoryInternal(Session):
         # Make the DELETE request and get the response
         if self.is_onprem:
             response = self.delete(
-                url=url, json=data, ignore_handle_response=True, verify=False
+                url=url,
+                headers=headers,
+                json=data,
+                ignore_handle_response=True,
+                verify=False,
             )
         else:
-            response = self.delete(url=url, json=data, ignore_handle_response=True)
+            response = self.delete(
+                url=url, headers=headers, json=data, ignore_handle_response=True
+            )
 
         # Log the response and return it
         log.info(response.text)
@@ -693,12 +751,10 @@ class ActivateInventoryInternal(Session):
 
         """
         # Set headers for the request
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "CCS-Transaction-Id": uuid.uuid1().hex,
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "CCS-Transaction-Id": uuid.uuid1().hex,
+        }
 
         # Build the URL
         encoded_params = urllib.parse.quote(str(devices))
@@ -709,9 +765,11 @@ class ActivateInventoryInternal(Session):
 
         # Make the GET request and get the response
         if self.is_onprem:
-            response = self.get(url=url, ignore_handle_response=True, verify=False)
+            response = self.get(
+                url=url, headers=headers, ignore_handle_response=True, verify=False
+            )
         else:
-            response = self.get(url=url, ignore_handle_response=True)
+            response = self.get(url=url, headers=headers, ignore_handle_response=True)
 
         # Log the response and return it
         log.info(response.text)
@@ -729,18 +787,25 @@ class ActivateInventoryInternal(Session):
                     "device_description": "device_description"
                     }
         """
-        self.session.headers.update(
-            {"CCS-Platform-Customer-Id": pcid, "CCS-Transaction-Id": uuid.uuid1().hex}
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": pcid,
+            "CCS-Transaction-Id": uuid.uuid1().hex,
+        }
         url = (
             f"{self.base_url}{self.base_path}{self.api_version_v1}/activate/{pcid}/device"
         )
         if self.is_onprem:
             resp = self.put(
-                url, json=device_data, ignore_handle_response=True, verify=False
+                url,
+                headers=headers,
+                json=device_data,
+                ignore_handle_response=True,
+                verify=False,
             )
         else:
-            resp = self.put(url, json=device_data, ignore_handle_response=True)
+            resp = self.put(
+                url, headers=headers, json=device_data, ignore_handle_response=True
+            )
         log.info(f"Updated device info response:: {resp.json()}")
         return resp
 
@@ -760,19 +825,23 @@ class ActivateInventoryInternal(Session):
                                             }
         return: response object
         """
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": pcid,
-                "CCS-Transaction-Id": "edit_device_folders_" + uuid.uuid1().hex,
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": pcid,
+            "CCS-Transaction-Id": "edit_device_folders_" + uuid.uuid1().hex,
+        }
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/activate/devices/folder"
         if self.is_onprem:
             resp = self.post(
-                url, json=device_data, ignore_handle_response=True, verify=False
+                url,
+                headers=headers,
+                json=device_data,
+                ignore_handle_response=True,
+                verify=False,
             )
         else:
-            resp = self.post(url, json=device_data, ignore_handle_response=True)
+            resp = self.post(
+                url, headers=headers, json=device_data, ignore_handle_response=True
+            )
         log.info(f"Updated device folders response:: {resp.json()}")
         return resp
 
@@ -786,16 +855,18 @@ class ActivateInventoryInternal(Session):
         :param username: user name
         :return Response object
         """
-        self.session.headers["CCS-Platform-Customer-Id"] = pcid
-        self.session.headers["CCS-Username"] = username
-        self.session.headers["CCS-Transaction-Id"] = (
-            "get_rule_in_folder_for_pcid_" + uuid.uuid1().hex
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": pcid,
+            "CCS-Username": username,
+            "CCS-Transaction-Id": "get_rule_in_folder_for_pcid_" + uuid.uuid1().hex,
+        }
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/activate/folders/{folder_id}/rules/{rule_name}"
         if self.is_onprem:
-            resp = self.get(url, ignore_handle_response=True, verify=False)
+            resp = self.get(
+                url, headers=headers, ignore_handle_response=True, verify=False
+            )
         else:
-            resp = self.get(url, ignore_handle_response=True)
+            resp = self.get(url, headers=headers, ignore_handle_response=True)
         log.info(f"Get notification rules with specific folder  response:: {resp.json()}")
         return resp
 
@@ -832,7 +903,6 @@ class ActivateInventoryInternal(Session):
             local_headers["CCS-Platform-Customer-Id"] = platform_customer_id
         if username:
             local_headers["CCS-Username"] = username
-        self.session.headers.update(local_headers)
         data = {"serials": serial_list}
         # Build the URL
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/devices/app-unassign"
@@ -840,10 +910,16 @@ class ActivateInventoryInternal(Session):
         # Make the POST request and get the response
         if self.is_onprem:
             response = self.post(
-                url=url, json=data, ignore_handle_response=True, verify=False
+                url=url,
+                headers=local_headers,
+                json=data,
+                ignore_handle_response=True,
+                verify=False,
             )
         else:
-            response = self.post(url=url, json=data, ignore_handle_response=True)
+            response = self.post(
+                url=url, headers=local_headers, json=data, ignore_handle_response=True
+            )
 
         # Log the response and return it
         log.debug(f"Response of the unprovision API is: {response.text}")
@@ -881,7 +957,6 @@ class ActivateInventoryInternal(Session):
             "CCS-Transaction-Id": "get_device_info_" + uuid.uuid1().hex,
             "CCS-Platform-Customer-Id": pcid,
         }
-        self.session.headers.update(local_headers)
 
         query_param = {"limit": limit, "page": page}
         if search_string:
@@ -902,10 +977,19 @@ class ActivateInventoryInternal(Session):
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/activate/devices"
         if self.is_onprem:
             res = self.get(
-                url=url, params=query_param, ignore_handle_response=True, verify=False
+                url=url,
+                headers=local_headers,
+                params=query_param,
+                ignore_handle_response=True,
+                verify=False,
             )
         else:
-            res = self.get(url=url, params=query_param, ignore_handle_response=True)
+            res = self.get(
+                url=url,
+                headers=local_headers,
+                params=query_param,
+                ignore_handle_response=True,
+            )
         return res
 
     def get_activate_customers(self, type, platform_customer_id):
@@ -918,20 +1002,20 @@ class ActivateInventoryInternal(Session):
         Returns:
             dict: object containing the response from the API.
         """
-        self.session.headers.update(
-            {
-                "CCS-Transaction-Id": uuid.uuid1().hex,
-            }
-        )
+        headers = {
+            "CCS-Transaction-Id": uuid.uuid1().hex,
+        }
         # Build the URL
 
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/activate/customers/types/{type}/ids/{platform_customer_id}"
 
         # Make the POST request and get the response
         if self.is_onprem:
-            response = self.get(url=url, ignore_handle_response=True, verify=False)
+            response = self.get(
+                url=url, headers=headers, ignore_handle_response=True, verify=False
+            )
         else:
-            response = self.get(url=url, ignore_handle_response=True)
+            response = self.get(url=url, headers=headers, ignore_handle_response=True)
 
         return response
 
@@ -954,16 +1038,16 @@ class ActivateInventoryInternal(Session):
             }
         ]
         """
-        self.session.headers.update(
-            {
-                "CCS-Username": username,
-                "Content-Type": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
-        log.info("Session : {}".format(self.session.headers))
+        headers = {
+            "CCS-Username": username,
+            "Content-Type": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
+        log.info("Headers : {}".format(headers))
         url = self._get_path_v1("devices/unclaim")
-        response = self.post(url=url, json=data, ignore_handle_response=True)
+        response = self.post(
+            url=url, headers=headers, json=data, ignore_handle_response=True
+        )
         return response
 
     def claim_device_internal_api(
@@ -1048,22 +1132,26 @@ class ActivateInventoryInternal(Session):
         }
         :return response object
         """
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "Content-Type": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "Content-Type": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
 
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/activate/folders"
         log.info(f"Url: {url} , payload: {payload}")
         if self.is_onprem:
             response = self.post(
-                url=url, json=payload, ignore_handle_response=True, verify=False
+                url=url,
+                headers=headers,
+                json=payload,
+                ignore_handle_response=True,
+                verify=False,
             )
         else:
-            response = self.post(url=url, json=payload, ignore_handle_response=True)
+            response = self.post(
+                url=url, headers=headers, json=payload, ignore_handle_response=True
+            )
         return response
 
     def delete_folder(self, platform_customer_id, folder_id):
@@ -1074,19 +1162,19 @@ class ActivateInventoryInternal(Session):
         :param folder_id: folder id
         :return response object
         """
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "Content-Type": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "Content-Type": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
 
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/activate/folders/{folder_id}"
         if self.is_onprem:
-            response = self.delete(url=url, ignore_handle_response=True, verify=False)
+            response = self.delete(
+                url=url, headers=headers, ignore_handle_response=True, verify=False
+            )
         else:
-            response = self.delete(url=url, ignore_handle_response=True)
+            response = self.delete(url=url, headers=headers, ignore_handle_response=True)
         return response
 
     def create_rule(self, platform_customer_id, payload):
@@ -1107,21 +1195,25 @@ class ActivateInventoryInternal(Session):
         "backup_vpn_mac2": "string"}
         :return Response object
         """
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "Content-Type": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "Content-Type": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
 
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/activate/rules"
         if self.is_onprem:
             response = self.post(
-                url=url, json=payload, ignore_handle_response=True, verify=False
+                url=url,
+                headers=headers,
+                json=payload,
+                ignore_handle_response=True,
+                verify=False,
             )
         else:
-            response = self.post(url=url, json=payload, ignore_handle_response=True)
+            response = self.post(
+                url=url, headers=headers, json=payload, ignore_handle_response=True
+            )
         return response
 
     def get_rules(
@@ -1137,13 +1229,11 @@ class ActivateInventoryInternal(Session):
         :param page: page
         :return response object
         """
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "Content-Type": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "Content-Type": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
         query_param = {}
         if limit:
             query_param["limit"] = limit
@@ -1158,10 +1248,16 @@ class ActivateInventoryInternal(Session):
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/activate/rules"
         if self.is_onprem:
             response = self.get(
-                url=url, params=query_param, ignore_handle_response=True, verify=False
+                url=url,
+                headers=headers,
+                params=query_param,
+                ignore_handle_response=True,
+                verify=False,
             )
         else:
-            response = self.get(url=url, params=query_param, ignore_handle_response=True)
+            response = self.get(
+                url=url, headers=headers, params=query_param, ignore_handle_response=True
+            )
         return response
 
     def delete_rule(self, platform_customer_id, rule_id):
@@ -1172,19 +1268,19 @@ class ActivateInventoryInternal(Session):
         :param rule_id: rule id
         :return Response object
         """
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "Content-Type": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "Content-Type": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
 
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/activate/rules/{rule_id}"
         if self.is_onprem:
-            response = self.delete(url=url, ignore_handle_response=True, verify=False)
+            response = self.delete(
+                url=url, headers=headers, ignore_handle_response=True, verify=False
+            )
         else:
-            response = self.delete(url=url, ignore_handle_response=True)
+            response = self.delete(url=url, headers=headers, ignore_handle_response=True)
         return response
 
     def update_device_to_folder(self, platform_customer_id, payload):
@@ -1208,23 +1304,27 @@ class ActivateInventoryInternal(Session):
             }
         :return response object
         """
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "Content-Type": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "Content-Type": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
 
         url = (
             f"{self.base_url}{self.base_path}{self.api_version_v1}/activate/updateDevices"
         )
         if self.is_onprem:
             response = self.post(
-                url=url, json=payload, ignore_handle_response=True, verify=False
+                url=url,
+                headers=headers,
+                json=payload,
+                ignore_handle_response=True,
+                verify=False,
             )
         else:
-            response = self.post(url=url, json=payload, ignore_handle_response=True)
+            response = self.post(
+                url=url, headers=headers, json=payload, ignore_handle_response=True
+            )
         return response
 
     def claim_devices(
@@ -1301,21 +1401,25 @@ class ActivateInventoryInternal(Session):
             }
         :return response object
         """
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "Content-Type": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "Content-Type": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
 
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/activate/folders/{folder_id}"
         if self.is_onprem:
             response = self.put(
-                url=url, json=payload, ignore_handle_response=True, verify=False
+                url=url,
+                headers=headers,
+                json=payload,
+                ignore_handle_response=True,
+                verify=False,
             )
         else:
-            response = self.put(url=url, json=payload, ignore_handle_response=True)
+            response = self.put(
+                url=url, headers=headers, json=payload, ignore_handle_response=True
+            )
         return response
 
     def update_device_attributes(self, platform_customer_id, username, payload):
@@ -1340,22 +1444,26 @@ class ActivateInventoryInternal(Session):
                 }
             ]
             }"""
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "Content-Type": "application/json",
-                "CCS-Username": username,
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "Content-Type": "application/json",
+            "CCS-Username": username,
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/devices"
         log.info(f"Url:{url} => {payload}")
         if self.is_onprem:
             response = self.patch(
-                url, json=payload, ignore_handle_response=True, verify=False
+                url,
+                headers=headers,
+                json=payload,
+                ignore_handle_response=True,
+                verify=False,
             )
         else:
-            response = self.patch(url, json=payload, ignore_handle_response=True)
+            response = self.patch(
+                url, headers=headers, json=payload, ignore_handle_response=True
+            )
         return response
 
     def get_folders(
@@ -1382,13 +1490,11 @@ class ActivateInventoryInternal(Session):
         :param page: page
         :return Response object
         """
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "Content-Type": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "Content-Type": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
 
         query_param = {}
         if limit:
@@ -1409,10 +1515,16 @@ class ActivateInventoryInternal(Session):
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/activate/folders"
         if self.is_onprem:
             response = self.get(
-                url=url, params=query_param, ignore_handle_response=True, verify=False
+                url=url,
+                headers=headers,
+                params=query_param,
+                ignore_handle_response=True,
+                verify=False,
             )
         else:
-            response = self.get(url=url, params=query_param, ignore_handle_response=True)
+            response = self.get(
+                url=url, headers=headers, params=query_param, ignore_handle_response=True
+            )
         return response
 
     def update_rule(self, platform_customer_id, rule_id, payload):
@@ -1438,19 +1550,21 @@ class ActivateInventoryInternal(Session):
             }
         :return Response object
         """
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "Content-Type": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "Content-Type": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
 
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/activate/rules/{rule_id}"
         if self.is_onprem:
-            response = self.put(url=url, json=payload, ignore_handle_response=True)
+            response = self.put(
+                url=url, headers=headers, json=payload, ignore_handle_response=True
+            )
         else:
-            response = self.put(url=url, json=payload, ignore_handle_response=True)
+            response = self.put(
+                url=url, headers=headers, json=payload, ignore_handle_response=True
+            )
         return response
 
     def move_device_to_folder(
@@ -1527,18 +1641,18 @@ class ActivateInventoryInternal(Session):
         Param: platform_customer_id (str): The platform customer ID to associate with the VGW device.
         Returns: An Object containing the response from the VGW device creation request.
         """
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "CCS-Transaction-Id": "get_devices_by_pcid_" + uuid.uuid1().hex,
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "CCS-Transaction-Id": "get_devices_by_pcid_" + uuid.uuid1().hex,
+        }
 
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/activate/vgwRegister"
         if self.is_onprem:
-            response = self.post(url=url, ignore_handle_response=True, verify=False)
+            response = self.post(
+                url=url, headers=headers, ignore_handle_response=True, verify=False
+            )
         else:
-            response = self.post(url=url, ignore_handle_response=True)
+            response = self.post(url=url, headers=headers, ignore_handle_response=True)
         return response
 
     def remove_vgw_device(self, platform_customer_id: str, payload: dict):
@@ -1552,20 +1666,24 @@ class ActivateInventoryInternal(Session):
         Returns: An Object containing the response from the VGW device creation request.
         """
 
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "CCS-Transaction-Id": "get_devices_by_pcid_" + uuid.uuid1().hex,
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "CCS-Transaction-Id": "get_devices_by_pcid_" + uuid.uuid1().hex,
+        }
 
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/activate/removeVgw"
         if self.is_onprem:
             response = self.post(
-                url=url, json=payload, ignore_handle_response=True, verify=False
+                url=url,
+                headers=headers,
+                json=payload,
+                ignore_handle_response=True,
+                verify=False,
             )
         else:
-            response = self.post(url=url, json=payload, ignore_handle_response=True)
+            response = self.post(
+                url=url, headers=headers, json=payload, ignore_handle_response=True
+            )
         return response
 
     def create_application_instance(
@@ -1644,13 +1762,11 @@ class ActivateInventoryInternal(Session):
                 }
         note:when providing a values, the user should pass them as a list wherever required.
         """
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "Content-Type": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "Content-Type": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
 
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/activate/devicesSummary"
         payload = {}
@@ -1679,7 +1795,9 @@ class ActivateInventoryInternal(Session):
         if search_string:
             payload["search_string"] = search_string
 
-        response = self.post(url=url, json=payload, ignore_handle_response=True)
+        response = self.post(
+            url=url, headers=headers, json=payload, ignore_handle_response=True
+        )
         return response
 
     def add_alias(
@@ -1880,23 +1998,23 @@ class ActivateInventoryInternal(Session):
                 "fetch_locations_by_platform_id_and_search_string_" + platform_customer_id
             )
 
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "Content-Type": "application/json",
-                "CCS-Transaction-Id": transaction_id,
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "Content-Type": "application/json",
+            "CCS-Transaction-Id": transaction_id,
+        }
 
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/locations"
         response = None
         if search_string:
             log.info(f"{url}?search_string={search_string}")
             params = {"search_string": search_string}
-            response = self.get(url=url, params=params, ignore_handle_response=True)
+            response = self.get(
+                url=url, headers=headers, params=params, ignore_handle_response=True
+            )
         else:
             log.info(f"{url}")
-            response = self.get(url=url, ignore_handle_response=True)
+            response = self.get(url=url, headers=headers, ignore_handle_response=True)
 
         log.info(f"Response of API request[tx:{transaction_id}]: {response}")
         return response
@@ -1923,13 +2041,11 @@ class ActivateInventoryInternal(Session):
         if transaction_id is None:
             transaction_id = "get_devices_by_platform_cid_" + platform_customer_id
 
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "Content-Type": "application/json",
-                "CCS-Transaction-Id": transaction_id,
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "Content-Type": "application/json",
+            "CCS-Transaction-Id": transaction_id,
+        }
 
         params = {}
         if serial_number:
@@ -1942,7 +2058,9 @@ class ActivateInventoryInternal(Session):
 
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/devices"
         log.info(f"{url}")
-        response = self.get(url=url, params=params, ignore_handle_response=True)
+        response = self.get(
+            url=url, headers=headers, params=params, ignore_handle_response=True
+        )
         log.info(f"Response of API request[tx:{transaction_id}]: {response}")
 
         return response
@@ -1963,18 +2081,19 @@ class ActivateInventoryInternal(Session):
         if transaction_id is None:
             transaction_id = "get_devices_by_pcid_using_post_" + platform_customer_id
 
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "Content-Type": "application/json",
-                "CCS-Transaction-Id": transaction_id,
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "Content-Type": "application/json",
+            "CCS-Transaction-Id": transaction_id,
+        }
 
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/devices/filter"
         log.info(f"{url}")
         response = self.post(
-            url=url, json=device_app_search_request, ignore_handle_response=True
+            url=url,
+            headers=headers,
+            json=device_app_search_request,
+            ignore_handle_response=True,
         )
         log.info(f"Response of API request[tx:{transaction_id}]: {response}")
         return response
@@ -64,19 +64,18 @@ class AsyncHandlerServiceInternal(Session):
         :return: API Response obj
         """
 
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "CCS-Username": user_name,
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
-
-        log.info("Session : {}".format(self.session.headers))
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "CCS-Username": user_name,
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
+
+        log.info("Headers : {}".format(headers))
         return self.post(
             url=self._get_path_v1("async-operations"),
+            headers=headers,
             json=data,
             ignore_handle_response=True,
         )
@@ -91,16 +90,15 @@ class AsyncHandlerServiceInternal(Session):
         :return: API Response obj
         """
 
-        self.session.headers.update(
-            {
-                "Accept": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
+        headers = {
+            "Accept": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
 
-        log.info("Session : {}".format(self.session.headers))
+        log.info("Headers : {}".format(headers))
         return self.get(
             url=self._get_path_v1(f"async-operations/{task_id}"),
+            headers=headers,
             ignore_handle_response=True,
         )
 
@@ -116,19 +114,18 @@ class AsyncHandlerServiceInternal(Session):
         :return: API Response obj
         """
 
-        self.session.headers.update(
-            {
-                "CCS-Platform-Customer-Id": platform_customer_id,
-                "CCS-Username": user_name,
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
+        headers = {
+            "CCS-Platform-Customer-Id": platform_customer_id,
+            "CCS-Username": user_name,
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
 
-        log.info("Session : {}".format(self.session.headers))
+        log.info("Headers : {}".format(headers))
         return self.patch(
             url=self._get_path_v1(f"async-operations/{task_id}"),
+            headers=headers,
             json=data,
             ignore_handle_response=True,
         )
@@ -142,15 +139,14 @@ class AsyncHandlerServiceInternal(Session):
         :return: API Response obj
         """
 
-        self.session.headers.update(
-            {
-                "Accept": "application/json",
-                "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
-            }
-        )
+        headers = {
+            "Accept": "application/json",
+            "CCS-Transaction-Id": f"{inspect.currentframe().f_code.co_name}_{uuid.uuid1().hex}",
+        }
 
-        log.info("Session : {}".format(self.session.headers))
+        log.info("Headers : {}".format(headers))
         return self.delete(
             url=self._get_path_v1(f"async-operations/{task_id}"),
+            headers=headers,
             ignore_handle_response=True,
         )
@@ -0,0 +1,587 @@
+"""
+Core asyncio REST Session Library
+"""
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+import asyncio
+import datetime
+import inspect
+import logging
+import time
+from functools import wraps
+
+import aiohttp
+from requests import Request
+from requests.cookies import RequestsCookieJar, get_cookie_header, merge_cookies
+from requests.structures import CaseInsensitiveDict
+
+from .codec import DEFAULT_CODEC
+from .context import get_request_headers
+from .deadline import get_deadline
+from .exceptions import SessionException
+from .metrics import SESSION_METRICS
+from .retry import DEFAULT_RETRY_POLICY
+from .session import Session
+from .transport import TransportConfig
+
+LOG = logging.getLogger(__name__)
+
+
+class AsyncHTTPError(Exception):
+    """
+    HTTP error status received by AsyncSession
+    """
+
+    def __init__(self, response):
+        super().__init__(f"{response.status_code} Error for url: {response.url}")
+        self.response = response
+
+
+class AsyncResponse:
+    """
+    Fully read response of AsyncSession with requests.Response-like interface
+    """
+
+    def __init__(self, client_response, content, elapsed):
+        """
+        :param client_response: aiohttp.ClientResponse object
+        :param content: Response body (bytes)
+        :param elapsed: Request duration (datetime.timedelta)
+        """
+        self.status_code = client_response.status
+        self.reason = client_response.reason
+        self.headers = client_response.headers
+        self.cookies = {name: c.value for name, c in client_response.cookies.items()}
+        self.url = str(client_response.url)
+        self.request = client_response.request_info
+        try:
+            self.encoding = client_response.get_encoding()
+        except RuntimeError:
+            self.encoding = "utf-8"
+        self.content = content
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self, **kwargs):
+        return json.loads(self.text, **kwargs)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise AsyncHTTPError(self)
+
+
+def async_exception_handler(func):
+    """
+    HTTP Requests Exception handler for AsyncSession coroutines
+    """
+
+    @wraps(func)
+    async def decorator(obj, *args, **kwargs):
+        retry_policy = getattr(obj, "retry_policy", None) or DEFAULT_RETRY_POLICY
+        max_retries = retry_policy.get_max_retries(obj)
+        started = time.monotonic()
+        for trying in range(max_retries + 1):
+            next_try_available = trying < max_retries
+            try:
+                if obj.debug:
+                    obj._log_request(func, *args, **kwargs)
+                return await func(obj, *args, **kwargs)
+            except AsyncHTTPError as e:
+                if retry_policy.is_retriable(obj, e.response):
+                    obj._log_error_response(e.response)
+                    LOG.warning(f"Response code : {e.response.status_code}")
+                    if not obj.validate_retriable_response(e.response):
+                        raise SessionException(
+                            "Response validation failed for API "
+                            f"'{e.response.request.method} "
+                            f"url :'{e.response.request.url}' "
+                            f"status code :'{e.response.status_code}' "
+                            f"Resp :'{e.response.text}'",
+                            e.response,
+                        )
+                    wait = retry_policy.get_wait_time(obj, trying, e.response)
+                    in_deadline = retry_policy.within_deadline(started, wait)
+                    if next_try_available and in_deadline:
+                        wait = obj._get_retry_wait(e.response, wait)
+                        retry_policy.metrics.record_retry(e.response.status_code, wait)
+                        LOG.error(f"Waiting for {wait:g} seconds before retrying...")
+                        await asyncio.sleep(wait)
+                        continue
+                    retry_policy.metrics.record_exhausted(not in_deadline)
+                    LOG.error("Retries exhausted")
+                    raise SessionException(
+                        f"Retries exhausted for API "
+                        f"'{e.response.request.method} "
+                        f"{e.response.request.url}' : "
+                        f"'{e.response.status_code}'",
+                        e.response,
+                    )
+                elif e.response.status_code == 401:
+                    obj._log_request_headers(e.response.request)
+                    obj._log_error_response(e.response)
+                    if next_try_available and await obj._refresh_token():
+                        LOG.debug("Retrying the API after token refresh")
+                        continue
+                    raise SessionException(
+                        f"Non Retryable error '{e.response.status_code}' for "
+                        f"API '{e.response.request.method} "
+                        f"{e.response.request.url}'",
+                        e.response,
+                    )
+                else:
+                    obj._log_error_response(e.response)
+                    LOG.warning(
+                        f"Non Retryable error '{e.response.status_code}' for "
+                        f"API '{e.response.request.method} "
+                        f"{e.response.request.url}'"
+                    )
+                    raise SessionException(
+                        f"Non Retryable error: '{e.response.status_code}' for "
+                        f"method: '{e.response.request.method} "
+                        f"url:  '{e.response.request.url}' "
+                        f"Resp: '{e.response.text}' ",
+                        e.response,
+                    )
+            except SessionException:
+                raise
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                raise SessionException("Connection Error or Timeout")
+            except Exception as ex:
+                raise SessionException(f"Exception occurred:\n{ex}")
+
+    return decorator
+
+
+class AsyncSession:
+    """
+    asyncio REST Session Class
+
+    Coroutine counterpart of Session with the same retry, token refresh and
+    response handling semantics. A single AsyncSession multiplexes any number of
+    concurrent requests over a pooled aiohttp connector on one event loop.
+    Existing authenticated clients (AppSession, UISession, UnifiedSession, ...)
+    can be driven from an event loop via AsyncSession.from_session(); it shares
+    their authentication for the HTTP verbs, while the API helper classes built
+    on them (SubscriptionManagementApp, ActivateInventory, ...) stay synchronous.
+    """
+
+    _get_url = Session._get_url
+    _get_url_secondary = Session._get_url_secondary
+    _get_domain = Session._get_domain
+    _log_request = Session._log_request
+    _log_error_response = Session._log_error_response
+    _log_elapsed_time = Session._log_elapsed_time
+    _log_request_headers = Session._log_request_headers
+    _handle_response = Session._handle_response
+    _is_body_logged = Session._is_body_logged
+    _truncate = Session._truncate
+    request_context = Session.request_context
+    _get_client_identity = Session._get_client_identity
+    _get_deadline_step = Session._get_deadline_step
+    _get_retry_wait = Session._get_retry_wait
+
+    log_body_limit = Session.log_body_limit
+    log_sample_rate = Session.log_sample_rate
+    transaction_id_header = Session.transaction_id_header
+
+    def __init__(self, max_retries=3, retry_timeout=5, debug=False, **kwargs):
+        """
+        :param max_retries: Max number of retries for retriable errors
+        :param retry_timeout: Timeout between the retries (in seconds)
+        :param debug: Enable/Disable Debug logging of HTTP Requests/Responses
+        :param kwargs: Additional Keyword arguments
+            :transport: TransportConfig with connection pool and timeout settings
+                (Default: TransportConfig())
+            :retry_policy: RetryPolicy for the retriable errors (Default: fixed
+                retry_timeout wait for retriable_errors)
+            :log_body_limit: Max logged length of request/response bodies
+            :log_sample_rate: Fraction of the calls whose bodies are logged
+            :metrics: SessionMetrics registry for per-endpoint call metrics
+                (Default: SESSION_METRICS, None - disable recording)
+            :codec: JsonCodec encoding "json" request bodies and decoding responses
+                (Default: DEFAULT_CODEC)
+            :transaction_id_factory: Callable returning a new transaction id sent in
+                transaction_id_header of every request (Default: None - not sent)
+            :circuit_breaker: CircuitBreaker failing fast the requests to unhealthy
+                hosts (Default: None - disabled)
+            :rate_limiter: RateLimiter pacing the requests per host and client
+                (Default: None - disabled)
+            :headers: Headers sent with every request
+            :cookies: Cookies (dict or CookieJar) sent with the requests matching
+                their domain and path
+        """
+        self.max_retries = max_retries
+        self.retry_timeout = retry_timeout
+        self.debug = debug
+        self.log_body_limit = kwargs.get("log_body_limit", self.log_body_limit)
+        self.log_sample_rate = kwargs.get("log_sample_rate", self.log_sample_rate)
+        self.metrics = kwargs.get("metrics", SESSION_METRICS)
+        self.codec = kwargs.get("codec") or DEFAULT_CODEC
+        self.transaction_id_factory = kwargs.get("transaction_id_factory")
+        self.circuit_breaker = kwargs.get("circuit_breaker")
+        self.rate_limiter = kwargs.get("rate_limiter")
+        self.retry_policy = kwargs.get("retry_policy")
+        self.transport = kwargs.get("transport") or TransportConfig()
+        self.headers = dict(kwargs.get("headers") or {})
+        self.cookies = merge_cookies(RequestsCookieJar(), kwargs.get("cookies") or {})
+        self.source_session = None
+        self.session = None
+
+    @classmethod
+    def from_session(cls, session, **kwargs):
+        """
+        Create AsyncSession sharing URLs, headers, cookies and retry settings of
+        an authenticated synchronous Session. Token refresh and retriable response
+        validation are delegated to the synchronous session.
+        :param session: Session object (e.g. AppSession, UISession)
+        :param kwargs: Additional keyword arguments for AsyncSession
+        :return: AsyncSession object
+        """
+        kwargs.setdefault("transport", session.transport)
+        kwargs.setdefault("retry_policy", session.retry_policy)
+        kwargs.setdefault("log_body_limit", session.log_body_limit)
+        kwargs.setdefault("log_sample_rate", session.log_sample_rate)
+        kwargs.setdefault("metrics", session.metrics)
+        kwargs.setdefault("codec", session.codec)
+        kwargs.setdefault("transaction_id_factory", session.transaction_id_factory)
+        kwargs.setdefault("circuit_breaker", session.circuit_breaker)
+        kwargs.setdefault("rate_limiter", session.rate_limiter)
+        async_session = cls(
+            max_retries=session.max_retries,
+            retry_timeout=session.retry_timeout,
+            debug=session.debug,
+            **kwargs,
+        )
+        async_session.source_session = session
+        for attr in (
+            "base_url",
+            "secondary_base_url",
+            "domain_name",
+            "retriable_errors",
+            "client_id",
+            "user",
+        ):
+            if hasattr(session, attr):
+                setattr(async_session, attr, getattr(session, attr))
+        async_session._sync_from_source()
+        return async_session
+
+    def _sync_from_source(self):
+        self.headers.update(self.source_session.session.headers)
+        # Keep the domain and path of every cookie instead of a flat dict
+        self.cookies.update(self.source_session.session.cookies)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def _get_client_session(self):
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.transport.pool_connections * self.transport.pool_maxsize,
+                limit_per_host=self.transport.pool_maxsize,
+                keepalive_timeout=self.transport.keep_alive_idle,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=self.transport.connect_timeout,
+                    sock_read=self.transport.read_timeout,
+                ),
+            )
+        return self.session
+
+    async def close(self):
+        """
+        Close the underlying aiohttp session and its pooled connections
+        """
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    async def refresh_token(self):
+        """
+        Refresh the token via the source session (if any)
+        :return: Boolean (True or False)
+        """
+        if not hasattr(self.source_session, "refresh_token"):
+            return False
+        refreshed = await asyncio.get_running_loop().run_in_executor(
+            None, self.source_session.refresh_token
+        )
+        if refreshed:
+            self._sync_from_source()
+        return refreshed
+
+    async def _refresh_token(self):
+        refreshed = self.refresh_token()
+        if inspect.isawaitable(refreshed):
+            refreshed = await refreshed
+        return refreshed
+
+    def validate_retriable_response(self, response):
+        """
+        Additional validation of retriable errors before going for retries
+        :param response: AsyncResponse object
+        :return: True/False
+        """
+        validate = getattr(self.source_session, "validate_retriable_response", None)
+        return validate(response) if validate else True
+
+    @staticmethod
+    def _get_params(params):
+        """
+        Convert requests-style query params to the aiohttp accepted format
+        """
+        if not isinstance(params, dict):
+            return params
+        converted = []
+        for key, value in params.items():
+            values = value if isinstance(value, (list, tuple)) else [value]
+            converted.extend((key, str(v)) for v in values if v is not None)
+        return converted
+
+    def _get_cookie_header(self, method, url, cookies=None):
+        """
+        :param cookies: Per-request cookies merged over the session ones
+        :return: Cookie header value with the cookies matching the url domain and
+            path (like requests sends them) or None
+        """
+        jar = self.cookies
+        if cookies:
+            jar = merge_cookies(self.cookies.copy(), cookies)
+        return get_cookie_header(jar, Request(method, url))
+
+    def _get_request_kwargs(self, method, url, kwargs):
+        """
+        Translate requests keyword arguments to aiohttp ones
+        """
+        request_kwargs = dict(self.codec.encode_request(kwargs, self.headers))
+        headers = CaseInsensitiveDict(self.headers)
+        headers.update(get_request_headers(self, request_kwargs.get("headers")) or {})
+        cookie = self._get_cookie_header(method, url, request_kwargs.pop("cookies", None))
+        if cookie:
+            headers["Cookie"] = cookie
+        request_kwargs["headers"] = dict(headers)
+        if "params" in kwargs:
+            request_kwargs["params"] = self._get_params(kwargs["params"])
+        if "verify" in kwargs:
+            request_kwargs["ssl"] = None if request_kwargs.pop("verify") else False
+        timeout = request_kwargs.get("timeout")
+        if isinstance(timeout, tuple):
+            request_kwargs["timeout"] = aiohttp.ClientTimeout(
+                sock_connect=timeout[0], sock_read=timeout[1]
+            )
+        elif isinstance(timeout, (int, float)):
+            request_kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+        return request_kwargs
+
+    def _get_deadline_timeout(self, deadline, timeout, method, url):
+        """
+        :param deadline: Deadline of the flow
+        :param timeout: aiohttp.ClientTimeout of the request or None
+        :return: aiohttp.ClientTimeout with the total cut to the remaining budget
+        """
+        timeout = timeout or self._get_client_session().timeout
+        total = deadline.get_timeout(timeout.total, self._get_deadline_step(method, url))
+        return aiohttp.ClientTimeout(
+            total=total,
+            connect=timeout.connect,
+            sock_connect=timeout.sock_connect,
+            sock_read=timeout.sock_read,
+        )
+
+    async def _request(self, method, url, **kwargs):
+        deadline = get_deadline()
+        if deadline is not None:
+            # Before taking a circuit probe slot or a rate limiter token
+            deadline.check(self._get_deadline_step(method, url))
+        request_kwargs = self._get_request_kwargs(method, url, kwargs)
+        circuit = self.circuit_breaker.before_call(url) if self.circuit_breaker else None
+        recorded = False
+        try:
+            bucket = None
+            if self.rate_limiter is not None:
+                bucket, wait = self.rate_limiter.reserve(url, self._get_client_identity())
+                wait = self.rate_limiter.get_wait(
+                    wait, self._get_deadline_step(method, url)
+                )
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            if deadline is not None:
+                request_kwargs["timeout"] = self._get_deadline_timeout(
+                    deadline, request_kwargs.get("timeout"), method, url
+                )
+            start = time.monotonic()
+            try:
+                async with self._get_client_session().request(
+                    method, url, **request_kwargs
+                ) as client_response:
+                    content = await client_response.read()
+            except Exception as e:
+                if self.metrics is not None:
+                    self.metrics.record(method, url, "error", time.monotonic() - start)
+                if circuit is not None:
+                    recorded = True
+                    self.circuit_breaker.record(circuit, error=e)
+                if (
+                    isinstance(e, asyncio.TimeoutError)
+                    and deadline is not None
+                    and deadline.expired()
+                ):
+                    raise deadline.exceeded(self._get_deadline_step(method, url)) from e
+                raise
+            elapsed = time.monotonic() - start
+            response = AsyncResponse(
+                client_response, content, datetime.timedelta(seconds=elapsed)
+            )
+            if circuit is not None:
+                recorded = True
+                self.circuit_breaker.record(circuit, response)
+            if self.metrics is not None:
+                data = request_kwargs.get("data")
+                bytes_out = len(data) if isinstance(data, (str, bytes)) else 0
+                self.metrics.record(
+                    method, url, client_response.status, elapsed, len(content), bytes_out
+                )
+            if bucket is not None:
+                self.rate_limiter.record(bucket, response)
+            return response
+        finally:
+            # asyncio.CancelledError included (BaseException on Python 3.8+)
+            if circuit is not None and not recorded:
+                self.circuit_breaker.release(circuit)
+
+    def _process_response(self, r, tuple_response, ignore_handle_response):
+        if ignore_handle_response:
+            return r
+        r.raise_for_status()
+        if tuple_response:
+            return r.status_code, self._handle_response(r)
+        return self._handle_response(r)
+
+    @async_exception_handler
+    async def get(
+        self, url, tuple_response=False, ignore_handle_response=False, **kwargs
+    ):
+        """
+        HTTP GET coroutine
+        :param url:
+        :param tuple_response: Boolean for tuple response (Default: False)
+        :param ignore_handle_response: Boolean to ignore response handling (Default: False)
+        :param kwargs:
+        :return:
+            When ignore_handle_response is True, return Response object (AsyncResponse)
+            Otherwise,
+                Response json or response obect if tuple_response is False
+                Tuple of status_code and response json/response object if tuple_response is True
+        """
+        r = await self._request("GET", self._get_url(url), **kwargs)
+        return self._process_response(r, tuple_response, ignore_handle_response)
+
+    @async_exception_handler
+    async def get_secondary(
+        self, url, tuple_response=False, ignore_handle_response=False, **kwargs
+    ):
+        """
+        HTTP GET coroutine for the secondary (read-only) base url
+        :param url:
+        :param tuple_response: Boolean for tuple response (Default: False)
+        :param ignore_handle_response: Boolean to ignore response handling (Default: False)
+        :param kwargs:
+        :return: See AsyncSession.get
+        """
+        get_cookies = self.cookies.get_dict(domain=self._get_domain())
+        r = await self._request(
+            "GET", self._get_url_secondary(url), cookies=get_cookies, **kwargs
+        )
+        return self._process_response(r, tuple_response, ignore_handle_response)
+
+    @async_exception_handler
+    async def post(
+        self, url, tuple_response=False, ignore_handle_response=False, **kwargs
+    ):
+        """
+        HTTP POST coroutine
+        :param url:
+        :param tuple_response: Boolean for tuple response (Default: False)
+        :param ignore_handle_response: Boolean to ignore response handling (Default: False)
+        :param kwargs:
+        :return: See AsyncSession.get
+        """
+        r = await self._request("POST", self._get_url(url), **kwargs)
+        return self._process_response(r, tuple_response, ignore_handle_response)
+
+    @async_exception_handler
+    async def post_secondary(
+        self, url, tuple_response=False, ignore_handle_response=False, **kwargs
+    ):
+        """
+        HTTP POST coroutine for the secondary (read-only) base url
+        :param url:
+        :param tuple_response: Boolean for tuple response (Default: False)
+        :param ignore_handle_response: Boolean to ignore response handling (Default: False)
+        :param kwargs:
+        :return: See AsyncSession.get
+        """
+        get_cookies = self.cookies.get_dict(domain=self._get_domain())
+        r = await self._request(
+            "POST", self._get_url_secondary(url), cookies=get_cookies, **kwargs
+        )
+        return self._process_response(r, tuple_response, ignore_handle_response)
+
+    @async_exception_handler
+    async def put(
+        self, url, tuple_response=False, ignore_handle_response=False, **kwargs
+    ):
+        """
+        HTTP PUT coroutine
+        :param url:
+        :param tuple_response: Boolean for tuple response (Default: False)
+        :param ignore_handle_response: Boolean to ignore response handling (Default: False)
+        :param kwargs:
+        :return: See AsyncSession.get
+        """
+        r = await self._request("PUT", self._get_url(url), **kwargs)
+        return self._process_response(r, tuple_response, ignore_handle_response)
+
+    @async_exception_handler
+    async def patch(
+        self, url, tuple_response=False, ignore_handle_response=False, **kwargs
+    ):
+        """
+        HTTP PATCH coroutine
+        :param url:
+        :param tuple_response: Boolean for tuple response (Default: False)
+        :param ignore_handle_response: Boolean to ignore response handling (Default: False)
+        :param kwargs:
+        :return: See AsyncSession.get
+        """
+        r = await self._request("PATCH", self._get_url(url), **kwargs)
+        return self._process_response(r, tuple_response, ignore_handle_response)
+
+    @async_exception_handler
+    async def delete(
+        self, url, tuple_response=False, ignore_handle_response=False, **kwargs
+    ):
+        """
+        HTTP DELETE coroutine
+        :param url:
+        :param tuple_response: Boolean for tuple response (Default: False)
+        :param ignore_handle_response: Boolean to ignore response handling (Default: False)
+        :param kwargs:
+        :return: See AsyncSession.get
+        """
+        r = await self._request("DELETE", self._get_url(url), **kwargs)
+        return self._process_response(r, tuple_response, ignore_handle_response)
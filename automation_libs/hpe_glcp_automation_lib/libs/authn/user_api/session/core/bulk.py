@@ -0,0 +1,114 @@
+"""
+Bounded-concurrency Bulk Request Executor of the core REST Session
+"""
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .exceptions import BulkRequestException
+
+LOG = logging.getLogger(__name__)
+
+
+class BulkResult:
+    """
+    Outcome of a single item of a bulk operation
+    """
+
+    def __init__(self, index, item, result=None, error=None, cancelled=False):
+        """
+        :param index: Position of the item in the input
+        :param item: Request spec or argument the call was made with
+        :param result: Return value of the call
+        :param error: Exception raised by the call
+        :param cancelled: True if the call was not made (fail-fast mode)
+        """
+        self.index = index
+        self.item = item
+        self.result = result
+        self.error = error
+        self.cancelled = cancelled
+
+    @property
+    def ok(self):
+        return self.error is None and not self.cancelled
+
+    def __repr__(self):
+        state = "ok" if self.ok else "cancelled" if self.cancelled else repr(self.error)
+        return f"BulkResult({self.index}, {state})"
+
+
+def get_request_spec(spec):
+    """
+    :param spec: Request spec: tuple (method, url[, json payload]) or dictionary
+        {"method": ..., "url": ..., **request kwargs (json, params, headers, ...)}
+    :return: Tuple (method, url, request kwargs)
+    """
+    if isinstance(spec, dict):
+        kwargs = dict(spec)
+        return kwargs.pop("method", "GET"), kwargs.pop("url"), kwargs
+    method, url, *payload = spec
+    return method, url, {"json": payload[0]} if payload else {}
+
+
+def execute_many(func, items, concurrency=8, fail_fast=False, progress=None):
+    """
+    Call func(item) for every item with at most concurrency calls in flight
+    :param func: Callable of a single item
+    :param items: Iterable of the items
+    :param concurrency: Max number of concurrent calls
+    :param fail_fast: Cancel the calls not started yet and raise BulkRequestException
+        on the first error (Default: False - collect all results and errors)
+    :param progress: Callable progress(completed, total, bulk_result) invoked
+        after every completed call
+    :return: List of BulkResult objects in the input order
+    :raises: BulkRequestException on the first error in fail-fast mode
+    """
+    items = list(items)
+    results = [
+        BulkResult(index, item, cancelled=True) for index, item in enumerate(items)
+    ]
+    if not items:
+        return results
+    cancelled = threading.Event()
+
+    def call(index):
+        if cancelled.is_set():
+            return
+        try:
+            results[index] = BulkResult(index, items[index], result=func(items[index]))
+        except Exception as e:
+            results[index] = BulkResult(index, items[index], error=e)
+
+    completed = 0
+    with ThreadPoolExecutor(min(concurrency, len(items))) as executor:
+        # Every call runs in a copy of the caller context (request_context)
+        futures = {
+            executor.submit(contextvars.copy_context().run, call, index): index
+            for index in range(len(items))
+        }
+        for future in as_completed(futures):
+            result = results[futures[future]]
+            if result.cancelled:
+                continue
+            completed += 1
+            if progress is not None:
+                progress(completed, len(items), result)
+            if result.error is not None and fail_fast and not cancelled.is_set():
+                LOG.warning(
+                    f"Bulk item {result.index} failed, cancelling: {result.error!r}"
+                )
+                cancelled.set()
+                for pending in futures:
+                    pending.cancel()
+    errors = [result for result in results if result.error is not None]
+    LOG.info(
+        f"Bulk of {len(items)} calls: {completed - len(errors)} succeeded, "
+        f"{len(errors)} failed, {len(items) - completed} cancelled"
+    )
+    if errors and fail_fast:
+        raise BulkRequestException(
+            f"Bulk item {errors[0].index} failed: {errors[0].error}", results
+        )
+    return results
@@ -0,0 +1,218 @@
+"""
+TTL + ETag Response Cache for the idempotent GET requests of the core REST Session
+"""
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+
+from .utils import build_response
+
+LOG = logging.getLogger(__name__)
+
+
+class CacheRule:
+    """
+    Caching rule of the GET requests whose URL matches the pattern
+    """
+
+    def __init__(self, pattern, ttl, shared=False):
+        """
+        :param pattern: Regular expression searched in the request URL
+        :param ttl: Time in seconds the response is served without a round trip.
+            Once expired, the response is revalidated with If-None-Match /
+            If-Modified-Since when the server provided ETag / Last-Modified
+        :param shared: Share the cached response between different Authorization
+            headers (public data like settings.json)
+        """
+        self.pattern = re.compile(pattern)
+        self.ttl = ttl
+        self.shared = shared
+
+
+# Rules for the effectively static GLCP data, e.g. ResponseCache(rules=STATIC_ROUTE_RULES)
+STATIC_ROUTE_RULES = (
+    CacheRule(r"/settings\.json$", 3600, shared=True),
+    CacheRule(r"/app-catalog/ui/v1/(countries|regions|languages)(/|\?|$)", 600),
+    CacheRule(r"/firmware-registry/internal/v1/search/all/platform/", 600),
+    CacheRule(r"/(license-tiers|license/tiers)(\?|$)", 600),
+)
+
+
+class CacheEntry:
+    """
+    Cached GET response
+    """
+
+    def __init__(self, response, ttl):
+        self.status_code = response.status_code
+        self.reason = response.reason
+        self.headers = dict(response.headers)
+        self.encoding = response.encoding
+        self.content = response.content
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        self.expires_at = time.monotonic() + ttl
+
+    @property
+    def is_fresh(self):
+        return time.monotonic() < self.expires_at
+
+    @property
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self, url):
+        return build_response(
+            requests.Request("GET", url).prepare(),
+            self.status_code,
+            self.headers,
+            self.content,
+            reason=self.reason,
+            encoding=self.encoding,
+        )
+
+
+class ResponseCache:
+    """
+    Thread-safe size-bounded LRU cache of GET responses.
+
+    Only 200 responses of the URLs matching one of the rules are cached. Fresh
+    entries are served without network access, expired ones with validators are
+    revalidated by a conditional request (304 - served from the cache).
+    Successful write requests (POST/PUT/PATCH/DELETE) invalidate the cached
+    entries under the written URL.
+    """
+
+    def __init__(
+        self, rules=STATIC_ROUTE_RULES, default_ttl=None, max_entries=512, max_bytes=None
+    ):
+        """
+        :param rules: List of CacheRule objects, first matching rule is applied
+        :param default_ttl: TTL of GET responses not matching any rule
+            (Default: None - such responses are not cached)
+        :param max_entries: Max number of cached responses
+        :param max_bytes: Max total size of cached response bodies (None - no limit)
+        """
+        self.rules = list(rules)
+        self.default_rule = None if default_ttl is None else CacheRule("", default_ttl)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def get_rule(self, url):
+        """
+        :param url: Request URL
+        :return: Matching CacheRule object or None
+        """
+        for rule in self.rules:
+            if rule.pattern.search(url):
+                return rule
+        return self.default_rule
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key, entry):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.content)
+            self._entries[key] = entry
+            self._size += len(entry.content)
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._size > self.max_bytes)
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.content)
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def fetch(self, url, send, identity=None, **kwargs):
+        """
+        Serve the GET request from the cache or via send() and cache the response
+        :param url: Request URL
+        :param send: Callable sending the GET request: send(url, **kwargs)
+        :param identity: Caller identity (e.g. Authorization header) for non-shared rules
+        :param kwargs: Keyword arguments of the request
+        :return: requests.Response object
+        """
+        rule = self.get_rule(url)
+        if rule is None or kwargs.get("stream"):
+            return send(url, **kwargs)
+        full_url = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+        if rule.shared or not identity:
+            key = (full_url, None)
+        else:
+            key = (full_url, hashlib.sha256(identity.encode("utf-8")).hexdigest())
+        entry = self._get(key)
+        if entry is not None and entry.is_fresh:
+            self._count("hits")
+            return entry.to_response(full_url)
+        if entry is not None and entry.conditional_headers:
+            kwargs["headers"] = {
+                **entry.conditional_headers,
+                **(kwargs.get("headers") or {}),
+            }
+        response = send(url, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            self._count("revalidations")
+            entry.expires_at = time.monotonic() + rule.ttl
+            return entry.to_response(full_url)
+        self._count("misses")
+        if response.status_code == 200:
+            self._store(key, CacheEntry(response, rule.ttl))
+        return response
+
+    def invalidate(self, pattern=None):
+        """
+        Drop the cached responses
+        :param pattern: Regular expression searched in the cached URLs
+            (Default: None - drop all)
+        """
+        with self._lock:
+            if pattern is None:
+                self._entries.clear()
+                self._size = 0
+                return
+            regex = re.compile(pattern)
+            for key in [key for key in self._entries if regex.search(key[0])]:
+                self._size -= len(self._entries.pop(key).content)
+
+    def invalidate_url(self, url):
+        """
+        Drop the cached responses of the URL and its sub-resources
+        :param url: Request URL (query is ignored)
+        """
+        self.invalidate("^" + re.escape(url.split("?")[0]) + r"(/|\?|$)")
+
+    @property
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+        }
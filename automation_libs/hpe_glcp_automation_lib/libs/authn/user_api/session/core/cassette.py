@@ -0,0 +1,273 @@
+"""
+HTTP Record/Replay Cassettes for the core REST Session
+"""
+import atexit
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import urllib.parse as urlparse
+
+from requests.adapters import BaseAdapter
+
+from .exceptions import CassetteMissException
+from .utils import build_response
+
+LOG = logging.getLogger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+
+# Secrets scrubbed from the cassette and ignored in the request matching
+SCRUBBED_FIELDS = frozenset(
+    [
+        "password",
+        "client_secret",
+        "access_token",
+        "refresh_token",
+        "id_token",
+        "token",
+        "statetoken",
+        "sessiontoken",
+        "credential_1",
+    ]
+)
+# Per-login random (PKCE) values ignored in the request matching
+IGNORED_FIELDS = frozenset(["code", "code_verifier", "code_challenge", "state", "nonce"])
+SCRUBBED_HEADERS = frozenset(["authorization", "cookie", "set-cookie", "x-auth-token"])
+SCRUBBED_VALUE = "*****"
+
+
+class CassetteAdapter(BaseAdapter):
+    """
+    Transport adapter recording responses of the wrapped adapter into a cassette
+    or serving them back from the cassette without network access
+    """
+
+    def __init__(self, cassette, adapter=None):
+        """
+        :param cassette: Cassette object
+        :param adapter: Wrapped adapter used for the real requests in record mode
+        """
+        super().__init__()
+        self.cassette = cassette
+        self.adapter = adapter
+
+    def send(self, request, **kwargs):
+        if self.cassette.mode == REPLAY:
+            return self.cassette.play(request, self)
+        response = self.adapter.send(request, **kwargs)
+        self.cassette.record(request, response)
+        return response
+
+    def close(self):
+        if self.adapter is not None:
+            self.adapter.close()
+
+
+class Cassette:
+    """
+    On-disk (gzipped JSON) collection of recorded HTTP interactions.
+
+    Interactions are matched by method, URL, normalized query and request body hash.
+    Repeated identical requests are replayed in the recorded order (the last
+    response is served again once exhausted), so polling flows replay as recorded.
+    Use SESSION_CASSETTE and SESSION_CASSETTE_MODE ("record" or "replay")
+    environment variables to enable a cassette for every Session in the process.
+    """
+
+    _cassettes = {}
+    _cassettes_lock = threading.Lock()
+
+    def __init__(
+        self,
+        path,
+        mode=REPLAY,
+        scrub_fields=SCRUBBED_FIELDS,
+        ignore_fields=IGNORED_FIELDS,
+    ):
+        """
+        :param path: Cassette file path
+        :param mode: "record" or "replay"
+        :param scrub_fields: Lower-case names of the secret fields and query
+            parameters scrubbed from the responses and ignored in the request matching
+        :param ignore_fields: Lower-case names of the request fields and query
+            parameters ignored in the request matching
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unsupported cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.scrub_fields = frozenset(scrub_fields)
+        self.ignore_fields = self.scrub_fields | frozenset(ignore_fields)
+        self.interactions = {}
+        self._played = {}
+        self._lock = threading.Lock()
+        if mode == REPLAY:
+            self.load()
+        else:
+            atexit.register(self.save)
+
+    @classmethod
+    def get(cls, path, mode=REPLAY):
+        """
+        Get the process-wide cassette for the path
+        :param path: Cassette file path
+        :param mode: "record" or "replay"
+        :return: Cassette object
+        """
+        with cls._cassettes_lock:
+            cassette = cls._cassettes.get(path)
+            if cassette is None:
+                cassette = cls._cassettes[path] = cls(path, mode)
+            return cassette
+
+    @classmethod
+    def from_env(cls):
+        """
+        :return: Cassette configured via environment variables or None
+        """
+        path = os.getenv("SESSION_CASSETTE")
+        if not path:
+            return None
+        return cls.get(path, os.getenv("SESSION_CASSETTE_MODE", REPLAY))
+
+    def mount(self, session, adapter=None):
+        """
+        Mount the cassette on both http:// and https:// prefixes of the session
+        :param session: requests.Session object
+        :param adapter: Adapter used for the real requests in record mode
+        :return: requests.Session object
+        """
+        cassette_adapter = CassetteAdapter(self, adapter)
+        session.mount("https://", cassette_adapter)
+        session.mount("http://", cassette_adapter)
+        return session
+
+    def _scrub(self, data, fields):
+        if isinstance(data, dict):
+            return {
+                key: SCRUBBED_VALUE
+                if str(key).lower() in fields
+                else self._scrub(value, fields)
+                for key, value in data.items()
+            }
+        if isinstance(data, list):
+            return [self._scrub(item, fields) for item in data]
+        return data
+
+    def _normalize_query(self, query):
+        return sorted(
+            (key, SCRUBBED_VALUE if key.lower() in self.ignore_fields else value)
+            for key, value in urlparse.parse_qsl(query, keep_blank_values=True)
+        )
+
+    def _get_body_hash(self, request):
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        if not body:
+            return ""
+        content_type = request.headers.get("Content-Type", "")
+        try:
+            if "json" in content_type:
+                body = json.dumps(
+                    self._scrub(json.loads(body), self.ignore_fields), sort_keys=True
+                ).encode("utf-8")
+            elif "x-www-form-urlencoded" in content_type:
+                body = urlparse.urlencode(self._normalize_query(body.decode("utf-8")))
+                body = body.encode("utf-8")
+        except (ValueError, UnicodeDecodeError):
+            pass
+        return hashlib.sha256(body).hexdigest()[:32]
+
+    def get_key(self, request):
+        """
+        :param request: requests.PreparedRequest object
+        :return: Interaction key "<METHOD> <url without query>?<normalized query> <body hash>"
+        """
+        parsed = urlparse.urlsplit(request.url)
+        query = urlparse.urlencode(self._normalize_query(parsed.query))
+        url = urlparse.urlunsplit((parsed.scheme, parsed.netloc, parsed.path, query, ""))
+        return f"{request.method} {url} {self._get_body_hash(request)}"
+
+    def record(self, request, response):
+        """
+        Store the response for the request
+        :param request: requests.PreparedRequest object
+        :param response: requests.Response object
+        """
+        content = response.content
+        try:
+            content = json.dumps(self._scrub(json.loads(content), self.scrub_fields))
+            content = content.encode("utf-8")
+        except (ValueError, UnicodeDecodeError):
+            pass
+        try:
+            body = {"text": content.decode("utf-8")}
+        except UnicodeDecodeError:
+            body = {"base64": base64.b64encode(content).decode("ascii")}
+        interaction = {
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                name: SCRUBBED_VALUE if name.lower() in SCRUBBED_HEADERS else value
+                for name, value in response.headers.items()
+            },
+            "encoding": response.encoding,
+            **body,
+        }
+        with self._lock:
+            self.interactions.setdefault(self.get_key(request), []).append(interaction)
+
+    def play(self, request, adapter=None):
+        """
+        Build the recorded response for the request
+        :param request: requests.PreparedRequest object
+        :param adapter: Adapter object to be set as the response connection
+        :return: requests.Response object
+        """
+        key = self.get_key(request)
+        with self._lock:
+            recorded = self.interactions.get(key)
+            if not recorded:
+                raise CassetteMissException(f"No recorded interaction for '{key}'")
+            index = self._played.get(key, 0)
+            self._played[key] = index + 1
+            interaction = recorded[min(index, len(recorded) - 1)]
+        if "base64" in interaction:
+            content = base64.b64decode(interaction["base64"])
+        else:
+            content = interaction["text"].encode("utf-8")
+        return build_response(
+            request,
+            interaction["status"],
+            interaction["headers"],
+            content,
+            reason=interaction["reason"],
+            encoding=interaction["encoding"],
+            connection=adapter,
+        )
+
+    def load(self):
+        """
+        Load the interactions from the cassette file
+        """
+        with gzip.open(self.path, "rt", encoding="utf-8") as cassette_file:
+            self.interactions = json.load(cassette_file)
+        self._played = {}
+        LOG.info(
+            f"Loaded {len(self.interactions)} interactions from cassette {self.path}"
+        )
+
+    def save(self):
+        """
+        Write the recorded interactions into the cassette file
+        """
+        with self._lock:
+            with gzip.open(self.path, "wt", encoding="utf-8") as cassette_file:
+                json.dump(self.interactions, cassette_file, separators=(",", ":"))
+        LOG.info(f"Saved {len(self.interactions)} interactions to cassette {self.path}")
@@ -0,0 +1,193 @@
+"""
+Per-host Circuit Breaker of the core REST Session
+"""
+import logging
+import threading
+import time
+import urllib.parse as urlparse
+
+from .exceptions import CircuitOpenException
+
+LOG = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+DEFAULT_FAILURE_STATUSES = (500, 502, 503, 504)
+
+
+class Circuit:
+    """
+    State of the circuit of a single (host, path prefix) dependency
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probes = 0
+        self.last_error = None
+        self.last_response = None
+        self.rejected = 0
+
+    def as_dict(self):
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "last_error": self.last_error,
+        }
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker keyed by host and path prefix.
+
+    closed - requests pass, consecutive failures are counted;
+    open - after failure_threshold consecutive failures requests fail immediately
+        with CircuitOpenException carrying the last observed error;
+    half-open - after recovery_timeout up to half_open_max_calls probe requests
+        pass, a successful probe closes the circuit, a failed one opens it again,
+        a probe ended without an outcome is released (release()).
+    A single CircuitBreaker object may be shared by several Session objects.
+    """
+
+    def __init__(
+        self,
+        failure_threshold=5,
+        recovery_timeout=30,
+        half_open_max_calls=1,
+        failure_statuses=DEFAULT_FAILURE_STATUSES,
+        path_depth=1,
+    ):
+        """
+        :param failure_threshold: Number of consecutive failures opening the circuit
+        :param recovery_timeout: Time in seconds the circuit stays open before probing
+        :param half_open_max_calls: Max number of concurrent probe requests
+        :param failure_statuses: Response status codes counted as failures
+            (connection errors and timeouts are always failures)
+        :param path_depth: Number of leading path segments in the circuit key,
+            e.g. 1 - ("host", "/activate-inventory"), 0 - whole host
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_statuses = frozenset(failure_statuses)
+        self.path_depth = path_depth
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def get_key(self, url):
+        """
+        :param url: Request URL
+        :return: Circuit key (host, path prefix)
+        """
+        parsed = urlparse.urlparse(url)
+        segments = [segment for segment in parsed.path.split("/") if segment]
+        return parsed.netloc, "/" + "/".join(segments[: self.path_depth])
+
+    def _get_circuit(self, url):
+        key = self.get_key(url)
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = Circuit(key)
+        return circuit
+
+    def before_call(self, url):
+        """
+        Check whether the request may be sent
+        :param url: Request URL
+        :return: Circuit object of the request
+        :raises: CircuitOpenException when the circuit is open
+        """
+        with self._lock:
+            circuit = self._get_circuit(url)
+            if circuit.state == CLOSED:
+                return circuit
+            if circuit.state == OPEN:
+                if time.monotonic() - circuit.opened_at >= self.recovery_timeout:
+                    LOG.info(f"Circuit {circuit.key} is half-open, probing")
+                    circuit.state = HALF_OPEN
+                    circuit.probes = 0
+            if circuit.state == HALF_OPEN and circuit.probes < self.half_open_max_calls:
+                circuit.probes += 1
+                return circuit
+            circuit.rejected += 1
+        raise CircuitOpenException(
+            f"Circuit {circuit.key} is {circuit.state}, "
+            f"last error: {circuit.last_error}",
+            circuit.last_response,
+            circuit.last_error,
+        )
+
+    def is_failure(self, response):
+        """
+        :param response: Response object
+        :return: True if the response counts as a failure
+        """
+        return response.status_code in self.failure_statuses
+
+    def record(self, circuit, response=None, error=None):
+        """
+        Record the outcome of the request sent after before_call()
+        :param circuit: Circuit object returned by before_call()
+        :param response: Response object (None on connection errors)
+        :param error: Exception raised by the request
+        """
+        if error is None and not self.is_failure(response):
+            self.record_success(circuit)
+            return
+        if error is None:
+            error = f"{response.status_code} {response.reason} for url: {response.url}"
+        self.record_failure(
+            circuit, repr(error) if isinstance(error, Exception) else error, response
+        )
+
+    def release(self, circuit):
+        """
+        Release the probe slot taken by before_call() when the request ended without
+        an outcome (e.g. deadline, rate limiter or encoding errors, cancellation)
+        :param circuit: Circuit object returned by before_call()
+        """
+        with self._lock:
+            if circuit.state == HALF_OPEN and circuit.probes > 0:
+                circuit.probes -= 1
+
+    def record_success(self, circuit):
+        with self._lock:
+            if circuit.state != CLOSED:
+                LOG.info(f"Circuit {circuit.key} is closed")
+            circuit.state = CLOSED
+            circuit.failures = 0
+            circuit.probes = 0
+
+    def record_failure(self, circuit, error, response=None):
+        with self._lock:
+            circuit.failures += 1
+            circuit.last_error = error
+            circuit.last_response = response
+            if circuit.state == HALF_OPEN or (
+                circuit.state == CLOSED and circuit.failures >= self.failure_threshold
+            ):
+                LOG.warning(
+                    f"Circuit {circuit.key} is open after {circuit.failures} "
+                    f"failures, last error: {error}"
+                )
+                circuit.state = OPEN
+                circuit.opened_at = time.monotonic()
+
+    def reset(self):
+        with self._lock:
+            self._circuits.clear()
+
+    def as_dict(self):
+        """
+        :return: Dictionary of "<host><path prefix>" and circuit state
+        """
+        with self._lock:
+            return {
+                f"{host}{prefix}": circuit.as_dict()
+                for (host, prefix), circuit in self._circuits.items()
+            }
@@ -0,0 +1,152 @@
+"""
+Pluggable JSON Codecs for the request/response bodies of the core REST Session
+"""
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+import codecs
+import logging
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+LOG = logging.getLogger(__name__)
+
+
+class JsonCodec:
+    """
+    Standard library (or simplejson) JSON codec, always available
+    """
+
+    name = "json"
+    decode_error = ValueError
+
+    def dumps(self, obj):
+        """
+        :param obj: JSON serializable object
+        :return: Encoded JSON document (bytes)
+        """
+        return json.dumps(obj, allow_nan=False).encode("utf-8")
+
+    def loads(self, data):
+        """
+        :param data: JSON document (bytes or str)
+        :return: Decoded object
+        """
+        return json.loads(data)
+
+    def loads_response(self, response):
+        """
+        Decode the JSON body of the response
+        :param response: Response object (requests.Response or AsyncResponse)
+        :return: Decoded object
+        :raises: decode_error if the body is not a JSON document
+        """
+        try:
+            return self.loads(response.content)
+        except self.decode_error:
+            # Bodies in a declared non UTF-8 charset are decoded via the response text
+            encoding = response.encoding
+            if not encoding or codecs.lookup(encoding).name == "utf-8":
+                raise
+        return self.loads(response.text)
+
+    def encode_request(self, kwargs, default_headers=None):
+        """
+        Replace the "json" request keyword argument with the encoded "data" body
+        :param kwargs: Request keyword arguments
+        :param default_headers: Headers sent with every request of the session
+        :return: Request keyword arguments
+        """
+        if kwargs.get("json") is None or kwargs.get("data") is not None:
+            return kwargs
+        kwargs = dict(kwargs)
+        kwargs["data"] = self.dumps(kwargs.pop("json"))
+        headers = {**(default_headers or {}), **(kwargs.get("headers") or {})}
+        if not any(name.lower() == "content-type" for name in headers):
+            kwargs["headers"] = {
+                **(kwargs.get("headers") or {}),
+                "Content-Type": "application/json",
+            }
+        return kwargs
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    orjson codec (the fastest one, Rust implementation)
+    Unlike simplejson, it does not encode decimal.Decimal values and decodes the
+    numbers with a fraction as float.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError(
+                "orjson is not installed (hpe-glcp-automation-lib[fast-json] extra)"
+            )
+        self.decode_error = orjson.JSONDecodeError
+
+    def dumps(self, obj):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+class UjsonCodec(JsonCodec):
+    """
+    ujson codec (C implementation)
+    Unlike simplejson, it encodes decimal.Decimal values as float and decodes the
+    numbers with a fraction as float.
+    """
+
+    name = "ujson"
+
+    def __init__(self):
+        if ujson is None:
+            raise ImportError(
+                "ujson is not installed (hpe-glcp-automation-lib[fast-json] extra)"
+            )
+
+    def dumps(self, obj):
+        return ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+
+# Codecs by name (fastest first)
+CODECS = {
+    OrjsonCodec.name: OrjsonCodec,
+    UjsonCodec.name: UjsonCodec,
+    JsonCodec.name: JsonCodec,
+}
+
+
+def get_codec(name=None):
+    """
+    The faster codecs are opt-in, since they do not handle decimal.Decimal values
+    like simplejson does (see codec_benchmark for the gain on the GLCP payloads)
+    :param name: Codec name: "orjson", "ujson" or "json"
+        (Default: SESSION_JSON_CODEC environment variable or "json")
+    :return: JsonCodec object
+    """
+    name = name or os.getenv("SESSION_JSON_CODEC") or JsonCodec.name
+    if name not in CODECS:
+        raise ValueError(f"Unsupported JSON codec: {name}")
+    return CODECS[name]()
+
+
+DEFAULT_CODEC = get_codec()
+LOG.debug(f"Default JSON codec: {DEFAULT_CODEC.name}")
@@ -0,0 +1,206 @@
+"""
+Benchmark of the JSON codecs on representative GLCP payloads
+
+Usage: python -m hpe_glcp_automation_lib.libs.authn.user_api.session.core.codec_benchmark
+"""
+import time
+import uuid
+
+try:
+    from hpe_glcp_automation_lib.libs.sm.helpers.sm_payload_constants import (
+        SmInputPayload,
+    )
+except ImportError:
+    SmInputPayload = None
+
+from .codec import CODECS
+
+
+def get_inventory_response(devices=2000):
+    """
+    :param devices: Number of devices in the page
+    :return: NBAPI-like devices page with the max page size
+    """
+    return {
+        "count": devices,
+        "offset": 0,
+        "total": devices * 5,
+        "items": [
+            {
+                "id": str(uuid.uuid4()),
+                "type": "devices/device",
+                "serialNumber": f"STIAPJ{index:06d}",
+                "macAddress": f"00:1A:1E:{index >> 16 & 255:02X}:"
+                f"{index >> 8 & 255:02X}:{index & 255:02X}",
+                "partNumber": "JW242AR",
+                "deviceType": "AP",
+                "model": "Aruba AP-515 (US)",
+                "application": {"id": str(uuid.uuid4()), "resourceUri": None},
+                "region": "us-west",
+                "archived": False,
+                "tags": [{"name": "site", "value": f"site-{index % 50}"}],
+                "subscriptions": [{"key": f"E91A{index:08X}", "tier": "FOUNDATION_AP"}],
+                "createdAt": "2023-03-01T12:00:00.000Z",
+                "updatedAt": "2023-03-02T08:30:00.000Z",
+            }
+            for index in range(devices)
+        ],
+    }
+
+
+def get_order_payload(entitlements=3):
+    """
+    :param entitlements: Number of the order entitlements (line items)
+    :return: Synthetic subscription order of the SM order payloads shape (nested
+        parties, product attributes, licenses with appointments, non-ASCII addresses)
+    """
+    attributes = [
+        ("BILL_FREQ", "UP", "Paid Upfront", "Billing Frequency"),
+        ("TERM_IN_MONTHS", "36", "36", "Term In Months"),
+        ("TIER", "FO", "Foundation", "Tier"),
+        ("INVOICING_MODEL", "UP", "Paid Upfront", "Invoicing Model"),
+    ]
+    return {
+        "reason": "Creation",
+        "quote": "QUOTE00001",
+        "contract": "QUOTE00001",
+        "smcCode": "E",
+        "customer": {
+            "MDM": "QUOTE00001",
+            "phone": "50179505",
+            "postal_code": "164 40",
+            "address": "Kronborgsgränd 7",
+            "city": "Kista",
+            "country": "SE",
+            "company_name": "Example Company AB",
+            "email": "customer@example.com",
+        },
+        "activate": {
+            "soldTo": "Kronborgsgränd 7 Kista SE",
+            "soldToName": "Example Distributor AB",
+            "shipTo": "Kronborgsgränd 7 Kista SE",
+            "endUserName": "Example Company AB",
+            "po": "PO_00001",
+            "orderClass": "ZBRIM",
+            "parties": [
+                {
+                    "function": function,
+                    "id": "QUOTE00001",
+                    "countryId": "120771848",
+                    "globalId": "120771846",
+                }
+                for function in ("AG", "WE", "RE", "RG", "Z1", "ZC", "ZE", "ZL")
+            ],
+        },
+        "entitlements": [
+            {
+                "lineItem": f"{(line + 1) * 10:010d}",
+                "quote": "QUOTE00001",
+                "total_qty": "2.000",
+                "available_qty": "0.00",
+                "product": {
+                    "sku": "JN001AAS",
+                    "description": "Aruba Central AP Fnd 3yr Sub SaaS",
+                    "attributes": [
+                        {
+                            "name": name,
+                            "value": value,
+                            "valueDisplay": value_display,
+                            "nameDisplay": name_display,
+                        }
+                        for name, value, value_display, name_display in attributes
+                    ],
+                },
+                "licenses": [
+                    {
+                        "id": f"E91A{line:08X}",
+                        "qty": "2.0",
+                        "devices": [],
+                        "appointments": {
+                            "subscriptionStart": "01.03.2023 12:00:00",
+                            "subscriptionEnd": "01.03.2026 12:00:00",
+                        },
+                    }
+                ],
+            }
+            for line in range(entitlements)
+        ],
+    }
+
+
+def get_sm_order_payload():
+    """
+    :return: SmInputPayload combined networking order, the synthetic order when the
+        SM helpers are not importable
+    """
+    if SmInputPayload is None:
+        return get_order_payload()
+    return SmInputPayload.combined_iap_sw_gw_subs()
+
+
+def get_payloads():
+    """
+    :return: Dictionary of the benchmark payload name and payload
+    """
+    return {
+        "sm_order": get_sm_order_payload(),
+        "sm_order_x50": [get_sm_order_payload() for _ in range(50)],
+        "inventory_2000": get_inventory_response(),
+    }
+
+
+def _measure(func, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number
+
+
+def benchmark(payloads=None, number=50):
+    """
+    Measure the average encode/decode time of every installed codec
+    :param payloads: Dictionary of the payload name and payload (Default: get_payloads())
+    :param number: Number of iterations per measurement
+    :return: List of dictionaries (payload, codec, size, encode and decode time in ms)
+    """
+    results = []
+    for payload_name, payload in (payloads or get_payloads()).items():
+        for codec_class in CODECS.values():
+            try:
+                codec = codec_class()
+            except ImportError:
+                continue
+            document = codec.dumps(payload)
+            results.append(
+                {
+                    "payload": payload_name,
+                    "codec": codec.name,
+                    "size": len(document),
+                    "encode_ms": _measure(lambda: codec.dumps(payload), number) * 1000,
+                    "decode_ms": _measure(lambda: codec.loads(document), number) * 1000,
+                }
+            )
+    return results
+
+
+def main():
+    results = benchmark()
+    baseline = {
+        result["payload"]: result for result in results if result["codec"] == "json"
+    }
+    print(
+        f"{'payload':<16}{'codec':<8}{'size':>10}{'encode ms':>12}{'decode ms':>12}"
+        f"{'encode x':>10}{'decode x':>10}"
+    )
+    for result in results:
+        base = baseline[result["payload"]]
+        print(
+            f"{result['payload']:<16}{result['codec']:<8}{result['size']:>10}"
+            f"{result['encode_ms']:>12.3f}{result['decode_ms']:>12.3f}"
+            f"{base['encode_ms'] / result['encode_ms']:>10.1f}"
+            f"{base['decode_ms'] / result['decode_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
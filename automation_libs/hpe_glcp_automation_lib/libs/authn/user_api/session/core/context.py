@@ -0,0 +1,96 @@
+"""
+Per-thread (and per-asyncio task) Request Context of the core REST Session
+"""
+import contextvars
+import uuid
+from contextlib import contextmanager
+
+from requests.structures import CaseInsensitiveDict
+
+TRANSACTION_ID_HEADER = "CCS-Transaction-Id"
+
+# Mapping of id(session) -> RequestContext, replaced (never mutated) on every change
+_REQUEST_CONTEXTS = contextvars.ContextVar("session_request_contexts", default={})
+
+
+def new_transaction_id(prefix=""):
+    """
+    Default transaction id factory, e.g. Session(transaction_id_factory=new_transaction_id)
+    :param prefix: Transaction id prefix (e.g. "create_subs_")
+    :return: Unique transaction id
+    """
+    return prefix + uuid.uuid1().hex
+
+
+class RequestContext:
+    """
+    Headers applied to the requests of a session sent from the current thread (or
+    asyncio task) only, leaving the shared session headers untouched
+    """
+
+    def __init__(self, headers=None, token=None, transaction_id=None, parent=None):
+        """
+        :param headers: Additional request headers
+        :param token: Bearer token overriding the session Authorization header
+        :param transaction_id: Transaction id overriding the generated one
+        :param parent: Enclosing RequestContext of the same session
+        """
+        self.headers = CaseInsensitiveDict(parent.headers if parent else {})
+        self.headers.update(headers or {})
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+        self.transaction_id = transaction_id or (
+            parent.transaction_id if parent else None
+        )
+
+
+def get_request_context(session):
+    """
+    :param session: Session object
+    :return: RequestContext of the session active in the current thread/task or None
+    """
+    return _REQUEST_CONTEXTS.get().get(id(session))
+
+
+@contextmanager
+def request_context(session, headers=None, token=None, transaction_id=None):
+    """
+    Apply the headers to the requests of the session sent from the current
+    thread/task inside the with block. Nested contexts extend the enclosing one.
+    :param session: Session object
+    :param headers: Additional request headers
+    :param token: Bearer token overriding the session Authorization header
+    :param transaction_id: Transaction id overriding the generated one
+    :return: RequestContext object
+    """
+    contexts = _REQUEST_CONTEXTS.get()
+    context = RequestContext(headers, token, transaction_id, contexts.get(id(session)))
+    reset_token = _REQUEST_CONTEXTS.set({**contexts, id(session): context})
+    try:
+        yield context
+    finally:
+        _REQUEST_CONTEXTS.reset(reset_token)
+
+
+def get_request_headers(session, headers=None):
+    """
+    Merge the request headers over the session request context and transaction id.
+    Precedence: call headers > request context headers > transaction id
+    :param session: Session object
+    :param headers: Headers passed to the call
+    :return: Merged headers or the call headers when there is nothing to merge
+    """
+    context = get_request_context(session)
+    factory = getattr(session, "transaction_id_factory", None)
+    if context is None and factory is None:
+        return headers
+    merged = CaseInsensitiveDict()
+    transaction_id = context.transaction_id if context else None
+    if transaction_id is None and factory is not None:
+        transaction_id = factory()
+    if transaction_id is not None:
+        merged[session.transaction_id_header] = transaction_id
+    if context is not None:
+        merged.update(context.headers)
+    merged.update(headers or {})
+    return merged
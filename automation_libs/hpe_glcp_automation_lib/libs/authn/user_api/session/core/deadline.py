@@ -0,0 +1,181 @@
+"""
+Per-thread (and per-asyncio task) Deadline of the multi-step Session flows
+"""
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+
+from .exceptions import DeadlineExceededException
+
+LOG = logging.getLogger(__name__)
+
+# Minimal budget left for the next attempt when a wait is cut to the deadline
+MIN_ATTEMPT_TIME = 0.1
+
+_DEADLINE = contextvars.ContextVar("session_deadline", default=None)
+_STEP = contextvars.ContextVar("session_deadline_step", default=None)
+
+
+class Deadline:
+    """
+    Time budget of a flow (helper method, test) shared by all of its steps:
+    the Session requests cut their timeouts to the remaining budget, the retry
+    sleeps and pollers do not wait past it and DeadlineExceededException names
+    the step the budget ran out at.
+    """
+
+    def __init__(self, budget, name=None, parent=None):
+        """
+        :param budget: Time budget in seconds
+        :param name: Name of the flow (used in the exception message)
+        :param parent: Enclosing Deadline, the nested one never outlives it
+        """
+        self.budget = budget
+        self.name = name or (parent.name if parent else "flow")
+        self.started = time.monotonic()
+        self.expires_at = self.started + budget
+        if parent is not None and parent.expires_at < self.expires_at:
+            self.expires_at = parent.expires_at
+
+    def remaining(self):
+        """
+        :return: Seconds left before the deadline (0 if expired)
+        """
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return time.monotonic() >= self.expires_at
+
+    def exceeded(self, step=None, reason=None):
+        """
+        :param step: Step the budget ran out at (Default: current deadline_step)
+        :param reason: Additional details (e.g. the wait which did not fit)
+        :return: DeadlineExceededException object
+        """
+        step = step or _STEP.get() or "unnamed step"
+        message = (
+            f"Deadline of '{self.name}' ({self.budget:g}s) exceeded at step '{step}' "
+            f"after {time.monotonic() - self.started:.2f}s"
+        )
+        if reason:
+            message += f": {reason}"
+        return DeadlineExceededException(message, step=step, deadline=self)
+
+    def check(self, step=None):
+        """
+        :param step: Step about to start
+        :raises: DeadlineExceededException if the deadline has passed
+        """
+        if self.expired():
+            raise self.exceeded(step)
+
+    def get_timeout(self, timeout=None, step=None):
+        """
+        :param timeout: Request timeout as (connect, read) tuple, a single number or None
+        :param step: Step of the request
+        :return: Timeout cut to the remaining budget
+        :raises: DeadlineExceededException if the deadline has passed
+        """
+        self.check(step)
+        remaining = self.remaining()
+        if isinstance(timeout, tuple):
+            return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+        if timeout is None:
+            return remaining
+        return min(timeout, remaining)
+
+    def get_wait(self, wait, step=None, cut=True):
+        """
+        :param wait: Wait time before the next attempt (retries)
+        :param step: Step waiting
+        :param cut: Cut the wait to the remaining budget less MIN_ATTEMPT_TIME
+            (False - the wait is mandatory, e.g. a rate limit)
+        :return: The wait time, cut so the next attempt starts before the deadline
+        :raises: DeadlineExceededException if no attempt fits in the remaining budget
+        """
+        self.check(step)
+        remaining = self.remaining()
+        if cut and remaining > MIN_ATTEMPT_TIME:
+            if wait > remaining - MIN_ATTEMPT_TIME:
+                LOG.debug(
+                    f"Wait of {wait:g}s is cut to the remaining budget of {self.name}"
+                )
+            return min(wait, remaining - MIN_ATTEMPT_TIME)
+        if cut or wait >= remaining:
+            raise self.exceeded(
+                step,
+                f"waiting {wait:g}s before the next attempt exceeds the remaining "
+                f"{remaining:.2f}s",
+            )
+        return wait
+
+
+def get_deadline():
+    """
+    :return: Deadline active in the current thread/task or None
+    """
+    return _DEADLINE.get()
+
+
+@contextmanager
+def deadline(budget, name=None):
+    """
+    Set the time budget of the flow inside the with block, e.g.
+        with deadline(120, "fetch_unprovisioned_device"):
+            helper.fetch_unprovisioned_device_from_activate(pcid)
+    Nested deadlines are cut to the enclosing one. The threads of Session.map(),
+    Session.submit_many() and Session.paginate() inherit it.
+    :param budget: Time budget in seconds (None - no deadline)
+    :param name: Name of the flow
+    :return: Deadline object
+    """
+    if budget is None:
+        yield get_deadline()
+        return
+    current = Deadline(budget, name, _DEADLINE.get())
+    reset_token = _DEADLINE.set(current)
+    try:
+        yield current
+    finally:
+        _DEADLINE.reset(reset_token)
+
+
+@contextmanager
+def deadline_step(step):
+    """
+    Name the step of the flow reported when the deadline is exceeded inside
+    the with block (the Session requests name themselves "METHOD url")
+    :param step: Step name
+    """
+    reset_token = _STEP.set(step)
+    try:
+        yield
+    finally:
+        _STEP.reset(reset_token)
+
+
+def get_step():
+    """
+    :return: Step name set by deadline_step() or None
+    """
+    return _STEP.get()
+
+
+def sleep(seconds, step=None):
+    """
+    time.sleep() honoring the deadline: the wait is cut to the remaining budget
+    :param seconds: Time to sleep in seconds
+    :param step: Step waiting (Default: current deadline_step)
+    :raises: DeadlineExceededException if the deadline has passed
+    """
+    current = _DEADLINE.get()
+    if current is None:
+        time.sleep(seconds)
+        return
+    current.check(step)
+    if seconds > current.remaining():
+        LOG.debug(
+            f"Wait of {seconds:g}s is cut to the remaining budget of {current.name}"
+        )
+    time.sleep(min(seconds, current.remaining()))
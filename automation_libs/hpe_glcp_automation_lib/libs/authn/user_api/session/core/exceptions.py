@@ -35,3 +35,50 @@ class LoadAccountFailedException(Exception):
     """
     Load Account Failed Exception Class
     """
+
+
+class CassetteMissException(Exception):
+    """
+    Cassette Replay Miss Exception Class
+    """
+
+
+class CircuitOpenException(SessionException):
+    """
+    Circuit Breaker Open (fast-fail) Exception Class
+    """
+
+    def __init__(self, exc_str, response=None, last_error=None):
+        super(CircuitOpenException, self).__init__(exc_str, response)
+        self.last_error = last_error
+
+
+class BulkRequestException(SessionException):
+    """
+    Bulk Request Failed (fail-fast) Exception Class
+    """
+
+    def __init__(self, exc_str, results):
+        super(BulkRequestException, self).__init__(exc_str)
+        self.results = results
+
+
+class DeadlineExceededException(SessionException):
+    """
+    Flow Deadline (time budget) Exceeded Exception Class
+    """
+
+    def __init__(self, exc_str, step=None, deadline=None):
+        super(DeadlineExceededException, self).__init__(exc_str)
+        self.step = step
+        self.deadline = deadline
+
+
+class WaitTimeoutException(Exception):
+    """
+    Wait Condition Timeout Exception Class
+    """
+
+    def __init__(self, exc_str, last_state=None):
+        super(WaitTimeoutException, self).__init__(exc_str)
+        self.last_state = last_state
@@ -0,0 +1,251 @@
+"""
+Per-endpoint Metrics of the core REST Session
+"""
+import atexit
+import json
+import logging
+import os
+import random
+import re
+import threading
+import urllib.parse as urlparse
+from collections import Counter
+
+LOG = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+RESERVOIR_SIZE = 1024
+
+_UUID_RE = re.compile(
+    r"^[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}$"
+)
+_NUMBER_RE = re.compile(r"^\d+$")
+_HEX_ID_RE = re.compile(r"^[0-9a-fA-F]{16,}$")
+# Serial numbers, MAC addresses, order numbers etc.: mixed letters and digits
+_MIXED_ID_RE = re.compile(r"^(?=.*\d)(?=.*[A-Za-z])[\w:.-]{8,}$")
+_VERSION_RE = re.compile(r"^v\d+([a-z]+\d*)?$")
+
+
+def get_path_template(url):
+    """
+    Replace identifiers in the URL path with placeholders, e.g.
+    /subscriptions/v1/orders/5c0a...e1/devices/STIAPJ1V2X -> /subscriptions/v1/orders/{uuid}/devices/{id}
+    :param url: Request URL
+    :return: Templated path
+    """
+    segments = []
+    for segment in urlparse.urlparse(url).path.split("/"):
+        if _UUID_RE.match(segment):
+            segments.append("{uuid}")
+        elif _NUMBER_RE.match(segment) or _HEX_ID_RE.match(segment):
+            segments.append("{id}")
+        elif _MIXED_ID_RE.match(segment) and not _VERSION_RE.match(segment):
+            segments.append("{id}")
+        else:
+            segments.append(segment)
+    return "/".join(segments) or "/"
+
+
+class EndpointStats:
+    """
+    Call statistics of a single (method, host, templated path) endpoint
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.statuses = Counter()
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.reservoir = []
+
+    def record(self, status, latency, bytes_in, bytes_out):
+        self.calls += 1
+        self.statuses[status] += 1
+        if status == "error" or status >= 500:
+            self.errors += 1
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        self.latency_sum += latency
+        self.latency_max = max(self.latency_max, latency)
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                self.buckets[index] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        # Reservoir sampling keeps percentiles accurate with bounded memory
+        if len(self.reservoir) < RESERVOIR_SIZE:
+            self.reservoir.append(latency)
+        else:
+            slot = random.randrange(self.calls)
+            if slot < RESERVOIR_SIZE:
+                self.reservoir[slot] = latency
+
+    def percentile(self, percent):
+        if not self.reservoir:
+            return 0.0
+        ordered = sorted(self.reservoir)
+        index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "statuses": {str(k): v for k, v in self.statuses.items()},
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "latency": {
+                "avg": round(self.latency_sum / self.calls, 6) if self.calls else 0.0,
+                "max": round(self.latency_max, 6),
+                "p50": round(self.percentile(50), 6),
+                "p95": round(self.percentile(95), 6),
+                "p99": round(self.percentile(99), 6),
+            },
+        }
+
+
+def get_prometheus_labels(**labels):
+    """
+    :param labels: Label names and values
+    :return: Labels in Prometheus text format with the values escaped
+    """
+    return ",".join(
+        f'{name}="'
+        + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        + '"'
+        for name, value in labels.items()
+    )
+
+
+class SessionMetrics:
+    """
+    Thread-safe registry of per-endpoint call metrics recorded by Session.
+
+    All sessions share SESSION_METRICS unless another registry (or None to disable
+    recording) is passed as the "metrics" keyword argument of Session.
+    Set SESSION_METRICS_FILE environment variable to dump the shared registry at
+    process exit (Prometheus text format if the file name ends with .prom, "{pid}"
+    in the name is replaced with the process id for parallel workers).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, method, url, status, latency, bytes_in=0, bytes_out=0):
+        """
+        :param method: HTTP method
+        :param url: Request URL
+        :param status: Response status code or "error" for transport failures
+        :param latency: Request duration in seconds
+        :param bytes_in: Response body size
+        :param bytes_out: Request body size
+        """
+        key = (method.upper(), urlparse.urlparse(url).netloc, get_path_template(url))
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = EndpointStats()
+            stats.record(status, latency, bytes_in, bytes_out)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def as_dict(self):
+        """
+        :return: List of endpoint statistics sorted by the total time spent
+        """
+        with self._lock:
+            items = sorted(
+                self._stats.items(), key=lambda item: item[1].latency_sum, reverse=True
+            )
+            return [
+                {"method": method, "host": host, "path": path, **stats.as_dict()}
+                for (method, host, path), stats in items
+            ]
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def to_prometheus(self, prefix="glcp_session"):
+        """
+        :param prefix: Metric names prefix
+        :return: Metrics in Prometheus text exposition format
+        """
+        with self._lock:
+            stats_items = [
+                (get_prometheus_labels(method=method, host=host, path=path), stats)
+                for (method, host, path), stats in self._stats.items()
+            ]
+        requests_total = []
+        request_bytes = []
+        response_bytes = []
+        durations = []
+        for labels, stats in stats_items:
+            for status, count in stats.statuses.items():
+                status_label = get_prometheus_labels(status=status)
+                requests_total.append(
+                    f"{prefix}_requests_total{{{labels},{status_label}}} {count}"
+                )
+            request_bytes.append(
+                f"{prefix}_request_bytes_total{{{labels}}} {stats.bytes_out}"
+            )
+            response_bytes.append(
+                f"{prefix}_response_bytes_total{{{labels}}} {stats.bytes_in}"
+            )
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                cumulative += count
+                durations.append(
+                    f"{prefix}_request_duration_seconds_bucket"
+                    f'{{{labels},le="{bound}"}} {cumulative}'
+                )
+            durations.append(
+                f"{prefix}_request_duration_seconds_bucket"
+                f'{{{labels},le="+Inf"}} {stats.calls}'
+            )
+            durations.append(
+                f"{prefix}_request_duration_seconds_sum{{{labels}}} {stats.latency_sum}"
+            )
+            durations.append(
+                f"{prefix}_request_duration_seconds_count{{{labels}}} {stats.calls}"
+            )
+        # Every family is written as a block under its own TYPE line
+        lines = [f"# TYPE {prefix}_requests_total counter", *requests_total]
+        lines += [f"# TYPE {prefix}_request_bytes_total counter", *request_bytes]
+        lines += [f"# TYPE {prefix}_response_bytes_total counter", *response_bytes]
+        lines += [f"# TYPE {prefix}_request_duration_seconds histogram", *durations]
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path, fmt=None):
+        """
+        Write the metrics into a file
+        :param path: File path, "{pid}" is replaced with the process id
+        :param fmt: "json" or "prometheus" (Default: by file extension, .prom - prometheus)
+        """
+        path = path.replace("{pid}", str(os.getpid()))
+        fmt = fmt or ("prometheus" if path.endswith(".prom") else "json")
+        content = self.to_prometheus() if fmt == "prometheus" else self.to_json(indent=2)
+        with open(path, "w") as metrics_file:
+            metrics_file.write(content)
+        LOG.info(f"Session metrics were written to {path}")
+
+    def dump_at_exit(self, path, fmt=None):
+        """
+        Register dumping of the metrics into a file at process exit
+        :param path: File path
+        :param fmt: "json" or "prometheus" (Default: by file extension)
+        """
+        atexit.register(self.dump, path, fmt)
+
+
+SESSION_METRICS = SessionMetrics()
+
+if os.getenv("SESSION_METRICS_FILE"):
+    SESSION_METRICS.dump_at_exit(os.environ["SESSION_METRICS_FILE"])
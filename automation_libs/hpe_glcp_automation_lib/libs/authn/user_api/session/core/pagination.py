@@ -0,0 +1,359 @@
+"""
+Generic Pagination of the listing APIs of the core REST Session
+"""
+import contextvars
+import logging
+import math
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+LOG = logging.getLogger(__name__)
+
+OFFSET = "offset"
+PAGE = "page"
+CURSOR = "cursor"
+
+DEFAULT_TOTAL_KEYS = ("pagination.total_count", "total_count", "total", "totalCount")
+DEFAULT_NEXT_KEYS = ("next", "pagination.next", "links.next", "next_cursor")
+
+PAGINATOR_OPTIONS = (
+    "style",
+    "page_size",
+    "start",
+    "limit_param",
+    "offset_param",
+    "page_param",
+    "cursor_param",
+    "total_keys",
+    "next_keys",
+    "max_items",
+    "stop",
+    "cursor",
+    "concurrency",
+    "ordered",
+)
+
+
+def get_value(data, path):
+    """
+    :param data: Decoded JSON document
+    :param path: Dotted path, e.g. "pagination.total_count"
+    :return: Value under the path or None
+    """
+    for key in path.split("."):
+        if not isinstance(data, dict) or key not in data:
+            return None
+        data = data[key]
+    return data
+
+
+class Paginator:
+    """
+    Lazy iterator over the pages and items of a paginated listing API.
+
+    Pages are requested one by one via fetch(paging_params) only while the
+    caller consumes the items, so huge listings are walked with bounded memory.
+    The listing ends when the total count (e.g. pagination.total_count) is
+    reached, the next link/cursor is missing (cursor style), a short or empty
+    page is returned, max_items are yielded or stop(item) returns True.
+    The position of the page being consumed (or after the last fully consumed
+    one) is available as the resumable cursor, e.g.
+    Paginator(fetch, cursor=previous.cursor) after an early stop re-reads the
+    partially consumed page.
+
+    With concurrency > 1 the offset and page listings switch to a parallel mode
+    once the total count is known (usually after the first page): the remaining
+    pages are independent, so up to concurrency of them are fetched at a time by
+    a thread pool, while the window only moves as the caller consumes the pages.
+    The pages are laid out by the item count of the first page (servers may cap
+    the requested page size); an ordered listing falls back to the serial mode
+    when a page in the middle comes back short.
+    The pages are yielded in order, or as soon as they arrive with ordered=False.
+    The requests go through the same Session, so its rate limiter, circuit breaker
+    and request context apply to every page.
+    """
+
+    def __init__(
+        self,
+        fetch,
+        items_key=None,
+        style=OFFSET,
+        page_size=100,
+        start=0,
+        limit_param="limit",
+        offset_param="offset",
+        page_param="page",
+        cursor_param="cursor",
+        total_keys=DEFAULT_TOTAL_KEYS,
+        next_keys=DEFAULT_NEXT_KEYS,
+        max_items=None,
+        stop=None,
+        cursor=None,
+        concurrency=1,
+        ordered=True,
+    ):
+        """
+        :param fetch: Callable returning the page (dict, list or Response object)
+            for the paging query params: fetch({"limit": 100, "offset": 200})
+        :param items_key: Dotted path of the items list in the page
+            (Default: None - the page itself or its first list value)
+        :param style: "offset" (limit/offset), "page" (limit/page number) or
+            "cursor" (next link or token)
+        :param page_size: Number of items requested per page (None - not sent)
+        :param start: First offset or page number
+        :param limit_param: Query param of the page size
+        :param offset_param: Query param of the offset ("offset" style)
+        :param page_param: Query param of the page number ("page" style)
+        :param cursor_param: Query param of the next token ("cursor" style)
+        :param total_keys: Dotted paths of the total items count in the page
+        :param next_keys: Dotted paths of the next link/token in the page
+        :param max_items: Max number of items to yield
+        :param stop: Callable stopping the iteration after the item it returns True for
+        :param cursor: Cursor of a previous Paginator to resume from
+        :param concurrency: Max number of pages fetched in parallel once the total
+            count is known (offset and page styles only)
+        :param ordered: Yield the parallel fetched pages in order (Default: True),
+            False - as soon as they arrive (the cursor is then the lowest pending page)
+        """
+        if style not in (OFFSET, PAGE, CURSOR):
+            raise ValueError(f"Unsupported pagination style: {style}")
+        self.fetch = fetch
+        self.items_key = items_key
+        self.style = style
+        self.page_size = page_size
+        self.limit_param = limit_param
+        self.offset_param = offset_param
+        self.page_param = page_param
+        self.cursor_param = cursor_param
+        self.total_keys = total_keys
+        self.next_keys = next_keys
+        self.max_items = max_items
+        self.stop = stop
+        self.concurrency = concurrency
+        self.ordered = ordered
+        self.start = start
+        self.position = start if style != CURSOR else None
+        self.total = None
+        self.pages = 0
+        self.items = 0
+        self.done = False
+        self._stride = None
+        self._concurrent = concurrency > 1 and style != CURSOR
+        if cursor is not None:
+            self.position = cursor["position"]
+            self.total = cursor.get("total")
+            self.done = cursor.get("done", False)
+        self._resume_position = self.position
+
+    @property
+    def cursor(self):
+        """
+        :return: Resumable position of the page being consumed
+        """
+        return {
+            "style": self.style,
+            "position": self._resume_position,
+            "total": self.total,
+            "done": self.done and self._resume_position == self.position,
+        }
+
+    def get_paging_params(self, position=None):
+        """
+        :param position: Offset, page number or cursor (Default: the next page)
+        :return: Query params of the page
+        """
+        if position is None:
+            position = self.position
+        params = {}
+        if self.page_size is not None:
+            params[self.limit_param] = self.page_size
+        if self.style == OFFSET:
+            params[self.offset_param] = position
+        elif self.style == PAGE:
+            params[self.page_param] = position
+        elif position is not None:
+            params[self.cursor_param] = position
+        return params
+
+    def get_items(self, page):
+        """
+        :param page: Decoded page
+        :return: List of the page items
+        """
+        if self.items_key is not None:
+            return get_value(page, self.items_key) or []
+        if isinstance(page, list):
+            return page
+        for value in page.values():
+            if isinstance(value, list):
+                return value
+        return []
+
+    def _get_first(self, page, keys):
+        if not isinstance(page, dict):
+            return None
+        for key in keys:
+            value = get_value(page, key)
+            if value is not None:
+                return value
+        return None
+
+    def _advance(self, page, items):
+        """
+        Move to the next page and decide whether it exists
+        """
+        self.pages += 1
+        total = self._get_first(page, self.total_keys)
+        if isinstance(total, int):
+            self.total = total
+        if self.style == CURSOR:
+            self.position = self._get_first(page, self.next_keys)
+            return bool(self.position) and bool(items)
+        if items and self._stride is None:
+            # Actual page size, the server may cap the requested one
+            self._stride = len(items)
+        if self.style == OFFSET:
+            self.position += len(items)
+            consumed = self.position
+        else:
+            self.position += 1
+            consumed = (self.position - self.start) * (self._stride or len(items))
+        if not items:
+            return False
+        if self.total is not None:
+            return consumed < self.total
+        return self.page_size is None or len(items) >= self.page_size
+
+    def _fetch_page(self, position=None):
+        page = self.fetch(self.get_paging_params(position))
+        if hasattr(page, "json"):
+            page = page.json()
+        return page
+
+    def _get_remaining_positions(self):
+        """
+        :return: Offsets or page numbers of the pages left up to the total count
+        """
+        if self.style == OFFSET:
+            return range(self.position, self.total, self._stride)
+        last_page = self.start + math.ceil(self.total / self._stride)
+        return range(self.position, last_page)
+
+    def _iter_pages_concurrently(self):
+        """
+        Fetch the remaining pages in parallel with a bounded window
+        """
+        remaining = self._get_remaining_positions()
+        last_position = remaining[-1] if remaining else None
+        positions = iter(remaining)
+        pending = deque()
+        executor = ThreadPoolExecutor(self.concurrency)
+
+        def submit():
+            position = next(positions, None)
+            if position is not None:
+                # Every page runs in a copy of the caller context (request_context)
+                future = executor.submit(
+                    contextvars.copy_context().run, self._fetch_page, position
+                )
+                pending.append((future, position))
+
+        try:
+            for _ in range(self.concurrency):
+                submit()
+            while pending:
+                if self.ordered:
+                    future, position = pending.popleft()
+                else:
+                    done, _ = wait(
+                        [future for future, _ in pending], return_when=FIRST_COMPLETED
+                    )
+                    future, position = next(item for item in pending if item[0] in done)
+                    pending.remove((future, position))
+                page = future.result()
+                items = self.get_items(page)
+                end = position + (len(items) if self.style == OFFSET else 1)
+                short = position != last_position and len(items) < self._stride
+                if short and self.ordered:
+                    # The next pages do not start where this one ends, the rest
+                    # of the listing is walked page by page
+                    LOG.warning(
+                        f"Page at {position} returned {len(items)} of {self._stride} "
+                        "items, fetching the remaining pages serially"
+                    )
+                    self._concurrent = False
+                    self.pages += 1
+                    self.position = end
+                    self.done = not items
+                    self._resume_position = position
+                    yield page
+                    self._resume_position = self.position
+                    return
+                if short:
+                    LOG.warning(
+                        f"Page at {position} returned {len(items)} of {self._stride} "
+                        "items, the listing may be incomplete (ordered=False)"
+                    )
+                submit()
+                self.pages += 1
+                self.position = max(self.position, end)
+                self.done = not pending
+                LOG.debug(
+                    f"Fetched page {self.pages} with {len(items)} items, "
+                    f"total: {self.total}, pending: {len(pending)}"
+                )
+                self._resume_position = min(
+                    [position] + [pending_position for _, pending_position in pending]
+                )
+                yield page
+                self._resume_position = (
+                    min(pending_position for _, pending_position in pending)
+                    if pending
+                    else self.position
+                )
+            self.done = True
+        finally:
+            for future, _ in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def iter_pages(self):
+        """
+        :return: Generator of the decoded pages
+        """
+        while not self.done:
+            if self._concurrent and self.total is not None and self._stride:
+                yield from self._iter_pages_concurrently()
+                continue
+            page_position = self.position
+            page = self._fetch_page()
+            items = self.get_items(page)
+            self.done = not self._advance(page, items)
+            LOG.debug(
+                f"Fetched page {self.pages} with {len(items)} items, total: {self.total}"
+            )
+            self._resume_position = page_position
+            yield page
+            self._resume_position = self.position
+
+    def iter_items(self):
+        """
+        :return: Generator of the items of all pages
+        """
+        for page in self.iter_pages():
+            for item in self.get_items(page):
+                if self.max_items is not None and self.items >= self.max_items:
+                    self.done = True
+                    return
+                self.items += 1
+                yield item
+                if self.stop is not None and self.stop(item):
+                    self.done = True
+                    return
+            self._resume_position = self.position
+            if self.max_items is not None and self.items >= self.max_items:
+                self.done = True
+                return
+
+    def __iter__(self):
+        return self.iter_items()
@@ -0,0 +1,224 @@
+"""
+Client-side adaptive Token Bucket Rate Limiter of the core REST Session
+"""
+import logging
+import threading
+import time
+import urllib.parse as urlparse
+
+from .deadline import get_deadline
+from .retry import RetryPolicy
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_THROTTLE_STATUSES = (429, 503)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled with the current rate up to the burst size.
+
+    The rate adapts to the server throttling: a throttled response (429/503)
+    multiplies the rate by decrease_factor and pauses the bucket for the
+    Retry-After time, every successful response restores recovery_step * max_rate
+    back up to max_rate (AIMD).
+    """
+
+    def __init__(self, rate, burst, min_rate, decrease_factor, recovery_step):
+        """
+        :param rate: Sustained rate (requests per second)
+        :param burst: Max number of requests sent without waiting
+        :param min_rate: Lowest rate the bucket adapts to
+        :param decrease_factor: Rate multiplier applied on throttled responses
+        :param recovery_step: Fraction of the max rate restored per successful response
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.decrease_factor = decrease_factor
+        self.recovery_step = recovery_step
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        """
+        Take a token, borrowing from the future when the bucket is empty
+        :return: Time in seconds the caller must wait before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            wait = max(wait, self.paused_until - now)
+            self.requests += 1
+            self.wait_seconds += wait
+            return wait
+
+    def throttle(self, retry_after=None):
+        """
+        Slow down after a throttled response
+        :param retry_after: Retry-After delay in seconds
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+        LOG.warning(
+            f"Request throttled, rate decreased to {self.rate:.2f}/s"
+            + (f", paused for {retry_after:g} seconds" if retry_after else "")
+        )
+
+    def recover(self):
+        """
+        Speed up after a successful response
+        """
+        if self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery_step)
+
+    def as_dict(self):
+        return {
+            "rate": round(self.rate, 3),
+            "max_rate": self.max_rate,
+            "burst": self.burst,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "wait_seconds": round(self.wait_seconds, 3),
+        }
+
+
+class RateLimiter:
+    """
+    Thread-safe rate limiter with a token bucket per (host, client identity), where
+    the identity is OAuth client_id of AppSession or user of UISession.
+    A single RateLimiter object may be shared by several Session objects, e.g. all
+    AppSession objects of a bulk job created with the same client_id.
+    """
+
+    def __init__(
+        self,
+        rate=10,
+        burst=None,
+        host_rates=None,
+        min_rate=0.5,
+        decrease_factor=0.5,
+        recovery_step=0.05,
+        throttle_statuses=DEFAULT_THROTTLE_STATUSES,
+    ):
+        """
+        :param rate: Sustained rate (requests per second) per host and client
+        :param burst: Max number of requests sent without waiting (Default: rate)
+        :param host_rates: Dictionary of host and (rate, burst) overriding the defaults
+        :param min_rate: Lowest rate the buckets adapt to on throttled responses
+        :param decrease_factor: Rate multiplier applied on throttled responses
+        :param recovery_step: Fraction of the rate restored per successful response
+        :param throttle_statuses: Response status codes slowing the bucket down
+        """
+        self.rate = rate
+        self.burst = burst or rate
+        self.host_rates = dict(host_rates or {})
+        self.min_rate = min_rate
+        self.decrease_factor = decrease_factor
+        self.recovery_step = recovery_step
+        self.throttle_statuses = frozenset(throttle_statuses)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def get_bucket(self, url, identity=None):
+        """
+        :param url: Request URL
+        :param identity: Client identity (client_id or user)
+        :return: TokenBucket object of the host and identity
+        """
+        key = (urlparse.urlparse(url).netloc, identity)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    rate, burst = self.host_rates.get(key[0], (self.rate, self.burst))
+                    bucket = self._buckets[key] = TokenBucket(
+                        rate,
+                        burst,
+                        min(self.min_rate, rate),
+                        self.decrease_factor,
+                        self.recovery_step,
+                    )
+        return bucket
+
+    def reserve(self, url, identity=None):
+        """
+        :param url: Request URL
+        :param identity: Client identity (client_id or user)
+        :return: Tuple (TokenBucket object, wait time in seconds before sending)
+        """
+        bucket = self.get_bucket(url, identity)
+        return bucket, bucket.reserve()
+
+    @staticmethod
+    def get_wait(wait, step=None):
+        """
+        :param wait: Wait time in seconds returned by reserve()
+        :param step: Step of the request reported when the deadline is exceeded
+        :return: The wait time if the request is sent before the flow deadline
+        :raises: DeadlineExceededException if it would be sent after the deadline
+        """
+        deadline = get_deadline()
+        if deadline is None or wait <= 0:
+            return wait
+        # The token is not available earlier, so the wait is never cut
+        return deadline.get_wait(
+            wait, f"rate limit of {step}" if step else None, cut=False
+        )
+
+    def acquire(self, url, identity=None, step=None):
+        """
+        Wait for a token of the host and identity bucket
+        :param url: Request URL
+        :param identity: Client identity (client_id or user)
+        :param step: Step of the request reported when the deadline is exceeded
+        :return: TokenBucket object
+        """
+        bucket, wait = self.reserve(url, identity)
+        wait = self.get_wait(wait, step)
+        if wait > 0:
+            LOG.debug(f"Rate limited, waiting for {wait:.3f} seconds")
+            time.sleep(wait)
+        return bucket
+
+    def record(self, bucket, response):
+        """
+        Adapt the bucket rate to the response
+        :param bucket: TokenBucket object returned by acquire()/reserve()
+        :param response: Response object
+        """
+        if response.status_code in self.throttle_statuses:
+            bucket.throttle(RetryPolicy.parse_retry_after(response))
+        elif response.status_code < 400:
+            bucket.recover()
+
+    def as_dict(self):
+        """
+        :return: Dictionary of "<host> <identity>" and bucket state
+        """
+        with self._lock:
+            return {
+                f"{host} {identity}": bucket.as_dict()
+                for (host, identity), bucket in self._buckets.items()
+            }
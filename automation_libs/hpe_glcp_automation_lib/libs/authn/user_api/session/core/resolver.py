@@ -0,0 +1,163 @@
+"""
+In-process DNS Overrides (pinned hostnames) for the core REST Session transport
+"""
+import ipaddress
+import logging
+import socket
+import threading
+import time
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .transport import PooledHTTPAdapter
+
+LOG = logging.getLogger(__name__)
+
+
+class DNSResolver:
+    """
+    In-process replacement of the /etc/hosts entries: a pinned hostname is
+    connected to the address of its target (IP address or another hostname, e.g.
+    device.arubanetworks.com -> device URL of the cluster under test).
+
+    The target addresses are cached for ttl seconds, so the provisioning requests do
+    not resolve them each. Only the TCP connection goes to the pinned address: the
+    URL, Host header, TLS SNI and certificate verification keep the pinned hostname.
+    Used by the connections of PinnedHTTPAdapter.
+    """
+
+    def __init__(self, ttl=300):
+        """
+        :param ttl: Time in seconds the resolved target addresses are cached for
+        """
+        self.ttl = ttl
+        self._pins = {}
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(hostname):
+        return hostname.rstrip(".").lower()
+
+    def pin(self, hostname, target):
+        """
+        Pin the hostname to the target and resolve the target ahead of the requests
+        :param hostname: Hostname of the request URLs, e.g. device.arubanetworks.com
+        :param target: IP address or hostname the connections are made to
+        :return: Resolved IP address of the target
+        """
+        with self._lock:
+            self._pins[self._normalize(hostname)] = target
+        address = self.lookup(target)
+        LOG.info(f"Pinned {hostname} to {target} ({address})")
+        return address
+
+    def unpin(self, hostname=None):
+        """
+        :param hostname: Hostname to unpin (Default: all hostnames)
+        """
+        with self._lock:
+            if hostname is None:
+                self._pins.clear()
+            else:
+                self._pins.pop(self._normalize(hostname), None)
+
+    def lookup(self, target):
+        """
+        :param target: IP address or hostname
+        :return: IP address of the target (cached for ttl seconds)
+        :raises: socket.gaierror if the target is not resolvable and not cached
+        """
+        try:
+            return str(ipaddress.ip_address(target))
+        except ValueError:
+            pass
+        now = time.monotonic()
+        cached = self._cache.get(target)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        try:
+            address = socket.gethostbyname(target)
+        except OSError:
+            if cached is None:
+                raise
+            LOG.warning(f"Unable to resolve {target}, using expired {cached[0]}")
+            return cached[0]
+        self._cache[target] = (address, now + self.ttl)
+        return address
+
+    def resolve(self, hostname):
+        """
+        :param hostname: Hostname of the connection
+        :return: IP address of the pinned target or the hostname itself if not pinned
+        """
+        target = self._pins.get(self._normalize(hostname))
+        if target is None:
+            return hostname
+        return self.lookup(target)
+
+    def as_dict(self):
+        """
+        :return: Dictionary of the pinned hostnames and their targets
+        """
+        return dict(self._pins)
+
+
+class PinnedConnectionMixin:
+    """
+    Connects the urllib3 connection to the address of the pinned hostname
+    """
+
+    resolver = None
+
+    def _new_conn(self):
+        # host (SNI, certificate verification) is derived from _dns_host,
+        # so it is replaced for the socket creation only
+        hostname = self._dns_host
+        self._dns_host = self.resolver.resolve(hostname)
+        try:
+            return super()._new_conn()
+        finally:
+            self._dns_host = hostname
+
+
+class PinnedHTTPAdapter(PooledHTTPAdapter):
+    """
+    PooledHTTPAdapter connecting the hostnames pinned in DNSResolver to their
+    target addresses (no /etc/hosts changes). Connections are pooled per hostname,
+    so the follow-up requests (e.g. challenge/response of the device provisioning)
+    reuse the connection made to the pinned address.
+    """
+
+    __attrs__ = PooledHTTPAdapter.__attrs__ + ["resolver"]
+
+    def __init__(self, resolver, **kwargs):
+        """
+        :param resolver: DNSResolver object with the pinned hostnames
+        :param kwargs: Additional keyword arguments for PooledHTTPAdapter
+        """
+        self.resolver = resolver
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        attrs = {"resolver": self.resolver}
+        http_connection = type(
+            "PinnedHTTPConnection", (PinnedConnectionMixin, HTTPConnection), attrs
+        )
+        https_connection = type(
+            "PinnedHTTPSConnection", (PinnedConnectionMixin, HTTPSConnection), attrs
+        )
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type(
+                "PinnedHTTPConnectionPool",
+                (HTTPConnectionPool,),
+                {"ConnectionCls": http_connection},
+            ),
+            "https": type(
+                "PinnedHTTPSConnectionPool",
+                (HTTPSConnectionPool,),
+                {"ConnectionCls": https_connection},
+            ),
+        }
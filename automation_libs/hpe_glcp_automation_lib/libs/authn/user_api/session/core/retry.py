@@ -0,0 +1,192 @@
+"""
+Retry Policies for the core REST Session
+"""
+import email.utils
+import logging
+import random
+import threading
+import time
+from collections import Counter
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_RETRIABLE_ERRORS = [500, 501, 502, 503]
+DEFAULT_RETRY_STATUSES = (429, 500, 501, 502, 503, 504)
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"])
+
+
+class RetryMetrics:
+    """
+    Thread-safe counters of the retries taken under a RetryPolicy
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.retries = 0
+            self.exhausted = 0
+            self.deadline_exceeded = 0
+            self.sleep_seconds = 0.0
+            self.retries_by_status = Counter()
+
+    def record_retry(self, status_code, wait):
+        with self._lock:
+            self.retries += 1
+            self.sleep_seconds += wait
+            self.retries_by_status[status_code] += 1
+
+    def record_exhausted(self, deadline_exceeded=False):
+        with self._lock:
+            self.exhausted += 1
+            if deadline_exceeded:
+                self.deadline_exceeded += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "exhausted": self.exhausted,
+                "deadline_exceeded": self.deadline_exceeded,
+                "sleep_seconds": round(self.sleep_seconds, 3),
+                "retries_by_status": dict(self.retries_by_status),
+            }
+
+
+class RetryPolicy:
+    """
+    Retry Policy used by exception_handler for the retriable HTTP errors.
+
+    Waits between retries grow exponentially (backoff * multiplier ** attempt,
+    capped by max_backoff) with optional full jitter, so retries of parallel
+    workers are spread over time instead of hitting the service together.
+    Retry-After response header overrides the computed wait when present.
+    """
+
+    def __init__(
+        self,
+        max_retries=None,
+        backoff=None,
+        multiplier=2,
+        max_backoff=60,
+        jitter=True,
+        retry_after=True,
+        max_retry_after=120,
+        statuses=DEFAULT_RETRY_STATUSES,
+        non_idempotent_statuses=None,
+        deadline=None,
+    ):
+        """
+        :param max_retries: Max number of retries (Default: Session max_retries)
+        :param backoff: Wait before the first retry in seconds
+            (Default: Session retry_timeout)
+        :param multiplier: Backoff multiplier applied for every next retry
+        :param max_backoff: Upper bound of a single wait in seconds (None - no limit)
+        :param jitter: Use full jitter, i.e. random wait between 0 and computed backoff
+        :param retry_after: Honor Retry-After response header
+        :param max_retry_after: Upper bound of the wait taken from Retry-After header
+        :param statuses: Retriable status codes (None - Session retriable_errors)
+        :param non_idempotent_statuses: Retriable status codes for non-idempotent
+            methods (POST, PATCH), e.g. (429, 503) to retry only the requests
+            rejected before processing (None - same as statuses)
+        :param deadline: Overall time budget of a call including retries in seconds
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.multiplier = multiplier
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_after = retry_after
+        self.max_retry_after = max_retry_after
+        self.statuses = statuses
+        self.non_idempotent_statuses = non_idempotent_statuses
+        self.deadline = deadline
+        self.metrics = RetryMetrics()
+
+    def get_max_retries(self, session):
+        if self.max_retries is None:
+            return session.max_retries
+        return self.max_retries
+
+    def get_retriable_statuses(self, session, method):
+        """
+        :param session: Session object
+        :param method: HTTP method of the request
+        :return: Collection of retriable status codes
+        """
+        if (
+            self.non_idempotent_statuses is not None
+            and method
+            and method.upper() not in IDEMPOTENT_METHODS
+        ):
+            return self.non_idempotent_statuses
+        if self.statuses is None:
+            return getattr(session, "retriable_errors", DEFAULT_RETRIABLE_ERRORS)
+        return self.statuses
+
+    def is_retriable(self, session, response):
+        """
+        :param session: Session object
+        :param response: Response object
+        :return: True/False
+        """
+        method = getattr(response.request, "method", None)
+        return response.status_code in self.get_retriable_statuses(session, method)
+
+    @staticmethod
+    def parse_retry_after(response):
+        """
+        Parse Retry-After header (delay seconds or HTTP-date)
+        :param response: Response object
+        :return: Delay in seconds or None
+        """
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
+    def get_wait_time(self, session, attempt, response=None):
+        """
+        :param session: Session object
+        :param attempt: Zero-based number of the failed attempt
+        :param response: Response object of the failed attempt
+        :return: Wait time before the next attempt in seconds
+        """
+        if self.retry_after and response is not None:
+            retry_after = self.parse_retry_after(response)
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+        backoff = session.retry_timeout if self.backoff is None else self.backoff
+        wait = backoff * self.multiplier**attempt
+        if self.max_backoff is not None:
+            wait = min(self.max_backoff, wait)
+        if self.jitter:
+            wait = random.uniform(0, wait)
+        return wait
+
+    def within_deadline(self, started, wait):
+        """
+        :param started: time.monotonic() value of the first attempt
+        :param wait: Wait time before the next attempt
+        :return: True if the next attempt can start before the deadline
+        """
+        if self.deadline is None:
+            return True
+        return time.monotonic() - started + wait < self.deadline
+
+
+# Fixed retry_timeout wait for Session retriable_errors, i.e. the Session behaviour
+# when no retry_policy is provided
+DEFAULT_RETRY_POLICY = RetryPolicy(
+    multiplier=1, max_backoff=None, jitter=False, retry_after=False, statuses=None
+)
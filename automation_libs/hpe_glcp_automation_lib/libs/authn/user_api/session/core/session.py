@@ -1,16 +1,16 @@
 """
 Core REST Session Library
 """
-try:
-    import simplejson as json
-except ImportError:
-    import json
-
+import contextlib
+import csv
+import io
 import logging
 import pprint
+import random
 import time
 import urllib.parse as urlparse
-from functools import wraps
+from contextlib import closing
+from functools import partial, wraps
 
 import requests
 from requests.exceptions import HTTPError, Timeout
@@ -18,10 +18,19 @@ from requests.packages.urllib3.exceptions import InsecureRequestWarning
 
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
+from .bulk import execute_many, get_request_spec
+from .cassette import Cassette
+from .codec import DEFAULT_CODEC
+from .context import TRANSACTION_ID_HEADER, get_request_headers, request_context
+from .deadline import get_deadline, get_step
 from .exceptions import SessionException
+from .metrics import SESSION_METRICS
+from .pagination import CURSOR, PAGINATOR_OPTIONS, Paginator
+from .retry import DEFAULT_RETRY_POLICY
+from .streaming import ChunkStream, iter_json_items
+from .transport import TransportConfig
 
 LOG = logging.getLogger(__name__)
-DEFAULT_RETRIABLE_ERRORS = [500, 501, 502, 503]
 
 
 def exception_handler(func):
@@ -31,18 +40,17 @@ def exception_handler(func):
 
     @wraps(func)
     def decorator(obj, *args, **kwargs):
-        allowed_tries_count = obj.max_retries + 1
-        for trying in range(allowed_tries_count):
-            next_try_available = trying < obj.max_retries
+        retry_policy = getattr(obj, "retry_policy", None) or DEFAULT_RETRY_POLICY
+        max_retries = retry_policy.get_max_retries(obj)
+        started = time.monotonic()
+        for trying in range(max_retries + 1):
+            next_try_available = trying < max_retries
             try:
                 if obj.debug:
                     obj._log_request(func, *args, **kwargs)
                 return func(obj, *args, **kwargs)
             except HTTPError as e:
-                retriable_errors = getattr(
-                    obj, "retriable_errors", DEFAULT_RETRIABLE_ERRORS
-                )
-                if e.response.status_code in retriable_errors:
+                if retry_policy.is_retriable(obj, e.response):
                     obj._log_error_response(e.response)
                     LOG.warning(f"Response code : {e.response.status_code}")
                     if hasattr(
@@ -57,12 +65,17 @@ def exception_handler(func):
                             e.response,
                         )
                     else:
-                        if next_try_available:
-                            LOG.error(
-                                f"Waiting for {obj.retry_timeout} seconds before retrying..."
+                        wait = retry_policy.get_wait_time(obj, trying, e.response)
+                        in_deadline = retry_policy.within_deadline(started, wait)
+                        if next_try_available and in_deadline:
+                            wait = obj._get_retry_wait(e.response, wait)
+                            retry_policy.metrics.record_retry(
+                                e.response.status_code, wait
                             )
-                            time.sleep(obj.retry_timeout)
+                            LOG.error(f"Waiting for {wait:g} seconds before retrying...")
+                            time.sleep(wait)
                             continue
+                        retry_policy.metrics.record_exhausted(not in_deadline)
                         LOG.error("Retries exhausted")
                         raise SessionException(
                             f"Retries exhausted for API "
@@ -77,7 +90,7 @@ def exception_handler(func):
                     if (
                         next_try_available
                         and hasattr(obj, "refresh_token")
-                        and obj.refresh_token()
+                        and obj._refresh_token_directly()
                     ):
                         LOG.debug("Retrying the API after token refresh")
                         continue
@@ -101,6 +114,8 @@ def exception_handler(func):
                         f"Resp: '{e.response.text}' ",
                         e.response,
                     )
+            except SessionException:
+                raise
             except (ConnectionError, Timeout):
                 raise SessionException("Connection Error or Timeout")
             except Exception as ex:
@@ -114,6 +129,10 @@ class Session:
     REST Session Class
     """
 
+    log_body_limit = 4096
+    log_sample_rate = 1.0
+    transaction_id_header = TRANSACTION_ID_HEADER
+
     def __init__(self, max_retries=3, retry_timeout=5, debug=False, **kwargs):
         """
         :param max_retries: Max number of retries for retriable errors
@@ -121,11 +140,51 @@ class Session:
         :param debug: Enable/Disable Debug logging of HTTP Requests/Responses
         :param kwargs: Additional Keyword arguments
             :override: Override the session object (Default: requests.Session)
+            :transport: TransportConfig with connection pool, keep-alive and
+                timeout settings (Default: TransportConfig())
+            :retry_policy: RetryPolicy for the retriable errors (Default: fixed
+                retry_timeout wait for retriable_errors)
+            :log_body_limit: Max logged length of request/response bodies
+                (Default: 4096, None - no limit)
+            :log_sample_rate: Fraction of the calls (0.0 - 1.0) whose bodies are
+                logged on DEBUG level (Default: 1.0)
+            :metrics: SessionMetrics registry for per-endpoint call metrics
+                (Default: SESSION_METRICS, None - disable recording)
+            :cassette: Cassette to record the HTTP interactions into or replay them
+                from (Default: Cassette.from_env())
+            :cache: ResponseCache for the GET requests (Default: None - no caching)
+            :single_flight: SingleFlight object coalescing concurrent identical GET
+                requests (Default: None - no coalescing)
+            :codec: JsonCodec encoding "json" request bodies and decoding responses
+                (Default: DEFAULT_CODEC - "json" unless SESSION_JSON_CODEC is set)
+            :transaction_id_factory: Callable returning a new transaction id sent in
+                transaction_id_header of every request (Default: None - not sent)
+            :circuit_breaker: CircuitBreaker failing fast the requests to unhealthy
+                hosts (Default: None - disabled)
+            :rate_limiter: RateLimiter pacing the requests per host and client
+                (Default: None - disabled)
+            :token_refresher: TokenRefresher renewing the token of the authenticated
+                sessions ahead of its expiry (Default: None - refresh on 401 only)
         """
+        self.token_refresher = kwargs.get("token_refresher")
+        self.circuit_breaker = kwargs.get("circuit_breaker")
+        self.rate_limiter = kwargs.get("rate_limiter")
+        self.transaction_id_factory = kwargs.get("transaction_id_factory")
+        self.codec = kwargs.get("codec") or DEFAULT_CODEC
+        self.cache = kwargs.get("cache")
+        self.single_flight = kwargs.get("single_flight")
+        self.metrics = kwargs.get("metrics", SESSION_METRICS)
+        self.log_body_limit = kwargs.get("log_body_limit", self.log_body_limit)
+        self.log_sample_rate = kwargs.get("log_sample_rate", self.log_sample_rate)
+        self.retry_policy = kwargs.get("retry_policy")
+        self.transport = kwargs.get("transport") or TransportConfig()
+        self.cassette = kwargs.get("cassette") or Cassette.from_env()
         if kwargs.get("override"):
             self.session = kwargs["override"]
         else:
-            self.session = requests.Session()
+            self.session = self.transport.create_session()
+            if self.cassette:
+                self.cassette.mount(self.session, self.transport.get_adapter())
         self.max_retries = max_retries
         self.retry_timeout = retry_timeout
         self.debug = debug
@@ -150,40 +209,261 @@ class Session:
         if hasattr(self, "domain_name") and hasattr(self, "base_url"):
             return self.base_url.split("https://")[-1]
 
+    def _is_body_logged(self):
+        """
+        Check whether request/response bodies are logged for the current call
+        :return: True if DEBUG is enabled and the call is picked by log_sample_rate
+        """
+        if not LOG.isEnabledFor(logging.DEBUG):
+            return False
+        return self.log_sample_rate >= 1 or random.random() < self.log_sample_rate
+
+    def _truncate(self, text):
+        """
+        Truncate the logged text to log_body_limit characters
+        :param text: Text (str or bytes) to be logged
+        :return: Truncated text
+        """
+        if self.log_body_limit is None or len(text) <= self.log_body_limit:
+            return text
+        suffix = f"... <{len(text) - self.log_body_limit} more truncated>"
+        if isinstance(text, bytes):
+            suffix = suffix.encode()
+        return text[: self.log_body_limit] + suffix
+
     def _log_request(self, func, *args, **kwargs):
-        if func.__name__ in ["put", "post", "patch"]:
+        if func.__name__ in ["put", "post", "patch"] and self._is_body_logged():
             data = kwargs.get("data") or kwargs.get("json")
             try:
-                LOG.debug("Request " + "\n\n" + pprint.pformat(json.loads(data)) + "\n")
+                body = pprint.pformat(self.codec.loads(data))
             except Exception:
-                LOG.debug("Request " + "\n\n" + pprint.pformat(data) + "\n")
+                body = pprint.pformat(data)
+            LOG.debug("Request \n\n%s\n", self._truncate(body))
 
     def _log_error_response(self, response):
-        LOG.debug(
-            "Response Headers " + "\n\n" + pprint.pformat(dict(response.headers)) + "\n"
-        )
+        if not LOG.isEnabledFor(logging.DEBUG):
+            return
+        LOG.debug("Response Headers \n\n%s\n", pprint.pformat(dict(response.headers)))
         try:
-            LOG.debug("Response" + "\n\n" + pprint.pformat(response.json()) + "\n")
-        except json.JSONDecodeError:
-            LOG.debug("Response" + "\n\n" + response.text + "\n")
+            body = pprint.pformat(self.codec.loads_response(response))
+        except self.codec.decode_error:
+            body = response.text
+        LOG.debug("Response\n\n%s\n", self._truncate(body))
         self._log_elapsed_time(response)
 
     def _log_elapsed_time(self, response):
-        LOG.debug(f"Elapsed time : {response.elapsed.total_seconds()} seconds")
+        LOG.debug("Elapsed time : %s seconds", response.elapsed.total_seconds())
 
     def _log_request_headers(self, request):
-        LOG.debug(
-            "Request Headers " + "\n\n" + pprint.pformat(dict(request.headers)) + "\n"
-        )
+        if LOG.isEnabledFor(logging.DEBUG):
+            LOG.debug("Request Headers \n\n%s\n", pprint.pformat(dict(request.headers)))
 
     def _handle_response(self, response):
         self._log_elapsed_time(response)
-        LOG.debug(f"Response content : {response.content}")
+        if self._is_body_logged():
+            LOG.debug("Response content : %s", self._truncate(response.content))
         try:
-            return response.json()
-        except json.JSONDecodeError:
+            return self.codec.loads_response(response)
+        except self.codec.decode_error:
             return response
 
+    def request_context(self, headers=None, token=None, transaction_id=None):
+        """
+        Context manager applying headers to the requests sent from the current
+        thread only, so that a single client can serve many concurrent threads
+        instead of mutating the shared session headers, e.g.
+            with client.request_context(headers={"CCS-Username": username}):
+                client.get(url)
+        :param headers: Additional request headers
+        :param token: Bearer token overriding the session Authorization header
+        :param transaction_id: Transaction id overriding the generated one
+        :return: RequestContext object
+        """
+        return request_context(self, headers, token, transaction_id)
+
+    def _request(self, method, url, **kwargs):
+        """
+        Send the request via the single-flight coalescing and response cache (if any)
+        and the session object
+        :param method: HTTP method
+        :param url: Request URL
+        :param kwargs: Keyword arguments for the session object method
+        :return: Response object
+        """
+        if self.token_refresher is not None:
+            self.token_refresher.ensure_fresh(self)
+        headers = get_request_headers(self, kwargs.get("headers"))
+        if headers is not None:
+            kwargs["headers"] = headers
+        if (
+            method == "GET"
+            and self.single_flight is not None
+            and not kwargs.get("stream")
+        ):
+            key = self.single_flight.get_key(url, self._get_identity(kwargs), **kwargs)
+            # Followers wait for the leader at most the whole request timeout
+            timeout = kwargs.get("timeout", self.transport.timeout)
+            if isinstance(timeout, tuple):
+                timeout = None if None in timeout else sum(timeout)
+            return self.single_flight.do(
+                key,
+                partial(self._request_with_cache, method, url, **kwargs),
+                timeout=timeout,
+                step=self._get_deadline_step(method, url),
+            )
+        return self._request_with_cache(method, url, **kwargs)
+
+    def _get_identity(self, kwargs):
+        """
+        :param kwargs: Keyword arguments of the request
+        :return: Caller identity of the response cache and single-flight keys:
+            Authorization header and cookies (cookie authenticated sessions)
+        """
+        headers = kwargs.get("headers") or {}
+        authorization = headers.get("Authorization") or getattr(
+            self.session, "headers", {}
+        ).get("Authorization")
+        cookies = [
+            (cookie.domain, cookie.path, cookie.name, cookie.value)
+            for cookie in getattr(self.session, "cookies", None) or ()
+        ]
+        request_cookies = kwargs.get("cookies") or {}
+        if hasattr(request_cookies, "items"):
+            cookies.extend(
+                ("", "", name, value) for name, value in request_cookies.items()
+            )
+        if not cookies:
+            return authorization
+        return f"{authorization or ''}|{sorted(cookies)!r}"
+
+    def _request_with_cache(self, method, url, **kwargs):
+        if self.cache is None:
+            return self._send(method, url, **kwargs)
+        if method == "GET":
+            return self.cache.fetch(
+                url, partial(self._send, method), self._get_identity(kwargs), **kwargs
+            )
+        r = self._send(method, url, **kwargs)
+        if r.ok:
+            self.cache.invalidate_url(url)
+        return r
+
+    def _send(self, method, url, **kwargs):
+        """
+        Send the request via the underlying session object and record its metrics
+        :param method: HTTP method
+        :param url: Request URL
+        :param kwargs: Keyword arguments for the session object method
+        :return: Response object
+        """
+        deadline = get_deadline()
+        if deadline is not None:
+            # Before taking a circuit probe slot or a rate limiter token
+            deadline.check(self._get_deadline_step(method, url))
+        kwargs = self.codec.encode_request(kwargs, getattr(self.session, "headers", None))
+        circuit = self.circuit_breaker.before_call(url) if self.circuit_breaker else None
+        recorded = False
+        try:
+            bucket = None
+            if self.rate_limiter is not None:
+                bucket = self.rate_limiter.acquire(
+                    url, self._get_client_identity(), self._get_deadline_step(method, url)
+                )
+            if deadline is not None:
+                kwargs["timeout"] = deadline.get_timeout(
+                    kwargs.get("timeout", self.transport.timeout),
+                    self._get_deadline_step(method, url),
+                )
+            start = time.monotonic()
+            try:
+                r = getattr(self.session, method.lower())(url, **kwargs)
+            except Exception as e:
+                if self.metrics is not None:
+                    self.metrics.record(method, url, "error", time.monotonic() - start)
+                if circuit is not None:
+                    recorded = True
+                    self.circuit_breaker.record(circuit, error=e)
+                if isinstance(e, Timeout) and deadline is not None and deadline.expired():
+                    raise deadline.exceeded(self._get_deadline_step(method, url)) from e
+                raise
+            if circuit is not None:
+                recorded = True
+                self.circuit_breaker.record(circuit, r)
+            if self.metrics is not None:
+                self._record_metrics(method, url, r, time.monotonic() - start, kwargs)
+            if bucket is not None:
+                self.rate_limiter.record(bucket, r)
+            return r
+        finally:
+            # The probe slot of a half-open circuit is freed even if the request
+            # ended without an outcome (deadline, rate limiter, KeyboardInterrupt)
+            if circuit is not None and not recorded:
+                self.circuit_breaker.release(circuit)
+
+    def _get_deadline_step(self, method, url):
+        """
+        :return: Step name of the request reported when the deadline is exceeded
+        """
+        step = get_step()
+        return f"{step}: {method} {url}" if step else f"{method} {url}"
+
+    def _get_retry_wait(self, response, wait):
+        """
+        :param response: Response object of the failed attempt
+        :param wait: Wait time before the next attempt
+        :return: The wait time cut so the next attempt starts before the flow deadline
+        :raises: DeadlineExceededException if no attempt fits in the remaining budget
+        """
+        deadline = get_deadline()
+        if deadline is None:
+            return wait
+        step = self._get_deadline_step(response.request.method, response.request.url)
+        return deadline.get_wait(wait, f"retry of {step}")
+
+    def _get_token_key(self):
+        return id(self)
+
+    def _refresh_token_directly(self):
+        # The token requests of the refresh must not trigger the proactive one
+        with self._token_refresh_suspended():
+            return self.refresh_token()
+
+    def _get_token_json(self):
+        return getattr(self, "token_json", None)
+
+    def _token_refresh_suspended(self):
+        """
+        :return: Context manager skipping the proactive token refresh on the current
+            thread, used around the token requests of the session itself
+        """
+        if self.token_refresher is None:
+            return contextlib.nullcontext()
+        return self.token_refresher.suspended()
+
+    def _get_client_identity(self):
+        """
+        :return: OAuth client_id (AppSession) or user (UISession) of the session
+        """
+        return getattr(self, "client_id", None) or getattr(self, "user", None)
+
+    def _record_metrics(self, method, url, response, latency, kwargs):
+        if kwargs.get("stream"):
+            bytes_in = int(response.headers.get("Content-Length") or 0)
+        else:
+            bytes_in = len(response.content or b"")
+        request_body = getattr(getattr(response, "request", None), "body", None) or b""
+        self.metrics.record(
+            method, url, response.status_code, latency, bytes_in, len(request_body)
+        )
+
+    def _process_response(self, r, tuple_response, ignore_handle_response):
+        if ignore_handle_response:
+            return r
+        r.raise_for_status()
+        if tuple_response:
+            return r.status_code, self._handle_response(r)
+        return self._handle_response(r)
+
     @exception_handler
     def get(self, url, tuple_response=False, ignore_handle_response=False, **kwargs):
         """
@@ -198,13 +478,8 @@ class Session:
                 Response json or response obect if tuple_response is False
                 Tuple of status_code and response json/response object if tuple_response is True
         """
-        r = self.session.get(self._get_url(url), **kwargs)
-        if ignore_handle_response:
-            return r
-        r.raise_for_status()
-        if tuple_response:
-            return r.status_code, self._handle_response(r)
-        return self._handle_response(r)
+        r = self._request("GET", self._get_url(url), **kwargs)
+        return self._process_response(r, tuple_response, ignore_handle_response)
 
     @exception_handler
     def get_secondary(
@@ -223,13 +498,10 @@ class Session:
                 Tuple of status_code and response json/response object if tuple_response is True
         """
         get_cookies = self.session.cookies.get_dict(domain=self._get_domain())
-        r = self.session.get(self._get_url_secondary(url), cookies=get_cookies, **kwargs)
-        if ignore_handle_response:
-            return r
-        r.raise_for_status()
-        if tuple_response:
-            return r.status_code, self._handle_response(r)
-        return self._handle_response(r)
+        r = self._request(
+            "GET", self._get_url_secondary(url), cookies=get_cookies, **kwargs
+        )
+        return self._process_response(r, tuple_response, ignore_handle_response)
 
     @exception_handler
     def post(self, url, tuple_response=False, ignore_handle_response=False, **kwargs):
@@ -245,13 +517,8 @@ class Session:
                 Response json or response obect if tuple_response is False
                 Tuple of status_code and response json/response object if tuple_response is True
         """
-        r = self.session.post(self._get_url(url), **kwargs)
-        if ignore_handle_response:
-            return r
-        r.raise_for_status()
-        if tuple_response:
-            return r.status_code, self._handle_response(r)
-        return self._handle_response(r)
+        r = self._request("POST", self._get_url(url), **kwargs)
+        return self._process_response(r, tuple_response, ignore_handle_response)
 
     @exception_handler
     def post_secondary(
@@ -270,13 +537,10 @@ class Session:
                 Tuple of status_code and response json/response object if tuple_response is True
         """
         get_cookies = self.session.cookies.get_dict(domain=self._get_domain())
-        r = self.session.post(self._get_url_secondary(url), cookies=get_cookies, **kwargs)
-        if ignore_handle_response:
-            return r
-        r.raise_for_status()
-        if tuple_response:
-            return r.status_code, self._handle_response(r)
-        return self._handle_response(r)
+        r = self._request(
+            "POST", self._get_url_secondary(url), cookies=get_cookies, **kwargs
+        )
+        return self._process_response(r, tuple_response, ignore_handle_response)
 
     @exception_handler
     def put(self, url, tuple_response=False, ignore_handle_response=False, **kwargs):
@@ -292,13 +556,8 @@ class Session:
                 Response json or response obect if tuple_response is False
                 Tuple of status_code and response json/response object if tuple_response is True
         """
-        r = self.session.put(self._get_url(url), **kwargs)
-        if ignore_handle_response:
-            return r
-        r.raise_for_status()
-        if tuple_response:
-            return r.status_code, self._handle_response(r)
-        return self._handle_response(r)
+        r = self._request("PUT", self._get_url(url), **kwargs)
+        return self._process_response(r, tuple_response, ignore_handle_response)
 
     @exception_handler
     def patch(self, url, tuple_response=False, ignore_handle_response=False, **kwargs):
@@ -314,13 +573,8 @@ class Session:
                 Response json or response obect if tuple_response is False
                 Tuple of status_code and response json/response object if tuple_response is True
         """
-        r = self.session.patch(self._get_url(url), **kwargs)
-        if ignore_handle_response:
-            return r
-        r.raise_for_status()
-        if tuple_response:
-            return r.status_code, self._handle_response(r)
-        return self._handle_response(r)
+        r = self._request("PATCH", self._get_url(url), **kwargs)
+        return self._process_response(r, tuple_response, ignore_handle_response)
 
     @exception_handler
     def delete(self, url, tuple_response=False, ignore_handle_response=False, **kwargs):
@@ -336,10 +590,141 @@ class Session:
                 Response json or response obect if tuple_response is False
                 Tuple of status_code and response json/response object if tuple_response is True
         """
-        r = self.session.delete(self._get_url(url), **kwargs)
-        if ignore_handle_response:
-            return r
-        r.raise_for_status()
-        if tuple_response:
-            return r.status_code, self._handle_response(r)
-        return self._handle_response(r)
+        r = self._request("DELETE", self._get_url(url), **kwargs)
+        return self._process_response(r, tuple_response, ignore_handle_response)
+
+    @exception_handler
+    def stream(self, url, method="GET", **kwargs):
+        """
+        HTTP request with the streamed response body
+        The body is not read into memory; close the response (or use it as a context
+        manager) when done to release the connection.
+        :param url:
+        :param method: HTTP method (Default: GET)
+        :param kwargs:
+        :return: Response object (requests.Response)
+        """
+        r = self._request(method.upper(), self._get_url(url), stream=True, **kwargs)
+        try:
+            r.raise_for_status()
+        except HTTPError:
+            # Buffer the error body: exception_handler reports response.text and
+            # reading the body to the end releases the connection to the pool
+            _ = r.content
+            raise
+        return r
+
+    def stream_lines(self, url, method="GET", chunk_size=65536, **kwargs):
+        """
+        Iterate over the lines of the response body without buffering it
+        :param url:
+        :param method: HTTP method (Default: GET)
+        :param chunk_size: Size of the read chunks
+        :param kwargs:
+        :return: Generator of decoded lines
+        """
+        with closing(self.stream(url, method, **kwargs)) as r:
+            r.encoding = r.encoding or "utf-8"
+            yield from r.iter_lines(chunk_size=chunk_size, decode_unicode=True)
+
+    def stream_csv_rows(
+        self, url, method="GET", as_dict=False, chunk_size=65536, **kwargs
+    ):
+        """
+        Iterate over the rows of a CSV response body without buffering it
+        :param url:
+        :param method: HTTP method (Default: GET)
+        :param as_dict: Yield the rows as dicts keyed by the header row (Default: False)
+        :param chunk_size: Size of the read chunks
+        :param kwargs:
+        :return: Generator of rows (lists or dicts)
+        """
+        with closing(self.stream(url, method, **kwargs)) as r:
+            # iter_content also serves a body already read by the cassette or hooks
+            text = io.TextIOWrapper(
+                ChunkStream(r.iter_content(chunk_size)),
+                encoding=r.encoding or "utf-8",
+                newline="",
+            )
+            yield from (csv.DictReader if as_dict else csv.reader)(text)
+
+    def stream_json_items(
+        self, url, key="items", method="GET", chunk_size=65536, **kwargs
+    ):
+        """
+        Iterate over the items of a JSON array in the response body without
+        buffering and parsing the whole document,
+        e.g. stream_json_items(url, key="devices") for {"devices": [...], ...}
+        :param url:
+        :param key: Key of the array in the top-level object (None - top-level array)
+        :param method: HTTP method (Default: GET)
+        :param chunk_size: Size of the read chunks
+        :param kwargs:
+        :return: Generator of the array items
+        """
+        with closing(self.stream(url, method, **kwargs)) as r:
+            yield from iter_json_items(r.iter_content(chunk_size=chunk_size), key)
+
+    def paginate(self, url, method="GET", params=None, items_key=None, **kwargs):
+        """
+        Lazily iterate over the items of a paginated listing API, requesting the
+        next page only when the items of the previous one are consumed,
+        e.g. paginate("/devices", items_key="items", page_size=2000)
+        :param url:
+        :param method: HTTP method (Default: GET)
+        :param params: Query params sent with every page
+        :param items_key: Dotted path of the items list in the page
+        :param kwargs: Paginator options (style, page_size, start, limit_param,
+            offset_param, page_param, cursor_param, total_keys, next_keys,
+            max_items, stop, cursor), other kwargs are passed to the requests
+        :return: Paginator object (iterable of the items, see Paginator.iter_pages)
+        """
+        options = {key: kwargs.pop(key) for key in PAGINATOR_OPTIONS if key in kwargs}
+        verb = getattr(self, method.lower())
+
+        def fetch(paging_params):
+            cursor = paging_params.get(options.get("cursor_param", "cursor"))
+            if (
+                options.get("style") == CURSOR
+                and isinstance(cursor, str)
+                and (cursor.startswith("/") or urlparse.urlparse(cursor).netloc)
+            ):
+                # The next link already carries the query of the next page
+                return verb(cursor, **kwargs)
+            return verb(url, params={**(params or {}), **paging_params}, **kwargs)
+
+        return Paginator(fetch, items_key=items_key, **options)
+
+    def map(self, specs, concurrency=8, fail_fast=False, progress=None, **kwargs):
+        """
+        Send many requests with bounded concurrency,
+        e.g. map([("DELETE", f"/tenant/{id}") for id in ids], concurrency=16)
+        :param specs: Iterable of request specs: tuples (method, url[, json payload])
+            or dictionaries {"method": ..., "url": ..., **request kwargs}
+        :param concurrency: Max number of requests in flight
+        :param fail_fast: Cancel the requests not sent yet and raise BulkRequestException
+            on the first error (Default: False - collect all results and errors)
+        :param progress: Callable progress(completed, total, bulk_result)
+        :param kwargs: Request kwargs common to all requests (e.g. tuple_response)
+        :return: List of BulkResult objects (result/error per spec) in the input order
+        """
+
+        def send(spec):
+            method, url, request_kwargs = get_request_spec(spec)
+            return getattr(self, method.lower())(url, **{**kwargs, **request_kwargs})
+
+        return execute_many(send, specs, concurrency, fail_fast, progress)
+
+    def submit_many(self, func, items, concurrency=8, fail_fast=False, progress=None):
+        """
+        Call an API method for many items with bounded concurrency,
+        e.g. submit_many(doorway.delete_tenant, customer_ids)
+        :param func: API method (or any callable) of a single item
+        :param items: Iterable of the items
+        :param concurrency: Max number of calls in flight
+        :param fail_fast: Cancel the calls not started yet and raise BulkRequestException
+            on the first error (Default: False - collect all results and errors)
+        :param progress: Callable progress(completed, total, bulk_result)
+        :return: List of BulkResult objects (result/error per item) in the input order
+        """
+        return execute_many(func, items, concurrency, fail_fast, progress)
@@ -0,0 +1,121 @@
+"""
+Single-flight Coalescing of concurrent identical GET requests of the core REST Session
+"""
+import logging
+import threading
+
+from .deadline import get_deadline
+from .utils import build_response
+
+LOG = logging.getLogger(__name__)
+
+
+class _Call:
+    """
+    In-flight call shared by the leader and the waiting followers
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical GET requests into a single network call.
+
+    The first caller (leader) sends the request, callers arriving while it is in
+    flight (followers) wait for its outcome. Followers get their own copy of the
+    response (parsed independently by Response.json()), so callers can mutate the
+    returned data safely; leader's exception is re-raised in every follower.
+    Followers wait no longer than the flow deadline and the request timeout: past
+    the deadline they raise DeadlineExceededException, past the timeout they send
+    the request themselves.
+    A single SingleFlight object may be shared by several Session objects.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def get_key(url, identity=None, **kwargs):
+        """
+        :param url: Request URL
+        :param identity: Caller identity (e.g. Authorization header)
+        :param kwargs: Keyword arguments of the request
+        :return: Hashable key of the request
+        """
+        return url, identity, repr(sorted(kwargs.items(), key=lambda item: item[0]))
+
+    def do(self, key, func, timeout=None, step=None):
+        """
+        Run func() once for all concurrent callers with the same key
+        :param key: Request key
+        :param func: Callable sending the request and returning the response
+        :param timeout: Max time in seconds a follower waits for the leader
+            (None - until the leader finishes or the deadline passes)
+        :param step: Deadline step of the request
+        :return: Response object (a copy for the followers)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+        if leader:
+            try:
+                call.result = func()
+                # Read the body before the followers copy the response
+                call.result.content
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.event.set()
+            return call.result
+        deadline = get_deadline()
+        wait = timeout
+        if deadline is not None:
+            wait = (
+                deadline.remaining() if wait is None else min(wait, deadline.remaining())
+            )
+        if not call.event.wait(wait):
+            if deadline is not None and deadline.expired():
+                raise deadline.exceeded(step, "waiting for the coalesced request")
+            LOG.warning(
+                f"Coalesced request did not finish in {wait:g}s, sending it directly"
+            )
+            return func()
+        if call.error is not None:
+            raise call.error
+        return self.copy_response(call.result)
+
+    @staticmethod
+    def copy_response(response):
+        """
+        :param response: requests.Response object
+        :return: Independent copy of the fully read response
+        """
+        copy = build_response(
+            response.request,
+            response.status_code,
+            response.headers,
+            response.content,
+            reason=response.reason,
+            encoding=response.encoding,
+            connection=response.connection,
+        )
+        copy.url = response.url
+        copy.elapsed = response.elapsed
+        copy.history = list(response.history)
+        copy.cookies = response.cookies.copy()
+        return copy
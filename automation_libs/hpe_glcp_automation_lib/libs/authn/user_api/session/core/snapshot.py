@@ -0,0 +1,182 @@
+"""
+Encrypted Login Snapshots of the authenticated Sessions
+"""
+import base64
+import contextlib
+import functools
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import threading
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:
+    Fernet = None
+
+from .utils import file_lock
+
+LOG = logging.getLogger(__name__)
+
+# PBKDF2-HMAC-SHA256 iterations deriving the keys from the snapshot secret
+KDF_ITERATIONS = 600000
+SALT_FILE = ".salt"
+
+
+def dump_cookies(jar):
+    """
+    :param jar: requests.cookies.RequestsCookieJar object
+    :return: List of JSON serializable cookie dictionaries
+    """
+    return [
+        {
+            "name": cookie.name,
+            "value": cookie.value,
+            "domain": cookie.domain,
+            "path": cookie.path,
+            "secure": cookie.secure,
+            "expires": cookie.expires,
+            "rest": cookie._rest,
+        }
+        for cookie in jar
+    ]
+
+
+def load_cookies(jar, cookies):
+    """
+    :param jar: requests.cookies.RequestsCookieJar object to set the cookies to
+    :param cookies: List of cookie dictionaries returned by dump_cookies()
+    """
+    for cookie in cookies:
+        jar.set(**cookie)
+
+
+@functools.lru_cache(maxsize=None)
+def derive_keys(secret, salt):
+    """
+    :param secret: Secret shared by the workers
+    :param salt: Salt of the snapshot directory
+    :return: Tuple (Fernet encryption key, HMAC key of the snapshot names)
+    """
+    key = hashlib.pbkdf2_hmac("sha256", secret.encode(), salt, KDF_ITERATIONS, dklen=64)
+    return base64.urlsafe_b64encode(key[:32]), key[32:]
+
+
+class LoginSnapshotStore:
+    """
+    Directory of Fernet-encrypted (AES-128-CBC + HMAC-SHA256) login snapshots,
+    so that a logged-in session (cookies, tokens, cluster settings) is restored
+    by the other processes and reruns instead of repeating the interactive login.
+
+    Snapshots are named by the HMAC-SHA256 of the user details (host, user,
+    password), expire after ttl seconds and are written atomically with 0600
+    permissions. The encryption and naming keys are derived from a secret shared
+    by the workers with PBKDF2 salted by a random salt of the directory.
+    Set SESSION_SNAPSHOT_DIR and SESSION_SNAPSHOT_KEY (the secret) environment
+    variables to enable it for every UISession in the process.
+    """
+
+    def __init__(self, directory, secret, ttl=8 * 3600):
+        """
+        :param directory: Directory of the snapshot files
+        :param secret: Secret the encryption key is derived from
+        :param ttl: Time in seconds a snapshot is valid for
+        """
+        if Fernet is None:
+            raise ImportError(
+                "cryptography package is required for the login snapshots "
+                "(hpe-glcp-automation-lib[snapshots] extra)"
+            )
+        self.directory = directory
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fernet_key, self._name_key = derive_keys(secret, self._get_salt())
+        self._fernet = Fernet(fernet_key)
+
+    def _get_salt(self):
+        """
+        :return: Random salt of the directory, created by the first store using it
+        """
+        path = os.path.join(self.directory, SALT_FILE)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as salt_file:
+            salt_file.write(secrets.token_bytes(16))
+        try:
+            # Atomic and never replaces the salt another process has created
+            os.link(tmp_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tmp_path)
+        with open(path, "rb") as salt_file:
+            return salt_file.read()
+
+    @classmethod
+    def from_env(cls):
+        """
+        :return: LoginSnapshotStore configured via environment variables or None
+        """
+        directory = os.getenv("SESSION_SNAPSHOT_DIR")
+        secret = os.getenv("SESSION_SNAPSHOT_KEY")
+        if not directory or not secret:
+            return None
+        return cls(directory, secret)
+
+    def _get_path(self, user_details):
+        key = hmac.new(
+            self._name_key, repr(tuple(user_details)).encode(), hashlib.sha256
+        ).hexdigest()
+        return os.path.join(self.directory, f"{key}.snapshot")
+
+    @contextlib.contextmanager
+    def locked(self, user_details):
+        """
+        Exclusive lock of the snapshot across the threads and processes,
+        e.g. held while restoring and validating it, since refresh tokens rotate
+        :param user_details: Tuple of the user details
+        """
+        with self._lock, file_lock(f"{self._get_path(user_details)}.lock"):
+            yield
+
+    def save(self, user_details, snapshot):
+        """
+        :param user_details: Tuple of the user details
+        :param snapshot: JSON serializable dictionary of the session state
+        """
+        path = self._get_path(user_details)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as snapshot_file:
+            snapshot_file.write(self._fernet.encrypt(json.dumps(snapshot).encode()))
+        os.replace(tmp_path, path)
+        LOG.info(f"Login snapshot for {user_details[1]} was saved")
+
+    def load(self, user_details):
+        """
+        :param user_details: Tuple of the user details
+        :return: Dictionary of the session state or None if missing, expired or
+            not decryptable with the current secret
+        """
+        try:
+            with open(self._get_path(user_details), "rb") as snapshot_file:
+                data = snapshot_file.read()
+        except FileNotFoundError:
+            return None
+        try:
+            return json.loads(self._fernet.decrypt(data, ttl=self.ttl))
+        except InvalidToken:
+            LOG.info(f"Login snapshot for {user_details[1]} is expired or invalid")
+            self.delete(user_details)
+            return None
+
+    def delete(self, user_details):
+        """
+        :param user_details: Tuple of the user details
+        """
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._get_path(user_details))
@@ -0,0 +1,161 @@
+"""
+Incremental parsing of streamed responses of the core REST Session
+"""
+import codecs
+import io
+import json
+
+WHITESPACE = " \t\n\r"
+
+
+class ChunkStream(io.RawIOBase):
+    """
+    Readable binary file over an iterable of byte chunks, e.g.
+    io.TextIOWrapper(ChunkStream(response.iter_content(65536))) - unlike
+    response.raw it also serves a body already read by a hook or the cassette
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._chunk = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._chunk:
+            self._chunk = next(self._chunks, None)
+            if self._chunk is None:
+                self._chunk = b""
+                return 0
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+
+class _ArrayLocator:
+    """
+    Resumable scanner locating the start of the array stored under the key of the
+    top-level JSON object (or the top-level array itself when key is None)
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.string_start = None
+        self.last_string = None
+        self.current_key = None
+
+    def feed(self, text, pos):
+        """
+        :param text: Buffered text
+        :param pos: Position to resume the scanning from
+        :return: Tuple (index after the opening "[" of the array or None, resume position)
+        """
+        for index in range(pos, len(text)):
+            char = text[index]
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == "\\":
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+                    self.last_string = text[self.string_start : index]
+                continue
+            if char in WHITESPACE:
+                continue
+            if char == '"':
+                self.in_string = True
+                self.string_start = index + 1
+            elif char == ":" and self.depth == 1:
+                self.current_key = json.loads(f'"{self.last_string}"')
+            elif char == "[" and (
+                (self.key is None and self.depth == 0)
+                or (self.depth == 1 and self.current_key == self.key)
+            ):
+                return index + 1, index + 1
+            elif char in "{[":
+                self.depth += 1
+            elif char in "}]":
+                self.depth -= 1
+            elif char == "," and self.depth == 1:
+                self.current_key = None
+        return None, len(text)
+
+
+def iter_json_items(chunks, key=None):
+    """
+    Iterate over the items of a JSON array without loading the whole document,
+    e.g. iter_json_items(response.iter_content(65536), "devices") for
+    {"pagination": {...}, "devices": [{...}, {...}]}
+    :param chunks: Iterable of the document chunks (bytes or str)
+    :param key: Key of the array in the top-level object (None - top-level array)
+    :return: Generator of the array items
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer = ""
+    eof = False
+
+    def read_more():
+        nonlocal buffer, eof
+        for chunk in chunks:
+            buffer += decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if chunk:
+                return
+        buffer += decoder.decode(b"", final=True)
+        eof = True
+
+    locator = _ArrayLocator(key)
+    pos = 0
+    while True:
+        start, pos = locator.feed(buffer, pos)
+        if start is not None:
+            buffer = buffer[start:]
+            break
+        if eof:
+            return
+        # Keep only the not scanned text and the string being scanned
+        drop = locator.string_start if locator.in_string else pos
+        drop = min(drop, pos)
+        locator.string_start = (locator.string_start or 0) - drop
+        buffer, pos = buffer[drop:], pos - drop
+        read_more()
+
+    json_decoder = json.JSONDecoder()
+    while True:
+        index = 0
+        while index < len(buffer) and buffer[index] in WHITESPACE + ",":
+            index += 1
+        if index == len(buffer):
+            if eof:
+                raise ValueError("Unexpected end of the streamed JSON array")
+            buffer = ""
+            read_more()
+            continue
+        if buffer[index] == "]":
+            return
+        try:
+            item, end = json_decoder.raw_decode(buffer, index)
+        except ValueError:
+            if eof:
+                raise
+            buffer = buffer[index:]
+            read_more()
+            continue
+        # Scalar items (numbers) may be cut at the chunk border, e.g. "12." + "5"
+        # decodes as 12, so a number is complete only when a delimiter follows
+        if (
+            not eof
+            and isinstance(item, (int, float))
+            and (end == len(buffer) or buffer[end] not in WHITESPACE + ",]")
+        ):
+            buffer = buffer[index:]
+            read_more()
+            continue
+        yield item
+        buffer = buffer[end:]
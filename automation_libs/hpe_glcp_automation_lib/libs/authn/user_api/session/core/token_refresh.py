@@ -0,0 +1,214 @@
+"""
+Proactive (expiry-driven) Token Refresh of the authenticated Sessions
+"""
+import base64
+import contextlib
+import json
+import logging
+import threading
+import time
+import weakref
+
+LOG = logging.getLogger(__name__)
+
+
+def get_token_expiry(token_json, obtained_at=None):
+    """
+    :param token_json: Token response, e.g. {"access_token": <JWT>, "expires_in": 7199}
+    :param obtained_at: Time (epoch seconds) the token was obtained at, used with
+        expires_in when the access token is not a JWT (Default: now)
+    :return: Expiry time of the access token (epoch seconds) or None if unknown
+    """
+    if not isinstance(token_json, dict):
+        return None
+    access_token = token_json.get("access_token")
+    if isinstance(access_token, str) and access_token.count(".") == 2:
+        payload = access_token.split(".")[1]
+        try:
+            claims = json.loads(
+                base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+            )
+            if isinstance(claims.get("exp"), (int, float)):
+                return float(claims["exp"])
+        except ValueError:
+            LOG.debug("Access token is not a decodable JWT")
+    if isinstance(token_json.get("expires_in"), (int, float)):
+        return (obtained_at or time.time()) + token_json["expires_in"]
+    return None
+
+
+class TokenRefresher:
+    """
+    Refreshes the session token ahead of its expiry ("exp" claim of the access
+    token JWT or "expires_in"), so that the requests do not bounce on 401.
+
+    The refresh is single-flight per token key (client details of AppSession and
+    UnifiedSession, user of UISession): concurrent requests of any session sharing
+    the token wait for one refresh instead of refreshing it each.
+    With background=True a daemon thread renews the token skew seconds before the
+    expiry, so the request path never pays for the token acquisition.
+    A session uses it via token_refresher=TokenRefresher(...) and implements
+    _get_token_key(), _get_token_json() (the token currently shared by the key)
+    and refresh_token(force=True).
+    """
+
+    def __init__(self, skew=60, background=False, retry_interval=10):
+        """
+        :param skew: Time in seconds before the expiry to refresh the token at
+        :param background: Renew the tokens by a background thread (Default: False)
+        :param retry_interval: Time in seconds between the attempts of a failed refresh
+        """
+        self.skew = skew
+        self.background = background
+        self.retry_interval = retry_interval
+        self.refreshes = 0
+        self._expiry = {}
+        self._next_attempt = {}
+        self._locks = {}
+        self._watchers = {}
+        self._identities = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _get_lock(self, key):
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get_expiry(self, session):
+        """
+        :param session: Session object with the token
+        :return: Expiry time of the session token (epoch seconds) or None if unknown
+        """
+        key = session._get_token_key()
+        token_json = session._get_token_json()
+        access_token = token_json.get("access_token") if token_json else None
+        cached = self._expiry.get(key)
+        if cached is not None and cached[0] == access_token:
+            return cached[1]
+        # A new token (first request, refresh or login), expires_in counts from now
+        expiry = get_token_expiry(token_json)
+        self._expiry[key] = (access_token, expiry)
+        self._identities[key] = session._get_client_identity()
+        return expiry
+
+    def needs_refresh(self, session):
+        """
+        :param session: Session object with the token
+        :return: True if the token expires within skew seconds
+        """
+        expiry = self.get_expiry(session)
+        return expiry is not None and time.time() >= expiry - self.skew
+
+    @contextlib.contextmanager
+    def suspended(self):
+        """
+        Skip the proactive refresh on the current thread, e.g. while the session
+        refreshes or restores its token itself
+        """
+        refreshing = getattr(self._local, "refreshing", False)
+        self._local.refreshing = True
+        try:
+            yield
+        finally:
+            self._local.refreshing = refreshing
+
+    def ensure_fresh(self, session):
+        """
+        Refresh the session token if it is about to expire, called before every request
+        :param session: Session object with the token
+        """
+        # The token requests of the refresh itself are sent by the same session
+        if getattr(self._local, "refreshing", False) or not self.needs_refresh(session):
+            return
+        key = session._get_token_key()
+        with self._get_lock(key):
+            if not self.needs_refresh(session) or time.time() < self._next_attempt.get(
+                key, 0
+            ):
+                return
+            self._refresh(session, key)
+
+    def _refresh(self, session, key):
+        LOG.info(
+            f"Token of {self._identities.get(key)} expires in less than "
+            f"{self.skew} seconds, refreshing"
+        )
+        try:
+            with self.suspended():
+                refreshed = session.refresh_token(force=True)
+        except Exception as e:
+            LOG.warning(f"Proactive token refresh failed: {e!r}")
+            refreshed = False
+        if not refreshed:
+            self._next_attempt[key] = time.time() + self.retry_interval
+            return
+        self.refreshes += 1
+        self._next_attempt.pop(key, None)
+
+    def watch(self, session):
+        """
+        Start the background renewal of the session token (background=True only)
+        :param session: Session object with the token
+        """
+        if not self.background:
+            return
+        key = session._get_token_key()
+        with self._lock:
+            if key in self._watchers and self._watchers[key].is_alive():
+                return
+            stopped = threading.Event()
+            thread = threading.Thread(
+                target=self._renew,
+                args=(weakref.ref(session), stopped),
+                name=f"token-refresher-{len(self._watchers)}",
+                daemon=True,
+            )
+            thread.stopped = stopped
+            self._watchers[key] = thread
+        thread.start()
+
+    def _renew(self, session_ref, stopped):
+        while not stopped.is_set():
+            session = session_ref()
+            if session is None:
+                return
+            expiry = self.get_expiry(session)
+            key = session._get_token_key()
+            wait = self.retry_interval
+            if expiry is not None:
+                wait = max(expiry - self.skew - time.time(), 0)
+                wait = max(wait, self._next_attempt.get(key, 0) - time.time())
+            # Do not keep the session alive while sleeping
+            del session
+            if stopped.wait(wait):
+                return
+            session = session_ref()
+            if session is None:
+                return
+            self.ensure_fresh(session)
+            del session
+
+    def stop(self):
+        """
+        Stop the background renewal threads
+        """
+        with self._lock:
+            watchers = list(self._watchers.values())
+            self._watchers.clear()
+        for thread in watchers:
+            thread.stopped.set()
+
+    def as_dict(self):
+        """
+        :return: Dictionary of the client identity (client_id or user) and seconds
+            left before the token expiry
+        """
+        now = time.time()
+        return {
+            str(self._identities.get(key)): round(expiry - now, 1)
+            for key, (_, expiry) in list(self._expiry.items())
+            if expiry is not None
+        }
+
+
+DEFAULT_TOKEN_REFRESHER = TokenRefresher()
@@ -0,0 +1,180 @@
+"""
+Cross-process shared Token Store of the authenticated Sessions
+"""
+import contextlib
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+
+from .token_refresh import get_token_expiry
+from .utils import fcntl, file_lock
+
+LOG = logging.getLogger(__name__)
+
+
+class SharedTokenStore:
+    """
+    File-backed token store shared by all processes of a node (e.g. pytest-xdist
+    workers), so that a token is acquired once per client instead of once per worker.
+
+    Entries are keyed by the HMAC-SHA256 of the client details with a random salt
+    kept in the store file (no guessable secrets on disk as keys), hold the token
+    with its expiry and are written atomically under an
+    exclusive fcntl lock. get_or_fetch() holds the lock while fetching, so the
+    workers starting together wait for the first one's token instead of each
+    performing its own grant.
+    Set SESSION_TOKEN_STORE environment variable to the store file path to enable
+    it for AppSession, UnifiedSession and ActivateBridgeCookies in every process.
+    """
+
+    def __init__(self, path, min_ttl=60, default_ttl=900):
+        """
+        :param path: Path of the store file (created with 0600 permissions)
+        :param min_ttl: Tokens expiring within min_ttl seconds are not served
+        :param default_ttl: Lifetime in seconds of the tokens without a known expiry
+            (e.g. cookies)
+        """
+        self.path = path
+        self.min_ttl = min_ttl
+        self.default_ttl = default_ttl
+        self._lock = threading.RLock()
+        self._depth = 0
+        if fcntl is None:
+            LOG.warning("fcntl is not available, the token store is locked per process")
+
+    @classmethod
+    def from_env(cls):
+        """
+        :return: SharedTokenStore configured via environment variables or None
+        """
+        path = os.getenv("SESSION_TOKEN_STORE")
+        return cls(path) if path else None
+
+    @staticmethod
+    def get_key(client_details, salt):
+        """
+        :param client_details: Tuple of the client details (host, client_id, secret, ...)
+        :param salt: Salt of the store (hex string)
+        :return: Store key
+        """
+        return hmac.new(
+            bytes.fromhex(salt), repr(tuple(client_details)).encode(), hashlib.sha256
+        ).hexdigest()
+
+    @contextlib.contextmanager
+    def _locked(self):
+        # Reentrant per thread (e.g. invalidate() from within the fetch of
+        # get_or_fetch()), flock of a second file descriptor would deadlock
+        with self._lock:
+            self._depth += 1
+            try:
+                if self._depth > 1:
+                    yield
+                else:
+                    with file_lock(f"{self.path}.lock"):
+                        yield
+            finally:
+                self._depth -= 1
+
+    def _read(self):
+        """
+        :return: Tuple (salt or None if not created yet, dictionary of the entries)
+        """
+        try:
+            with open(self.path) as store_file:
+                store = json.load(store_file)
+        except FileNotFoundError:
+            return None, {}
+        except ValueError:
+            LOG.warning(f"Token store {self.path} is corrupted, ignoring it")
+            return None, {}
+        if "salt" not in store:
+            # Unsalted store of the previous versions
+            return None, {}
+        return store["salt"], store["entries"]
+
+    def _write(self, salt, entries):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as store:
+            json.dump({"salt": salt, "entries": entries}, store)
+        os.replace(tmp_path, self.path)
+
+    def get(self, client_details):
+        """
+        :param client_details: Tuple of the client details
+        :return: Stored token (token json or cookies) valid for at least min_ttl
+            seconds or None
+        """
+        salt, entries = self._read()
+        if salt is None:
+            return None
+        entry = entries.get(self.get_key(client_details, salt))
+        if entry and entry["expires_at"] - self.min_ttl > time.time():
+            return entry["token"]
+        return None
+
+    def put(self, client_details, token):
+        """
+        :param client_details: Tuple of the client details
+        :param token: Token json or cookies
+        """
+        with self._locked():
+            self._put(client_details, token)
+
+    def _put(self, client_details, token):
+        now = time.time()
+        salt, entries = self._read()
+        salt = salt or secrets.token_hex(16)
+        entries = {
+            stored_key: entry
+            for stored_key, entry in entries.items()
+            if entry["expires_at"] > now
+        }
+        entries[self.get_key(client_details, salt)] = {
+            "token": token,
+            "expires_at": get_token_expiry(token, now) or now + self.default_ttl,
+        }
+        self._write(salt, entries)
+
+    def get_or_fetch(self, client_details, fetch):
+        """
+        :param client_details: Tuple of the client details
+        :param fetch: Callable acquiring a new token, returns token json/cookies or None
+        :return: Stored or fetched token, None if the fetch failed
+        """
+        token = self.get(client_details)
+        if token is not None:
+            LOG.info("Token was loaded from the shared token store")
+            return token
+        with self._locked():
+            # Another process may have fetched it while waiting for the lock
+            token = self.get(client_details)
+            if token is not None:
+                LOG.info("Token was loaded from the shared token store")
+                return token
+            token = fetch()
+            if token is not None:
+                self._put(client_details, token)
+            return token
+
+    def invalidate(self, client_details, token=None):
+        """
+        Remove the stored token (e.g. rejected with 401 or about to expire)
+        :param client_details: Tuple of the client details
+        :param token: Remove only if this token is stored, so that a newer token
+            fetched by another process is kept
+        """
+        with self._locked():
+            salt, entries = self._read()
+            if salt is None:
+                return
+            key = self.get_key(client_details, salt)
+            if key in entries and (token is None or entries[key]["token"] == token):
+                del entries[key]
+                self._write(salt, entries)
@@ -0,0 +1,163 @@
+"""
+Memoized Cluster Topology (clusterinfo configmap and settings.json) of the Sessions
+"""
+import copy
+import json
+import logging
+import os
+import threading
+from types import MappingProxyType
+
+LOG = logging.getLogger(__name__)
+
+CLUSTER_INFO_FILE = "/configmap/data/infra_clusterinfo.json"
+
+
+def get_url(hostname):
+    """
+    :param hostname: Hostname with or without https:// as prefix
+    :return: Hostname with https:// as prefix
+    """
+    if hostname.startswith("https://"):
+        return hostname
+    return f"https://{hostname}"
+
+
+class ClusterTopology:
+    """
+    Immutable map of the cluster topology precomputed from the clusterinfo:
+    read-write (RW) and read-only (RO) region hostnames, device URLs, setup and
+    multi-region flag. The clusterinfo HOSTNAMES are either per region (with
+    LIST_OF_REGIONS and READ_WRITE_REGION) or flat for the single-region clusters.
+    """
+
+    def __init__(self, cluster_info):
+        """
+        :param cluster_info: Dictionary of the clusterinfo configmap
+        """
+        info = cluster_info.get("clusterinfo", {})
+        hostnames = info.get("HOSTNAMES", {})
+        self.regions = tuple(info.get("LIST_OF_REGIONS", ()))
+        self.multi_region = len(self.regions) > 1
+        self.setup = MappingProxyType(dict(info.get("SETUP", {})))
+        self.rw_region = None
+        self.ro_region = None
+        rw_hostnames = hostnames
+        ro_hostnames = {}
+        if "LIST_OF_REGIONS" in info or "READ_WRITE_REGION" in info:
+            self.rw_region = info.get("READ_WRITE_REGION")
+            rw_hostnames = hostnames.get(self.rw_region, {})
+            if self.multi_region:
+                region1, region2 = self.regions[:2]
+                self.ro_region = region2 if self.rw_region == region1 else region1
+                ro_hostnames = hostnames.get(self.ro_region, {})
+        self.hostnames = MappingProxyType(dict(rw_hostnames))
+        self.ro_hostnames = MappingProxyType(dict(ro_hostnames))
+        self._cluster_info = cluster_info
+
+    def get_hostname(self, name, readonly=False):
+        """
+        :param name: Hostname key of the clusterinfo, e.g. ccs_user_api_hostname,
+            ccs_activate_v1_device_url
+        :param readonly: Hostname of the RO region (multi-region clusters only)
+        :return: Hostname with https:// as prefix or None if not in the clusterinfo
+        """
+        hostname = (self.ro_hostnames if readonly else self.hostnames).get(name)
+        if not isinstance(hostname, str):
+            region = self.ro_region if readonly else self.rw_region
+            LOG.error(f"{name} is not found in the clusterinfo (region: {region})")
+            return None
+        return get_url(hostname)
+
+    def get_cluster_info(self):
+        """
+        :return: Copy of the clusterinfo dictionary
+        """
+        return copy.deepcopy(self._cluster_info)
+
+
+class TopologyResolver:
+    """
+    Process-wide resolver of the cluster topology shared by all session classes.
+
+    The clusterinfo file is parsed once into ClusterTopology and reloaded only when
+    its mtime changes; settings.json is fetched once per host. Constructing the
+    sessions after the first one is in-memory work instead of a file read and up to
+    three settings.json requests each.
+    """
+
+    def __init__(self, cluster_info_file=CLUSTER_INFO_FILE):
+        """
+        :param cluster_info_file: Path of the clusterinfo configmap file
+        """
+        self.cluster_info_file = cluster_info_file
+        self._topology = (None, None)
+        self._settings = {}
+        self._settings_locks = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def in_cluster():
+        """
+        :return: True if running in k8s environment (clusterinfo configmap is mounted)
+        """
+        return os.getenv("POD_NAMESPACE") is not None
+
+    def get_topology(self):
+        """
+        :return: ClusterTopology of the clusterinfo file
+        :raises: OSError if the clusterinfo file is not available
+        """
+        mtime = os.stat(self.cluster_info_file).st_mtime_ns
+        loaded_mtime, topology = self._topology
+        if loaded_mtime == mtime:
+            return topology
+        with self._lock:
+            loaded_mtime, topology = self._topology
+            if loaded_mtime != mtime:
+                with open(self.cluster_info_file) as cluster_info:
+                    topology = ClusterTopology(json.load(cluster_info))
+                self._topology = (mtime, topology)
+                LOG.info(f"Cluster topology was loaded from {self.cluster_info_file}")
+            return topology
+
+    def get_cluster_info(self):
+        """
+        :return: Copy of the clusterinfo dictionary
+        """
+        return self.get_topology().get_cluster_info()
+
+    def get_settings(self, host, fetch):
+        """
+        :param host: Host the settings.json is served by (with https:// as prefix)
+        :param fetch: Callable fetching the settings.json dictionary of the host,
+            called once per host by the first session (the others wait for it)
+        :return: Copy of the settings.json dictionary
+        """
+        settings = self._settings.get(host)
+        if settings is None:
+            with self._lock:
+                lock = self._settings_locks.setdefault(host, threading.Lock())
+            with lock:
+                settings = self._settings.get(host)
+                if settings is None:
+                    settings = fetch()
+                    if not isinstance(settings, dict):
+                        return settings
+                    self._settings[host] = settings
+                    LOG.info(f"Settings of {host} were loaded")
+        return copy.deepcopy(settings)
+
+    def reset(self, host=None):
+        """
+        Drop the memoized topology (reloaded on the next lookup)
+        :param host: Drop the settings.json of this host only (Default: everything)
+        """
+        if host is not None:
+            self._settings.pop(host, None)
+            return
+        self._settings.clear()
+        self._topology = (None, None)
+
+
+CLUSTER_TOPOLOGY = TopologyResolver()
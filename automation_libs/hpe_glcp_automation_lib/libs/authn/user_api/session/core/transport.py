@@ -0,0 +1,381 @@
+"""
+Pooled HTTP Transport for the core REST Session
+"""
+import http.client
+import io
+import logging
+import socket
+import threading
+from types import SimpleNamespace
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.cookies import extract_cookies_to_jar
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, select_proxy
+from urllib3.connection import HTTPConnection
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from .utils import build_response
+
+LOG = logging.getLogger(__name__)
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter with a default (connect, read) timeout applied to every request
+    that does not set one explicitly
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["timeout", "socket_options"]
+
+    def __init__(self, timeout=None, socket_options=None, **kwargs):
+        """
+        :param timeout: Default timeout as (connect, read) tuple or a single number
+        :param socket_options: Socket options applied to each new pooled connection
+        :param kwargs: Additional keyword arguments for requests.adapters.HTTPAdapter
+        """
+        self.timeout = timeout
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options is not None:
+            kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = self.timeout
+        return super().send(request, timeout=timeout, **kwargs)
+
+
+class HTTP2RawStream(io.RawIOBase):
+    """
+    File-like raw body of a streamed HTTP/2 response (already decoded)
+    """
+
+    def __init__(self, response):
+        """
+        :param response: Streamed httpx.Response object
+        """
+        super().__init__()
+        self.response = response
+        self.decode_content = True
+        self.auto_close = True
+        self._chunks = response.iter_bytes()
+        self._buffer = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def stream(self, amt=65536, decode_content=None):
+        while True:
+            data = self.read(amt)
+            if not data:
+                break
+            yield data
+
+    def close(self):
+        self.response.close()
+        super().close()
+
+    def release_conn(self):
+        self.close()
+
+
+class HTTP2Adapter(BaseAdapter):
+    """
+    Transport adapter sending the requests of requests.Session over httpx with
+    HTTP/2 enabled, so that concurrent requests to the same host are multiplexed
+    over a few connections (HTTP/1.1 is used by the hosts not supporting HTTP/2).
+    Requires httpx with HTTP/2 support (pip install httpx[http2]).
+    """
+
+    def __init__(self, timeout=None, max_connections=None, keepalive_expiry=None):
+        """
+        :param timeout: Default timeout as (connect, read) tuple or a single number
+        :param max_connections: Max number of connections per client
+        :param keepalive_expiry: Time in seconds idle connections are kept
+        """
+        if httpx is None:
+            raise ImportError(
+                "httpx is not installed, HTTP/2 transport is unavailable "
+                "(hpe-glcp-automation-lib[http2] extra)"
+            )
+        super().__init__()
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def get_client(self, verify=True, cert=None, proxy=None):
+        """
+        :param verify: TLS verification (bool or CA bundle path)
+        :param cert: Client certificate (path or (cert, key) tuple)
+        :param proxy: Proxy URL
+        :return: httpx.Client object shared by the requests with the same settings
+        """
+        key = (verify, cert, proxy)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = httpx.Client(
+                    http2=True,
+                    verify=verify,
+                    cert=cert,
+                    proxy=proxy,
+                    limits=self.limits,
+                    trust_env=False,
+                    follow_redirects=False,
+                )
+            return client
+
+    @staticmethod
+    def _get_timeout(timeout):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        client = self.get_client(verify, cert, select_proxy(request.url, proxies or {}))
+        timeout = self.timeout if timeout is None else timeout
+        httpx_request = client.build_request(
+            request.method,
+            request.url,
+            headers=dict(request.headers),
+            content=request.body,
+            timeout=self._get_timeout(timeout),
+        )
+        try:
+            httpx_response = client.send(httpx_request, stream=stream)
+        except httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(e, request=request)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.ReadTimeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+        return self.build_response(request, httpx_response, stream)
+
+    def build_response(self, request, httpx_response, stream=False):
+        """
+        :param request: requests.PreparedRequest object
+        :param httpx_response: httpx.Response object
+        :param stream: Whether the body is not read yet
+        :return: requests.Response object
+        """
+        headers = CaseInsensitiveDict(httpx_response.headers)
+        if stream:
+            response = requests.Response()
+            response.status_code = httpx_response.status_code
+            response.reason = httpx_response.reason_phrase
+            # The body is decoded by httpx
+            if headers.pop("Content-Encoding", None):
+                headers.pop("Content-Length", None)
+            response.headers = headers
+            response.encoding = get_encoding_from_headers(headers)
+            response.url = request.url
+            response.request = request
+            response.connection = self
+            response.raw = HTTP2RawStream(httpx_response)
+        else:
+            response = build_response(
+                request,
+                httpx_response.status_code,
+                headers,
+                httpx_response.content,
+                reason=httpx_response.reason_phrase,
+                encoding=get_encoding_from_headers(headers),
+                connection=self,
+            )
+        if not stream:
+            response.elapsed = httpx_response.elapsed
+        response.http_version = httpx_response.http_version
+        # requests extracts cookies from the http.client message of the raw response
+        message = http.client.HTTPMessage()
+        for name, value in httpx_response.headers.multi_items():
+            message.add_header(name, value)
+        response.raw._original_response = SimpleNamespace(msg=message)
+        extract_cookies_to_jar(response.cookies, request, response.raw)
+        return response
+
+    def close(self):
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+
+class TransportConfig:
+    """
+    Connection pool, keep-alive and timeout settings of the Session transport.
+
+    Adapters are cached per configuration at process level, so every Session
+    created with an equal TransportConfig (AppSession, UISession, UnifiedSession,
+    ActivateBridgeCookies and their subclasses) shares the same per-host
+    connection pools and keeps established TCP/TLS connections alive between calls.
+    """
+
+    _adapters = {}
+    _adapters_lock = threading.Lock()
+
+    def __init__(
+        self,
+        pool_connections=10,
+        pool_maxsize=50,
+        pool_block=False,
+        connect_timeout=30,
+        read_timeout=300,
+        keep_alive=True,
+        keep_alive_idle=60,
+        keep_alive_interval=15,
+        keep_alive_count=4,
+        share_adapters=True,
+        http2=False,
+    ):
+        """
+        :param pool_connections: Number of per-host connection pools to cache
+        :param pool_maxsize: Maximum number of connections kept per host
+        :param pool_block: Block when the host pool is exhausted instead of opening
+            extra non-pooled connections
+        :param connect_timeout: Default connect timeout in seconds (None - no timeout)
+        :param read_timeout: Default read timeout in seconds (None - no timeout)
+        :param keep_alive: Enable TCP keep-alive probes on pooled sockets
+        :param keep_alive_idle: Idle time (in seconds) before the first keep-alive probe
+        :param keep_alive_interval: Interval (in seconds) between keep-alive probes
+        :param keep_alive_count: Failed probes count before the connection is dropped
+        :param share_adapters: Share adapters (and pools) between Sessions with
+            the same configuration
+        :param http2: Use HTTP2Adapter (httpx) multiplexing concurrent requests to
+            a host over HTTP/2 connections instead of urllib3 HTTP/1.1 pools
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keep_alive = keep_alive
+        self.keep_alive_idle = keep_alive_idle
+        self.keep_alive_interval = keep_alive_interval
+        self.keep_alive_count = keep_alive_count
+        self.share_adapters = share_adapters
+        self.http2 = http2
+
+    @property
+    def timeout(self):
+        if self.connect_timeout is None and self.read_timeout is None:
+            return None
+        return self.connect_timeout, self.read_timeout
+
+    @property
+    def socket_options(self):
+        options = list(HTTPConnection.default_socket_options)
+        if not self.keep_alive:
+            return options
+        options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        # Fine-grained keep-alive tuning is not available on every platform
+        for name, value in (
+            ("TCP_KEEPIDLE", self.keep_alive_idle),
+            ("TCP_KEEPINTVL", self.keep_alive_interval),
+            ("TCP_KEEPCNT", self.keep_alive_count),
+        ):
+            if hasattr(socket, name) and value is not None:
+                options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+        return options
+
+    @property
+    def _key(self):
+        return (
+            self.pool_connections,
+            self.pool_maxsize,
+            self.pool_block,
+            self.connect_timeout,
+            self.read_timeout,
+            self.keep_alive,
+            self.keep_alive_idle,
+            self.keep_alive_interval,
+            self.keep_alive_count,
+            self.http2,
+        )
+
+    def _new_adapter(self):
+        if self.http2:
+            return HTTP2Adapter(
+                timeout=self.timeout,
+                max_connections=self.pool_maxsize,
+                keepalive_expiry=self.keep_alive_idle,
+            )
+        return PooledHTTPAdapter(
+            timeout=self.timeout,
+            socket_options=self.socket_options,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+
+    def get_adapter(self):
+        """
+        Get the adapter for this configuration
+        :return: PooledHTTPAdapter or HTTP2Adapter object
+        """
+        if not self.share_adapters:
+            return self._new_adapter()
+        with self._adapters_lock:
+            adapter = self._adapters.get(self._key)
+            if adapter is None:
+                adapter = self._adapters[self._key] = self._new_adapter()
+                LOG.debug(
+                    f"Created pooled HTTP adapter: pool_maxsize={self.pool_maxsize}, "
+                    f"timeout={self.timeout}, http2={self.http2}"
+                )
+            return adapter
+
+    def mount(self, session):
+        """
+        Mount the pooled adapter on both http:// and https:// prefixes of the session
+        :param session: requests.Session object
+        :return: requests.Session object
+        """
+        adapter = self.get_adapter()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def create_session(self):
+        """
+        Create requests.Session with the pooled adapter mounted
+        :return: requests.Session object
+        """
+        return self.mount(requests.Session())
+
+    @classmethod
+    def close_all(cls):
+        """
+        Close all shared adapters and drop their pooled connections
+        """
+        with cls._adapters_lock:
+            for adapter in cls._adapters.values():
+                adapter.close()
+            cls._adapters.clear()
@@ -0,0 +1,103 @@
+"""
+Benchmark of the HTTP/1.1 pooled and HTTP/2 Session transports
+
+Usage: python -m hpe_glcp_automation_lib.libs.authn.user_api.session.core.transport_benchmark \
+    https://<app_api_host>/<path> [requests] [threads] [Authorization header]
+"""
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .session import Session
+from .transport import TransportConfig
+
+
+class ConnectionCounter:
+    """
+    Counts TCP connections opened by the process while active
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+        self._connect = None
+
+    def __enter__(self):
+        self._connect = socket.socket.connect
+        counter = self
+
+        def connect(sock, address):
+            with counter._lock:
+                counter.count += 1
+            return counter._connect(sock, address)
+
+        socket.socket.connect = connect
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        socket.socket.connect = self._connect
+
+
+def benchmark(url, requests=500, threads=20, headers=None, verify=True):
+    """
+    Send the same GET request concurrently via each transport
+    :param url: Request URL
+    :param requests: Number of requests per transport
+    :param threads: Number of concurrent threads
+    :param headers: Request headers (e.g. Authorization)
+    :param verify: TLS verification
+    :return: List of dictionaries (transport, connections, seconds, requests per second,
+        HTTP version)
+    """
+    results = []
+    for name, transport in (
+        ("http/1.1", TransportConfig(pool_maxsize=threads, share_adapters=False)),
+        (
+            "http/2",
+            TransportConfig(pool_maxsize=threads, share_adapters=False, http2=True),
+        ),
+    ):
+        session = Session(transport=transport, metrics=None)
+
+        def call(_):
+            return session.get(
+                url, headers=headers, verify=verify, ignore_handle_response=True
+            )
+
+        with ConnectionCounter() as counter:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(threads) as executor:
+                responses = list(executor.map(call, range(requests)))
+            seconds = time.perf_counter() - start
+        session.session.close()
+        results.append(
+            {
+                "transport": name,
+                "connections": counter.count,
+                "seconds": round(seconds, 3),
+                "rps": round(requests / seconds, 1),
+                "version": getattr(responses[-1], "http_version", "HTTP/1.1"),
+            }
+        )
+    return results
+
+
+def main(argv):
+    url = argv[1]
+    requests = int(argv[2]) if len(argv) > 2 else 500
+    threads = int(argv[3]) if len(argv) > 3 else 20
+    headers = {"Authorization": argv[4]} if len(argv) > 4 else None
+    print(
+        f"{'transport':<12}{'version':<10}{'connections':>12}{'seconds':>10}{'req/s':>10}"
+    )
+    for result in benchmark(url, requests, threads, headers):
+        print(
+            f"{result['transport']:<12}{result['version']:<10}"
+            f"{result['connections']:>12}{result['seconds']:>10}{result['rps']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv)
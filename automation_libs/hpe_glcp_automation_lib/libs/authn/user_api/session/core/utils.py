@@ -0,0 +1,62 @@
+"""
+Core REST Session Utilities
+"""
+import contextlib
+import datetime
+import io
+import os
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+def build_response(
+    request, status_code, headers, content, reason=None, encoding=None, connection=None
+):
+    """
+    Build fully read requests.Response object without network access
+    :param request: requests.PreparedRequest object
+    :param status_code: Response status code
+    :param headers: Response headers
+    :param content: Response body (bytes)
+    :param reason: Response reason phrase
+    :param encoding: Response body encoding
+    :param connection: Adapter object to be set as the response connection
+    :return: requests.Response object
+    """
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = reason
+    response.headers = CaseInsensitiveDict(headers)
+    response.headers.pop("Content-Encoding", None)
+    response.headers.pop("Transfer-Encoding", None)
+    response.headers["Content-Length"] = str(len(content))
+    response.encoding = encoding
+    response.url = request.url
+    response.request = request
+    response.connection = connection
+    response.raw = io.BytesIO(content)
+    response._content = content
+    response._content_consumed = True
+    response.elapsed = datetime.timedelta(0)
+    return response
+
+
+@contextlib.contextmanager
+def file_lock(path):
+    """
+    Exclusive lock shared by the processes of the node (no-op without fcntl)
+    :param path: Path of the lock file (created with 0600 permissions)
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
@@ -0,0 +1,192 @@
+"""
+Condition-based Waiter (poll-until) of the eventually consistent Session flows
+"""
+import logging
+import threading
+import time
+
+from .deadline import get_deadline
+from .deadline import sleep as deadline_sleep
+from .exceptions import WaitTimeoutException
+
+LOG = logging.getLogger(__name__)
+
+
+class WaiterMetrics:
+    """
+    Thread-safe per-name statistics of the waits: polls, time to the condition
+    and timeouts. The smoothed time to the condition (settle time) is used by
+    the adaptive waiters as their first polling interval.
+    """
+
+    def __init__(self, smoothing=0.3):
+        """
+        :param smoothing: Weight of the latest wait in the smoothed settle time
+        """
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._waits = {}
+
+    def record(self, name, polls, elapsed, satisfied):
+        """
+        :param name: Name of the waited condition
+        :param polls: Number of the fetches made
+        :param elapsed: Time in seconds spent waiting
+        :param satisfied: True if the condition was met, False on timeout
+        """
+        with self._lock:
+            entry = self._waits.setdefault(
+                name,
+                {
+                    "waits": 0,
+                    "polls": 0,
+                    "timeouts": 0,
+                    "wait_seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "settle_seconds": None,
+                },
+            )
+            entry["waits"] += 1
+            entry["polls"] += polls
+            entry["wait_seconds"] += elapsed
+            entry["max_seconds"] = max(entry["max_seconds"], elapsed)
+            if not satisfied:
+                entry["timeouts"] += 1
+            elif entry["settle_seconds"] is None:
+                entry["settle_seconds"] = elapsed
+            else:
+                entry["settle_seconds"] += self.smoothing * (
+                    elapsed - entry["settle_seconds"]
+                )
+
+    def get_settle_time(self, name):
+        """
+        :param name: Name of the waited condition
+        :return: Smoothed time in seconds the condition took to be met or None
+        """
+        with self._lock:
+            entry = self._waits.get(name)
+            return entry["settle_seconds"] if entry else None
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                name: {
+                    key: round(value, 3) if isinstance(value, float) else value
+                    for key, value in entry.items()
+                }
+                for name, entry in self._waits.items()
+            }
+
+
+WAITER_METRICS = WaiterMetrics()
+
+
+class Waiter:
+    """
+    Polls a state until a condition on it is met instead of sleeping for a fixed
+    time, e.g. until an updated order is returned with the new values.
+
+    Polling intervals grow exponentially from interval (multiplier, capped by
+    max_interval). An adaptive waiter starts with the smoothed settle time of
+    the previous waits of the same name, so a condition that usually takes
+    ~0.8 seconds is polled once or twice instead of every interval. Waits
+    honor the flow deadline (deadline()) and are recorded in the metrics.
+    """
+
+    def __init__(
+        self,
+        timeout=30,
+        interval=0.25,
+        multiplier=2,
+        max_interval=5,
+        adaptive=True,
+        metrics=WAITER_METRICS,
+    ):
+        """
+        :param timeout: Max time in seconds to wait for the condition
+        :param interval: First polling interval in seconds
+        :param multiplier: Growth factor of the polling interval
+        :param max_interval: Max polling interval in seconds
+        :param adaptive: Start with the settle time learnt from the previous waits
+        :param metrics: WaiterMetrics registry (None - disable recording)
+        """
+        self.timeout = timeout
+        self.interval = interval
+        self.multiplier = multiplier
+        self.max_interval = max_interval
+        self.adaptive = adaptive
+        self.metrics = metrics
+
+    def get_first_interval(self, name):
+        """
+        :param name: Name of the waited condition
+        :return: First polling interval in seconds
+        """
+        settle_time = None
+        if self.adaptive and self.metrics is not None:
+            settle_time = self.metrics.get_settle_time(name)
+        if settle_time is None:
+            return self.interval
+        return min(max(settle_time, self.interval), self.max_interval)
+
+    def until(self, fetch, predicate=bool, name=None, raise_on_timeout=True):
+        """
+        Call fetch() until predicate(state) is true
+        :param fetch: Callable returning the current state (e.g. GET of the order)
+        :param predicate: Callable of the state, true when the condition is met
+        :param name: Name of the condition (metrics, logs and deadline step)
+        :param raise_on_timeout: Raise WaitTimeoutException on timeout
+            (Default: True, False - return the last fetched state)
+        :return: The state the condition was met on (or the last one on timeout)
+        :raises: WaitTimeoutException on timeout,
+            DeadlineExceededException if the flow deadline is exceeded
+        """
+        name = name or getattr(fetch, "__name__", "condition")
+        step = f"wait for {name}"
+        started = time.monotonic()
+        interval = self.get_first_interval(name)
+        polls = 0
+        while True:
+            polls += 1
+            state = fetch()
+            elapsed = time.monotonic() - started
+            if predicate(state):
+                LOG.info(f"Condition '{name}' was met in {elapsed:.2f}s ({polls} polls)")
+                self._record(name, polls, elapsed, True)
+                return state
+            if elapsed >= self.timeout:
+                break
+            deadline = get_deadline()
+            if deadline is not None and deadline.expired():
+                self._record(name, polls, elapsed, False)
+                raise deadline.exceeded(step)
+            deadline_sleep(min(interval, self.timeout - elapsed), step)
+            interval = min(interval * self.multiplier, self.max_interval)
+        self._record(name, polls, elapsed, False)
+        message = f"Condition '{name}' was not met in {self.timeout:g}s ({polls} polls)"
+        if raise_on_timeout:
+            raise WaitTimeoutException(message, state)
+        LOG.warning(message)
+        return state
+
+    def _record(self, name, polls, elapsed, satisfied):
+        if self.metrics is not None:
+            self.metrics.record(name, polls, elapsed, satisfied)
+
+
+def poll_until(fetch, predicate=bool, name=None, raise_on_timeout=True, **kwargs):
+    """
+    Call fetch() until predicate(state) is true, see Waiter
+    :param fetch: Callable returning the current state
+    :param predicate: Callable of the state, true when the condition is met
+    :param name: Name of the condition
+    :param raise_on_timeout: Raise WaitTimeoutException on timeout
+    :param kwargs: Keyword arguments for Waiter (timeout, interval, ...)
+    :return: The state the condition was met on
+    """
+    return Waiter(**kwargs).until(fetch, predicate, name, raise_on_timeout)
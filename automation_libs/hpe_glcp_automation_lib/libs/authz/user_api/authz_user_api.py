@@ -162,9 +162,6 @@ class AuthzUserApi(UISession):
             ignore_handle_response=True,
         )
 
-    def _set_headers(self, headers: Dict) -> None:
-        self.session.headers.update(headers)
-
     def _get_authn_path(self, path: str) -> str:
         base_path = "/authn"
         return f"{base_path}{self.api_version}/{path}"
@@ -182,9 +179,9 @@ class AuthzUserApi(UISession):
         # We have to put this "sleep" due to the credentials' API
         # rate limiting;
         time.sleep(1)
-        self._set_headers({"Content-type": "application/json"})
         return self.post(
             create_credentials_path,
+            headers={"Content-type": "application/json"},
             data=json.dumps(payload),
         )
 
@@ -1146,6 +1146,22 @@ class CCSManagerUserApi(UISession):
             params=params,
         )
 
+    def iter_activate_inventory_csv_rows(self, params=None, as_dict=False):
+        """
+        API method to iterate over activate inventory csv rows without loading
+        the whole export into memory.
+
+        params:
+        :platform_customer_id: str
+        :param as_dict: Yield the rows as dicts keyed by the header row
+        :return: Generator of the exported rows.
+        """
+        return self.stream_csv_rows(
+            url=self._get_path("cm/activate/export/inventory-csv"),
+            as_dict=as_dict,
+            params=params,
+        )
+
     def get_activate_export_allow_list_cli(self, params=None):
         """
         API method to get export allowlist cli
@@ -1204,6 +1220,22 @@ class CCSManagerUserApi(UISession):
             params=params,
         )
 
+    def iter_activate_export_allow_list_csv_rows(self, params, as_dict=False):
+        """
+        API method to iterate over allowlist csv rows without loading the whole
+        export into memory.
+
+        params:
+        :platform_customer_id: str
+        :param as_dict: Yield the rows as dicts keyed by the header row
+        :return: Generator of the exported rows.
+        """
+        return self.stream_csv_rows(
+            url=self._get_path("cm/activate/export/allowlist-csv"),
+            as_dict=as_dict,
+            params=params,
+        )
+
     def get_notification(
         self,
     ):
@@ -1,11 +1,15 @@
-import json
 import logging
-import os
 import time
 
 import urllib3
 
 from hpe_glcp_automation_lib.libs.authn.user_api.session.core.session import Session
+from hpe_glcp_automation_lib.libs.authn.user_api.session.core.token_store import (
+    SharedTokenStore,
+)
+from hpe_glcp_automation_lib.libs.authn.user_api.session.core.topology import (
+    CLUSTER_TOPOLOGY,
+)
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 log = logging.getLogger(__name__)
@@ -31,6 +35,8 @@ class ActivateBridgeCookies(Session):
             retry_timeout (int): The timeout between retries in seconds. Default is 5.
             debug (bool): Flag indicating whether to enable debug mode. Default is True.
             **kwargs: Additional keyword arguments.
+                token_store (SharedTokenStore): Store sharing the login cookies with the
+                    other processes. Default is SharedTokenStore.from_env().
         """
         log.info("Initializing Cookies for api calls")
         super().__init__(
@@ -42,26 +48,13 @@ class ActivateBridgeCookies(Session):
         self.base_url = f"https://{host}"
         self.token_json = None
         self.final_token = None
+        self.token_store = kwargs.get("token_store", SharedTokenStore.from_env())
         self.headers = self.get_token()
 
     @property
     def __client_details(self):
         return self.base_url, self.user, self.password
 
-    @staticmethod
-    def __get_cluster_info_dict():
-        cluster_info_file = "/configmap/data/infra_clusterinfo.json"
-        with open(cluster_info_file) as cluster_info:
-            cluster_info_json = cluster_info.read()
-        return json.loads(cluster_info_json)
-
-    @staticmethod
-    def __get_hostname(hostname):
-        if hostname.startswith("https://"):
-            return hostname
-        else:
-            return f"https://{hostname}"
-
     def __store_current_session(self):
         self.stored_sessions[self.__client_details] = {"token": None, "session": None}
 
@@ -103,43 +96,27 @@ class ActivateBridgeCookies(Session):
 
     def _get_app_api_hostname(self):
         try:
-            if os.getenv("POD_NAMESPACE") is None:
+            if not CLUSTER_TOPOLOGY.in_cluster():
                 log.info(
                     "running in local env, configmap is not available, getting from settings.json"
                 )
-                cluster_config = self.get(f"{self.base_url}/settings.json")
+                cluster_config = self.__get_settings()
                 app_api_hostname = cluster_config["baseUrl"].replace("user", "app_api")
                 return app_api_hostname
             else:
-                cluster_info_dict = self.__get_cluster_info_dict()
-                if "LIST_OF_REGIONS" in cluster_info_dict.get("clusterinfo"):
-                    rw_region = cluster_info_dict.get("clusterinfo", {}).get(
-                        "READ_WRITE_REGION"
-                    )
-                    app_api_hostname = (
-                        cluster_info_dict.get("clusterinfo", {})
-                        .get("HOSTNAMES", {})
-                        .get(rw_region, {})
-                        .get("ccs_activate_v1_device_url", {})
-                    )
-                    return self.__get_hostname(app_api_hostname)
-                else:
-                    app_api_hostname = (
-                        cluster_info_dict.get("clusterinfo", {})
-                        .get("HOSTNAMES", {})
-                        .get("ccs_activate_v1_device_url", {})
-                    )
-                    return self.__get_hostname(app_api_hostname)
+                return CLUSTER_TOPOLOGY.get_topology().get_hostname(
+                    "ccs_activate_v1_device_url"
+                )
         except Exception as e:
             log.error("not able to get LIST_OF_REGIONS {}".format(e))
 
     def _get_secondary_app_api_hostname(self):
         try:
-            if os.getenv("POD_NAMESPACE") is None:
+            if not CLUSTER_TOPOLOGY.in_cluster():
                 log.info(
                     "running in local env, configmap is not available, getting from settings.json"
                 )
-                cluster_config = self.get(f"{self.base_url}/settings.json")
+                cluster_config = self.__get_settings()
                 prefix_base_url = cluster_config["baseUrl"].split(".")
                 prefix_base_url[0] = (
                     cluster_config["baseUrl"].split(".")[0].replace("user", "app_api")
@@ -147,40 +124,37 @@ class ActivateBridgeCookies(Session):
                 )
                 return ".".join(prefix_base_url)
             else:
-                cluster_info_dict = self.__get_cluster_info_dict()
-                if "LIST_OF_REGIONS" in cluster_info_dict.get("clusterinfo"):
-                    if (
-                        len(
-                            (
-                                cluster_info_dict.get("clusterinfo", {}).get(
-                                    "LIST_OF_REGIONS", []
-                                )
-                            )
-                        )
-                    ) > 1:
-                        all_regions = cluster_info_dict.get("clusterinfo", {}).get(
-                            "LIST_OF_REGIONS", {}
-                        )
-                        region1 = all_regions[0]
-                        region2 = all_regions[1]
-                        rw_region = cluster_info_dict.get("clusterinfo", {}).get(
-                            "READ_WRITE_REGION", {}
-                        )
-                        if rw_region == region1:
-                            ro_region = region2
-                        else:
-                            ro_region = region1
-                        secondary_app_api_hostname = (
-                            cluster_info_dict.get("clusterinfo", {})
-                            .get("HOSTNAMES", {})
-                            .get(ro_region, {})
-                            .get("ccs_activate_v1_device_url", {})
-                        )
-                        return self.__get_hostname(secondary_app_api_hostname)
+                topology = CLUSTER_TOPOLOGY.get_topology()
+                if topology.multi_region:
+                    return topology.get_hostname(
+                        "ccs_activate_v1_device_url", readonly=True
+                    )
                 return None
         except Exception as e:
             log.error("not able to get LIST_OF_REGIONS {}".format(e))
 
+    def __get_settings(self):
+        return CLUSTER_TOPOLOGY.get_settings(
+            self.base_url, lambda: self.get(f"{self.base_url}/settings.json")
+        )
+
+    def __login(self):
+        """
+        Log in with the user credentials
+        :return: Dictionary of the login cookies or None
+        """
+        data = {"credential_0": self.user, "credential_1": self.password}
+
+        response = self.post(
+            f"https://{self.host}/LOGIN",
+            data=data,
+            ignore_handle_response=True,
+            verify=False,
+        )
+        if response.status_code == 200:
+            return response.cookies.get_dict()
+        return None
+
     def get_token(self, set_auth_header=True):
         """Generates the token info from the sso
         :param set_auth_header: set or not value to object's Authorization header
@@ -191,21 +165,17 @@ class ActivateBridgeCookies(Session):
         if self.__client_details in self.stored_sessions:
             self.__reuse_session(self.__client_details)
         else:
-            data = {"credential_0": self.user, "credential_1": self.password}
-
-            response = self.post(
-                f"https://{self.host}/LOGIN",
-                data=data,
-                ignore_handle_response=True,
-                verify=False,
-            )
-            if response.status_code == 200:
-                self.token_json = response.cookies.get_dict()
-                if set_auth_header:
-                    self.__set_headers()
-                self.__store_current_session()
+            if self.token_store is not None:
+                self.token_json = self.token_store.get_or_fetch(
+                    self.__client_details, self.__login
+                )
             else:
+                self.token_json = self.__login()
+            if self.token_json is None:
                 return None
+            if set_auth_header:
+                self.__set_headers()
+            self.__store_current_session()
 
         return self.stored_sessions[self.__client_details]["token"]
 
@@ -221,6 +191,8 @@ class ActivateBridgeCookies(Session):
         )  # ?
 
         if int(time.time()) - token_refresh_timestamp > 300:
+            if self.token_store is not None and self.token_json is not None:
+                self.token_store.invalidate(self.__client_details, self.token_json)
             self.__purge_current_session()
             return self.get_token()
         else:
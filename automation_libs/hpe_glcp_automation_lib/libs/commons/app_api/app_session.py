@@ -1,12 +1,19 @@
 """
 CCS APP API Session Library
 """
-import json
 import logging
-import os
 import time
 
 from hpe_glcp_automation_lib.libs.authn.user_api.session.core.session import Session
+from hpe_glcp_automation_lib.libs.authn.user_api.session.core.token_refresh import (
+    DEFAULT_TOKEN_REFRESHER,
+)
+from hpe_glcp_automation_lib.libs.authn.user_api.session.core.token_store import (
+    SharedTokenStore,
+)
+from hpe_glcp_automation_lib.libs.authn.user_api.session.core.topology import (
+    CLUSTER_TOPOLOGY,
+)
 
 log = logging.getLogger(__name__)
 
@@ -40,8 +47,13 @@ class AppSession(Session):
         :param retry_timeout: Timeout between the retries (in seconds)
         :param debug: Enable/Disable Debug logging of HTTP Requests/Responses
         :param kwargs: additional arguments for Session class
+            :token_refresher: TokenRefresher renewing the token ahead of its expiry
+                (Default: DEFAULT_TOKEN_REFRESHER, None - refresh on 401 only)
+            :token_store: SharedTokenStore sharing the token with the other processes
+                (Default: SharedTokenStore.from_env(), None - per process only)
         """
         log.info("Initializing app_session for user api calls")
+        kwargs.setdefault("token_refresher", DEFAULT_TOKEN_REFRESHER)
         super().__init__(
             max_retries=max_retries, retry_timeout=retry_timeout, debug=debug, **kwargs
         )
@@ -51,7 +63,10 @@ class AppSession(Session):
         self.scope = scope
         self.base_url = f"https://{app_api_host}"
         self.token_json = None
+        self.token_store = kwargs.get("token_store", SharedTokenStore.from_env())
         self.get_token()
+        if self.token_refresher is not None:
+            self.token_refresher.watch(self)
 
     @property
     def __client_details(self):
@@ -63,20 +78,6 @@ class AppSession(Session):
             self.scope,
         )
 
-    @staticmethod
-    def __get_cluster_info_dict():
-        cluster_info_file = "/configmap/data/infra_clusterinfo.json"
-        with open(cluster_info_file) as cluster_info:
-            cluster_info_json = cluster_info.read()
-        return json.loads(cluster_info_json)
-
-    @staticmethod
-    def __get_hostname(hostname):
-        if hostname.startswith("https://"):
-            return hostname
-        else:
-            return f"https://{hostname}"
-
     def __store_current_session(self):
         self.stored_sessions[self.__client_details] = {"token": None, "session": None}
         self.stored_sessions[self.__client_details]["token"] = self.token_json
@@ -116,33 +117,19 @@ class AppSession(Session):
 
     def _get_app_api_hostname(self):
         try:
-            if os.getenv("POD_NAMESPACE") is None:
+            if not CLUSTER_TOPOLOGY.in_cluster():
                 log.info(
                     "running in local env, configmap is not available, getting from settings.json"
                 )
-                cluster_config = self.get(f"{self.base_url}/settings.json")
+                cluster_config = CLUSTER_TOPOLOGY.get_settings(
+                    self.base_url, lambda: self.get(f"{self.base_url}/settings.json")
+                )
                 app_api_hostname = cluster_config["baseUrl"].replace("user", "app_api")
                 return app_api_hostname
             else:
-                cluster_info_dict = self.__get_cluster_info_dict()
-                if "LIST_OF_REGIONS" in cluster_info_dict.get("clusterinfo"):
-                    rw_region = cluster_info_dict.get("clusterinfo", {}).get(
-                        "READ_WRITE_REGION"
-                    )
-                    app_api_hostname = (
-                        cluster_info_dict.get("clusterinfo", {})
-                        .get("HOSTNAMES", {})
-                        .get(rw_region, {})
-                        .get("ccs_app_api_hostname", {})
-                    )
-                    return self.__get_hostname(app_api_hostname)
-                else:
-                    app_api_hostname = (
-                        cluster_info_dict.get("clusterinfo", {})
-                        .get("HOSTNAMES", {})
-                        .get("ccs_app_api_hostname", {})
-                    )
-                    return self.__get_hostname(app_api_hostname)
+                return CLUSTER_TOPOLOGY.get_topology().get_hostname(
+                    "ccs_app_api_hostname"
+                )
         except Exception as e:
             log.error("not able to get LIST_OF_REGIONS {}".format(e))
 
@@ -159,6 +146,28 @@ class AppSession(Session):
         except Exception:
             log.error("not able get app api url")
 
+    def __fetch_token(self):
+        """
+        Perform the client_credentials grant
+        :return: Token json or None
+        """
+        data = {
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "grant_type": "client_credentials",
+            "scope": self.scope,
+        }
+        # Token requests must not trigger the proactive refresh of the old token
+        with self._token_refresh_suspended():
+            response = self.post(
+                f"https://{self.sso_host}/as/token.oauth2",
+                data=data,
+                ignore_handle_response=True,
+            )
+        if response.status_code == 200:
+            return response.json()
+        return None
+
     def get_token(self, set_auth_header=True):
         """Generates the token info from the sso
         :param set_auth_header: set or not value to object's Authorization header
@@ -168,29 +177,31 @@ class AppSession(Session):
         if self.__client_details in self.stored_sessions:
             self.__reuse_session(self.__client_details)
         else:
-            data = {
-                "client_id": self.client_id,
-                "client_secret": self.client_secret,
-                "grant_type": "client_credentials",
-                "scope": self.scope,
-            }
-            response = self.post(
-                f"https://{self.sso_host}/as/token.oauth2",
-                data=data,
-                ignore_handle_response=True,
-            )
-            if response.status_code == 200:
-                self.token_json = response.json()
-                if set_auth_header:
-                    self.__set_headers()
-                self.__store_current_session()
+            if self.token_store is not None:
+                self.token_json = self.token_store.get_or_fetch(
+                    self.__client_details, self.__fetch_token
+                )
             else:
+                self.token_json = self.__fetch_token()
+            if self.token_json is None:
                 return None
+            if set_auth_header:
+                self.__set_headers()
+            self.__store_current_session()
         return self.stored_sessions[self.__client_details]["token"]["access_token"]
 
-    def refresh_token(self):
+    def _get_token_key(self):
+        return self.__client_details
+
+    def _get_token_json(self):
+        session_stored = self.stored_sessions.get(self.__client_details)
+        return session_stored["token"] if session_stored else self.token_json
+
+    def refresh_token(self, force=False):
         """
         Refresh the token info from the authenticated session
+        :param force: Refresh even if the token was refreshed less than 300 seconds ago
+            (proactive refresh ahead of the token expiry)
         :return: Boolean (True or False)
         """
 
@@ -199,9 +210,13 @@ class AppSession(Session):
             session_stored["token_refresh_timestamp"] if session_stored else 0
         )
 
-        if int(time.time()) - token_refresh_timestamp > 300:
+        if force or int(time.time()) - token_refresh_timestamp > 300:
+            if self.token_store is not None:
+                self.token_store.invalidate(self.__client_details, self._get_token_json())
             self.__purge_current_session()
-            return self.get_token()
+            # Direct callers (tests, AsyncSession) too, not only the 401 handler
+            with self._token_refresh_suspended():
+                return self.get_token()
         else:
             log.warning("Refresh token requested too frequently. Possible error")
             return False
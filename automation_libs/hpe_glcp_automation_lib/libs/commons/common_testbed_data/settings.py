@@ -7,6 +7,10 @@ from logging import DEBUG
 import ldclient
 from ldclient.config import Config
 
+from hpe_glcp_automation_lib.libs.authn.user_api.session.core.topology import (  # noqa: F401
+    CLUSTER_INFO_FILE,
+    CLUSTER_TOPOLOGY,
+)
 from hpe_glcp_automation_lib.libs.commons.utils.s3.s3_download import download_file
 
 log = logging.getLogger(__name__)
@@ -20,8 +24,6 @@ Settings.get_device_urls: Used for device provisioning test cases,
 test bed specific urls for devices are in test case repository
 """
 
-CLUSTER_INFO_FILE = "/configmap/data/infra_clusterinfo.json"
-
 all_envs = {
     "mira": {
         "login_page": "https://mira.ccs.arubathena.com",
@@ -389,9 +391,7 @@ class Settings:
         return f"{self.login_page_url}home"
 
     def _get_cluster_info_dict(self):
-        with open(CLUSTER_INFO_FILE) as cluster_info:
-            cluster_info_json = cluster_info.read()
-        return json.loads(cluster_info_json)
+        return CLUSTER_TOPOLOGY.get_cluster_info()
 
     def get_humio_url(self):
         humio_url = None
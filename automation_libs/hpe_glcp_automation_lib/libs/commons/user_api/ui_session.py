@@ -1,7 +1,6 @@
 import base64
 import codecs
 import hashlib
-import json
 import logging
 import os
 import random
@@ -13,12 +12,34 @@ from hpe_glcp_automation_lib.libs.authn.user_api.session.core.exceptions import
     TokenRefreshException,
 )
 from hpe_glcp_automation_lib.libs.authn.user_api.session.core.session import Session
+from hpe_glcp_automation_lib.libs.authn.user_api.session.core.snapshot import (
+    LoginSnapshotStore,
+    dump_cookies,
+    load_cookies,
+)
+from hpe_glcp_automation_lib.libs.authn.user_api.session.core.token_refresh import (
+    DEFAULT_TOKEN_REFRESHER,
+)
+from hpe_glcp_automation_lib.libs.authn.user_api.session.core.topology import (
+    CLUSTER_TOPOLOGY,
+)
 from hpe_glcp_automation_lib.libs.authn.user_api.session.ui.login_factory import (
     CCSLoginFactory,
 )
 
 log = logging.getLogger(__name__)
 
+# UISession state restored from the login snapshots besides the cookies
+SNAPSHOT_ATTRS = (
+    "token_json",
+    "cluster_config",
+    "sso_host",
+    "base_url",
+    "domain_name",
+    "redirect_uri",
+    "secondary_base_url",
+)
+
 
 class UISession(Session):
     """
@@ -48,9 +69,15 @@ class UISession(Session):
         :param debug: Enable/Disable Debug logging of HTTP Requests/Responses
         :param login_type: login type of okta-authentication; should be one of "okta_mfa", "okta_sso", "okta"
         :param kwargs: additional arguments for Session class
+            :token_refresher: TokenRefresher renewing the token ahead of its expiry
+                (Default: DEFAULT_TOKEN_REFRESHER, None - refresh on 401 only)
+            :snapshot_store: LoginSnapshotStore to warm-start the session from instead
+                of the interactive login (Default: LoginSnapshotStore.from_env(),
+                None - always log in)
 
         """
         log.info("Initializing ui_session for user api calls")
+        kwargs.setdefault("token_refresher", DEFAULT_TOKEN_REFRESHER)
         super().__init__(
             max_retries=max_retries, retry_timeout=retry_timeout, debug=debug, **kwargs
         )
@@ -60,15 +87,19 @@ class UISession(Session):
         self.pcid = pcid
         self.login_type = login_type
         self.token_json = None
-        self.cluster_config = self.get_settings()
-        self.sso_host = self.cluster_config["authorityURL"]
-        self.base_url = self._get_user_api_hostname()
-        self.domain_name = self.base_url.split("https://")[-1]
-        self.redirect_uri = self.host + "/authentication/callback"
-        self.secondary_base_url = self._get_secondary_user_api_hostname()
         self.kwargs = kwargs
-        self.login()
+        self.snapshot_store = kwargs.get("snapshot_store", LoginSnapshotStore.from_env())
+        if not self.restore_snapshot():
+            self.cluster_config = self.get_settings()
+            self.sso_host = self.cluster_config["authorityURL"]
+            self.base_url = self._get_user_api_hostname()
+            self.domain_name = self.base_url.split("https://")[-1]
+            self.redirect_uri = self.host + "/authentication/callback"
+            self.secondary_base_url = self._get_secondary_user_api_hostname()
+            self.login()
         self.load_account(pcid)
+        if self.token_refresher is not None:
+            self.token_refresher.watch(self)
 
     @staticmethod
     def _generate_random_hexstring(length):
@@ -183,71 +214,36 @@ class UISession(Session):
 
     def _get_current_setup(self):
         try:
-            if os.getenv("POD_NAMESPACE") is None:
+            if not CLUSTER_TOPOLOGY.in_cluster():
                 log.info("running in local env, configmap is not available")
                 return None
             else:
-                cluster_info_dict = self._get_cluster_info_dict()
-                return cluster_info_dict.get("clusterinfo", {}).get("SETUP", {})
+                return dict(CLUSTER_TOPOLOGY.get_topology().setup)
         except Exception as e:
             log.error("not able to get LIST_OF_REGIONS {}".format(e))
 
     def _get_multi_region_flag(self):
         try:
-            if os.getenv("POD_NAMESPACE") is None:
+            if not CLUSTER_TOPOLOGY.in_cluster():
                 log.info("running in local env, configmap is not available")
                 return False
             else:
-                cluster_info_dict = self._get_cluster_info_dict()
-                if "LIST_OF_REGIONS" in cluster_info_dict.get("clusterinfo"):
-                    if (
-                        len(
-                            (
-                                cluster_info_dict.get("clusterinfo", {}).get(
-                                    "LIST_OF_REGIONS", []
-                                )
-                            )
-                        )
-                    ) > 1:
-                        all_regions = cluster_info_dict.get("clusterinfo", {}).get(
-                            "LIST_OF_REGIONS", {}
-                        )
-                        log.info("list of regions: {}".format(all_regions))
-                        return True
-                    else:
-                        log.info("list of regions is not more than one")
-                        return False
+                topology = CLUSTER_TOPOLOGY.get_topology()
+                if topology.multi_region:
+                    log.info("list of regions: {}".format(list(topology.regions)))
                 else:
                     log.info("multi region is not enabled")
-                    return False
+                return topology.multi_region
         except Exception as e:
             log.error("not able to get LIST_OF_REGIONS {}".format(e))
 
     def _get_ui_hostname(self):
         try:
-            if os.getenv("POD_NAMESPACE") is None:
+            if not CLUSTER_TOPOLOGY.in_cluster():
                 log.info("running in local env, configmap is not available")
                 return False
             else:
-                cluster_info_dict = self._get_cluster_info_dict()
-                if "LIST_OF_REGIONS" in cluster_info_dict.get("clusterinfo"):
-                    rw_region = cluster_info_dict.get("clusterinfo", {}).get(
-                        "READ_WRITE_REGION"
-                    )
-                    ui_hostname = (
-                        cluster_info_dict.get("clusterinfo", {})
-                        .get("HOSTNAMES", {})
-                        .get(rw_region, {})
-                        .get("ccs_ui_hostname", {})
-                    )
-                    return self.ret_hostname(ui_hostname)
-                else:
-                    ui_hostname = (
-                        cluster_info_dict.get("clusterinfo", {})
-                        .get("HOSTNAMES", {})
-                        .get("ccs_ui_hostname", {})
-                    )
-                    return self.ret_hostname(ui_hostname)
+                return CLUSTER_TOPOLOGY.get_topology().get_hostname("ccs_ui_hostname")
         except Exception as e:
             log.error("not able to get LIST_OF_REGIONS {}".format(e))
 
@@ -259,35 +255,15 @@ class UISession(Session):
 
     def _get_user_api_hostname(self):
         try:
-            if os.getenv("POD_NAMESPACE") is None:
+            if not CLUSTER_TOPOLOGY.in_cluster():
                 log.info(
                     "running in local env, configmap is not avalaible, getting from settings.json"
                 )
-                if "disconnected" in os.getenv("CURRENT_ENV", ""):
-                    cluster_config = self.get(self.host + "/settings.json", verify=False)
-                else:
-                    cluster_config = self.get(self.host + "/settings.json")
-                return cluster_config["baseUrl"]
+                return self.get_settings()["baseUrl"]
             else:
-                cluster_info_dict = self._get_cluster_info_dict()
-                if "LIST_OF_REGIONS" in cluster_info_dict.get("clusterinfo"):
-                    rw_region = cluster_info_dict.get("clusterinfo", {}).get(
-                        "READ_WRITE_REGION"
-                    )
-                    user_api_hostname = (
-                        cluster_info_dict.get("clusterinfo", {})
-                        .get("HOSTNAMES", {})
-                        .get(rw_region, {})
-                        .get("ccs_user_api_hostname", {})
-                    )
-                    return self.ret_hostname(user_api_hostname)
-                else:
-                    user_api_hostname = (
-                        cluster_info_dict.get("clusterinfo", {})
-                        .get("HOSTNAMES", {})
-                        .get("ccs_user_api_hostname", {})
-                    )
-                    return self.ret_hostname(user_api_hostname)
+                return CLUSTER_TOPOLOGY.get_topology().get_hostname(
+                    "ccs_user_api_hostname"
+                )
         except Exception as e:
             log.error("not able to get LIST_OF_REGIONS {}".format(e))
 
@@ -297,23 +273,64 @@ class UISession(Session):
         """
         try:
             log.info("getting read only url derived from settings.json")
-            cluster_config = self.get(self.host + "/settings.json")
-            prefix_base_url = cluster_config["baseUrl"].split(".")
-            prefix_base_url[0] = prefix_base_url[0] + "-r"
-            return ".".join(prefix_base_url)
+            return self._get_secondary_url(self.get_settings()["baseUrl"])
         except Exception as e:
             log.error("not able to get read only url {}".format(e))
 
     @staticmethod
     def _get_cluster_info_dict():
-        cluster_info_file = "/configmap/data/infra_clusterinfo.json"
-        with open(cluster_info_file) as cluster_info:
-            cluster_info_json = cluster_info.read()
-        return json.loads(cluster_info_json)
+        return CLUSTER_TOPOLOGY.get_cluster_info()
+
+    def _get_token_key(self):
+        return self.host, self.user, self.password
+
+    def save_snapshot(self):
+        """
+        Save the logged-in session state (cookies, tokens, cluster settings) to the
+        encrypted login snapshot
+        """
+        if self.snapshot_store is None:
+            return
+        snapshot = {attr: getattr(self, attr) for attr in SNAPSHOT_ATTRS}
+        snapshot["cookies"] = dump_cookies(self.session.cookies)
+        self.snapshot_store.save(self._get_token_key(), snapshot)
 
-    def refresh_token(self):
+    def restore_snapshot(self):
+        """
+        Warm-start the session from the login snapshot, validated by refreshing
+        its token (the snapshot is deleted if the refresh fails)
+        :return: True if the session was restored
+        """
+        user_details = self._get_token_key()
+        if self.snapshot_store is None or user_details in self.stored_sessions:
+            return False
+        # Refresh tokens may rotate, so the workers restore the snapshot one by one
+        with self.snapshot_store.locked(user_details):
+            snapshot = self.snapshot_store.load(user_details)
+            if snapshot is None:
+                return False
+            for attr in SNAPSHOT_ATTRS:
+                setattr(self, attr, snapshot[attr])
+            load_cookies(self.session.cookies, snapshot["cookies"])
+            try:
+                self._refresh_token_directly()
+            except Exception as e:
+                log.warning(f"Login snapshot for {self.user} is not valid anymore: {e}")
+                self.session.cookies.clear()
+                self.token_json = None
+                return False
+        log.info(f"User API session for {self.user} was restored from the login snapshot")
+        return True
+
+    def _get_token_json(self):
+        session_stored = self.stored_sessions.get(self._get_token_key())
+        return session_stored["token"] if session_stored else self.token_json
+
+    def refresh_token(self, force=False):
         """
         Refresh the token info from the authenticated session
+        :param force: Unused, the refresh_token grant is never throttled
+            (kept for the proactive refresh ahead of the token expiry)
         :return: Boolean status (True/False)
         """
         if not self.token_json:
@@ -324,17 +341,25 @@ class UISession(Session):
             "refresh_token": self.token_json["refresh_token"],
         }
         log.debug("Refreshing the token")
-        # Work-around to get the refresh token in the PF cluster setup
-        for i in range(3):
-            try:
-                self.token_json = self.post(self.sso_host + "/as/token.oauth2", data=data)
-                break
-            except:
-                pass
-        else:
-            raise TokenRefreshException("Could not refresh the token")
+        # The refresh_token grant must not trigger the proactive refresh itself
+        with self._token_refresh_suspended():
+            # Work-around to get the refresh token in the PF cluster setup
+            for i in range(3):
+                try:
+                    self.token_json = self.post(
+                        self.sso_host + "/as/token.oauth2", data=data
+                    )
+                    break
+                except:
+                    pass
+            else:
+                if self.snapshot_store is not None:
+                    self.snapshot_store.delete(self._get_token_key())
+                raise TokenRefreshException("Could not refresh the token")
         self.__set_headers()
         self.__store_current_session()
+        # The refresh token may rotate
+        self.save_snapshot()
         return True
 
     def load_account(self, pcid):
@@ -342,12 +367,18 @@ class UISession(Session):
             self.pcid = pcid
             return self.__load_account()
 
-    def get_settings(self):
+    def __fetch_settings(self):
         if "disconnected" in os.getenv("CURRENT_ENV", ""):
             return self.get(self.host + "/settings.json", verify=False)
         else:
             return self.get(self.host + "/settings.json")
 
+    def get_settings(self):
+        """
+        :return: settings.json of the UI host, fetched once per host in the process
+        """
+        return CLUSTER_TOPOLOGY.get_settings(self.host, self.__fetch_settings)
+
     @staticmethod
     def ret_hostname(hostname):
         if hostname.startswith("https://"):
@@ -400,6 +431,7 @@ class UISession(Session):
             self.__set_headers()
             self.__get_session()
             self.__store_current_session()
+            self.save_snapshot()
             log.info("Successfully logged into CCS")
 
     def logout(self):
@@ -409,4 +441,6 @@ class UISession(Session):
         """
         self.session.get(self.base_url + "/authn/v1/session/end-session")
         self.__purge_current_session()
+        if self.snapshot_store is not None:
+            self.snapshot_store.delete(self._get_token_key())
         log.info("Logged-out of CCS successfully")
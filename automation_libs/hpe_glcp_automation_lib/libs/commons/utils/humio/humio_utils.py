@@ -1,10 +1,14 @@
 import json
 import logging
 import re
+import string
 import time
+from collections import OrderedDict
 
 from humiolib.HumioClient import HumioClient
 
+from hpe_glcp_automation_lib.libs.authn.user_api.session.core.waiter import Waiter
+
 log = logging.getLogger(__name__)
 
 
@@ -71,6 +75,153 @@ class HumioClass:
             log.error(f"not able to get the query result: {e}")
 
 
+# Characters no JSON encoder escapes (Go escapes <, > and &, some encoders /)
+JSON_SAFE_CHARACTERS = frozenset(
+    string.ascii_letters + string.digits + " -_.,:;=()[]{}!?#$%*+@|~^"
+)
+
+
+def _may_contain(raw_log, text):
+    """
+    Cheap check of the raw (JSON encoded) log before parsing it
+    :param raw_log: Raw "log" field of the event
+    :param text: Text searched in the parsed log
+    :return: False if the parsed log can not contain the text
+    """
+    if not isinstance(raw_log, str):
+        return True
+    if not JSON_SAFE_CHARACTERS.issuperset(text):
+        # The raw log may have the text escaped, parse it
+        return True
+    return text in raw_log
+
+
+def _parse_log(event, key):
+    """
+    Parse the "log" field of the event, nested "log" (docker json-file) included
+    :param event: Humio event
+    :param key: Key the parsed log has to have, e.g. "message"
+    :return: Dictionary of the parsed log or None
+    """
+    try:
+        json_log = json.loads(event["log"])
+        if key not in json_log.keys():
+            json_log = json.loads(json_log["log"])
+            if key not in json_log.keys():
+                log.info(f"unable to find {key} key")
+                return None
+    except Exception:
+        log.info("Error : Json Decode error")
+        return None
+    return json_log
+
+
+class HumioEventPoller:
+    """
+    Incremental polling of the events of a Humio query.
+
+    The first poll searches the last search_duration_in_ms, the next ones only the
+    time slice after the previous poll (high-water mark) plus ingest_lag_ms for the
+    events ingested late. Events already returned are skipped by their ID (bounded
+    set of the last max_seen IDs), so each event is returned (and parsed) once.
+    example:
+        poller = HumioEventPoller(humio_session, '"serialNumber=BE0246695"')
+        event = poller.find(lambda events: events[0] if events else None, timeout=10000)
+    """
+
+    def __init__(
+        self,
+        humio_session,
+        query,
+        search_duration_in_ms=3600000,
+        ingest_lag_ms=30000,
+        max_seen=10000,
+    ):
+        """
+        :param humio_session: HumioClass object
+        :param query: Humio query
+        :param search_duration_in_ms: Time range of the first poll
+        :param ingest_lag_ms: Overlap of the polls for the events ingested late
+        :param max_seen: Number of the event IDs remembered to skip the overlap
+        """
+        self.humio_session = humio_session
+        self.query = query
+        self.search_duration_in_ms = search_duration_in_ms
+        self.ingest_lag_ms = ingest_lag_ms
+        self.max_seen = max_seen
+        self.high_water = None
+        self.polls = 0
+        self._started = int(time.time() * 1000.0)
+        self._seen = OrderedDict()
+
+    @staticmethod
+    def _get_event_id(event):
+        event_id = event.get("@id")
+        if event_id is None:
+            event_id = (
+                event.get("@timestamp"),
+                event.get("@rawstring", event.get("log")),
+            )
+        return event_id
+
+    def _is_new(self, event):
+        event_id = self._get_event_id(event)
+        if event_id in self._seen:
+            return False
+        self._seen[event_id] = None
+        if len(self._seen) > self.max_seen:
+            self._seen.popitem(last=False)
+        return True
+
+    def poll(self):
+        """
+        Query the time slice after the previous poll
+        :return: List of the events not returned by the previous polls
+        """
+        end = int(time.time() * 1000.0)
+        if self.high_water is None:
+            start = self._started - self.search_duration_in_ms
+        else:
+            start = max(
+                self._started - self.search_duration_in_ms,
+                self.high_water - self.ingest_lag_ms,
+            )
+        result = self.humio_session.create_queryjob(
+            self.query, start=start, end=end, is_live=False
+        )
+        self.polls += 1
+        if result is None:
+            # Query job failed, the time slice is queried again by the next poll
+            return []
+        self.high_water = end
+        events = [event for event in result if self._is_new(event)]
+        log.debug(f"{len(events)} new of {len(result)} events in [{start}, {end}]")
+        return events
+
+    def find(self, match, timeout=10000, interval=1, name=None):
+        """
+        Poll the new events until match(events) returns not None
+        :param match: Callable of the list of new events returning the match or None
+        :param timeout: Timeout in ms
+        :param interval: Time in seconds between the polls
+        :param name: Name of the wait (Waiter metrics)
+        :return: Result of match() or None on timeout
+        """
+        waiter = Waiter(
+            timeout=timeout / 1000.0,
+            interval=interval,
+            multiplier=1,
+            max_interval=interval,
+            adaptive=False,
+        )
+        return waiter.until(
+            lambda: match(self.poll()),
+            lambda found: found is not None,
+            name=name or "humio_event",
+            raise_on_timeout=False,
+        )
+
+
 class HumioHelper:
     @staticmethod
     def get_last_event_transaction_id(
@@ -89,30 +240,17 @@ class HumioHelper:
         :param: timeout for the method
         :return: transaction_id if found in log message or None otherwise
         """
-        epoch_time = int(time.time() * 1000.0)
-        current_time = int(time.time() * 1000.0)
-        timeout_time = current_time + timeout
-        while current_time < timeout_time:
-            result = humio_session.create_queryjob(
-                search_query,
-                start=epoch_time - search_duration_in_ms,
-                end=epoch_time,
-                is_live=False,
-            )
-            if result:
-                try:
-                    json_log = json.loads(result[0]["log"])
-                    if "message" not in json_log.keys():
-                        json_log = json.loads(json_log["log"])
-                        if "message" not in json_log.keys():
-                            log.info("unable to find message key")
-                            continue
-                except Exception:
-                    log.info("Error : Json Decode error")
+
+        def match(events):
+            events = sorted(events, key=lambda e: e.get("@timestamp") or 0, reverse=True)
+            for event in events:
+                if not _may_contain(event.get("log"), "transactionId:"):
+                    continue
+                json_log = _parse_log(event, "message")
+                if json_log is None:
                     continue
-                msg = json_log["message"]
-                match_id = re.search("(?<=transactionId:)(.*)", msg)
-                if match_id == None:
+                match_id = re.search("(?<=transactionId:)(.*)", json_log["message"])
+                if match_id is None:
                     continue
                 transaction_id = match_id.group(1)[:-1]
                 if transaction_id:
@@ -120,8 +258,10 @@ class HumioHelper:
                         f"Found logs in humio with transaction_id: '{transaction_id}'"
                     )
                     return transaction_id
-            time.sleep(1)
-            current_time = int(time.time() * 1000.0)
+            return None
+
+        poller = HumioEventPoller(humio_session, search_query, search_duration_in_ms)
+        return poller.find(match, timeout, name="humio_transaction_id")
 
     @staticmethod
     def event_with_transaction_id_exists(
@@ -148,32 +288,24 @@ class HumioHelper:
         :return: boolean
         """
         log.info(f"Searching for logs in humio for transaction_id: '{transaction_id}'.")
-        epoch_time = int(time.time() * 1000.0)
-        current_time = int(time.time() * 1000.0)
-        timeout_time = current_time + timeout
-        while current_time < timeout_time:
-            result = humio_session.create_queryjob(
-                transaction_id,
-                start=epoch_time - search_duration_in_ms,
-                end=current_time,
-                is_live=False,
-            )
-            for event in result:
-                try:
-                    json_obj = json.loads(event["log"])
-                    if "service_name" not in json_obj.keys():
-                        json_obj = json.loads(json_obj["log"])
-                        if "service_name" not in json_obj.keys():
-                            log.info("unable to find service_name key")
-                            continue
-                except Exception:
-                    log.info("Error : Json Decode error")
+        log.info(f"Searching for log string: '{result_search_str}'.")
+
+        def match(events):
+            for event in events:
+                raw_log = event.get("log")
+                if not (
+                    _may_contain(raw_log, service_name)
+                    and _may_contain(raw_log, result_search_str)
+                ):
+                    continue
+                json_obj = _parse_log(event, "service_name")
+                if json_obj is None:
                     continue
                 log.info(event["log"])
-                log.info(f"Searching for log string: '{result_search_str}'.")
                 if json_obj["service_name"] == service_name:
-                    if result_search_str in json_obj["message"]:
+                    if result_search_str in json_obj.get("message", ""):
                         return True
-            time.sleep(1)
-            current_time = int(time.time() * 1000.0)
-        return False
+            return None
+
+        poller = HumioEventPoller(humio_session, transaction_id, search_duration_in_ms)
+        return bool(poller.find(match, timeout, name="humio_transaction_event"))
@@ -97,6 +97,97 @@ class InventoryNBAPIDevices(AppSession):
             NBAPIHelpers.print_req_response_info(res, log)
         return res
 
+    def iter_devices(
+        self,
+        limit=None,
+        offset=None,
+        filter_query=None,
+        filter_tags=None,
+        sort=None,
+        select=None,
+    ):
+        """
+        Iterate over the device details of the claimed devices of the platform customer account,
+        parsing the "items" of the response incrementally instead of loading the whole page
+        (up to 2000 devices) into memory.
+        :param limit: paging query param, specifies the count limit of the returned devices
+        :param offset: paging query param, specifies the offset of the returned devices
+        :param filter_query: filtering query param, filters by specific fields with OData 4.0 query syntax (except tags)
+        :param filter_tags: filtering query param, filters by tag-related fields with OData 4.0 query syntax
+        :param sort: sorting query param, specifies the field name to sort against and the sort direction
+        :param select: filtering query param, selects specific field names to display as returned result
+        :return: generator of device details of the claimed devices of the requested platform customer.
+        """
+        end_point = "/devices"
+        url = f"{self.devices_url}{end_point}"
+        log.info("Performing streamed GET devices request to URL: {}".format(url))
+
+        qparam = {}
+        if limit is not None:
+            qparam["limit"] = limit
+        if offset is not None:
+            qparam["offset"] = offset
+        if filter_query:
+            qparam["filter"] = filter_query
+        if filter_tags:
+            qparam["filter-tags"] = filter_tags
+        if sort:
+            qparam["sort"] = sort
+        if select:
+            qparam["select"] = select
+
+        log.info("Request query params: {}".format(qparam))
+        return self.stream_json_items(url=url, key="items", params=qparam)
+
+    def iter_all_devices(
+        self,
+        limit=2000,
+        filter_query=None,
+        filter_tags=None,
+        sort=None,
+        select=None,
+        max_items=None,
+        concurrency=1,
+        ordered=True,
+    ):
+        """
+        Lazily iterate over the device details of all claimed devices of the platform customer
+        account, requesting the next page (limit/offset) only when the devices of the previous
+        one are consumed. The listing ends at the "total" count of the response.
+        :param limit: paging query param, specifies the count limit of the devices per page
+        :param filter_query: filtering query param, filters by specific fields with OData 4.0 query syntax (except tags)
+        :param filter_tags: filtering query param, filters by tag-related fields with OData 4.0 query syntax
+        :param sort: sorting query param, specifies the field name to sort against and the sort direction
+        :param select: filtering query param, selects specific field names to display as returned result
+        :param max_items: max number of the devices to iterate over
+        :param concurrency: max number of pages fetched in parallel once the first page
+            reveals the "total" count
+        :param ordered: yield the devices in the page order (False - as pages arrive)
+        :return: Paginator object (iterable of the device details)
+        """
+        url = f"{self.devices_url}/devices"
+        log.info("Performing paginated GET devices requests to URL: {}".format(url))
+
+        qparam = {}
+        if filter_query:
+            qparam["filter"] = filter_query
+        if filter_tags:
+            qparam["filter-tags"] = filter_tags
+        if sort:
+            qparam["sort"] = sort
+        if select:
+            qparam["select"] = select
+
+        return self.paginate(
+            url,
+            params=qparam,
+            items_key="items",
+            page_size=limit,
+            max_items=max_items,
+            concurrency=concurrency,
+            ordered=ordered,
+        )
+
     def get_devices_with_api_token(
         self,
         api_token,
@@ -113,15 +204,13 @@ class InventoryNBAPIDevices(AppSession):
         url = f"{self.devices_url}{end_point}"
         log.info("Performing GET devices request (custom token) to URL: {}".format(url))
 
-        # Override existing bearer token for this particular request
-        original_token = self.get_token()
-        self.session.headers = {"Authorization": f"Bearer {api_token}"}
         log.info(
             f"Token decoding is not applicable with custom supplied token '{api_token}'."
         )
 
-        res = self.get(url=url, ignore_handle_response=True)
-        self.session.headers = {"Authorization": f"Bearer {original_token}"}
+        # Override existing bearer token for this particular request only
+        with self.request_context(token=api_token):
+            res = self.get(url=url, ignore_handle_response=True)
         log.debug(
             f"All properties from the Response object of the getStatus restAPI call: {vars(res)}"
         )
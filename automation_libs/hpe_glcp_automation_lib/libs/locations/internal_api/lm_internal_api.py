@@ -71,14 +71,15 @@ class LocationManagementInternal(Session):
             "CCS-Username": username,
             "Content-Type": "application/json",
         }
-        self.session.headers.update(headers)
 
         log.info(
             f"Sending request to create location [platform id:{platform_customer_id}, request:{location_request}"
         )
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/locations"
         log.info(url)
-        response = self.post(url=url, json=location_request, ignore_handle_response=True)
+        response = self.post(
+            url=url, headers=headers, json=location_request, ignore_handle_response=True
+        )
         log.info(f"Response of API request[tx:{platform_customer_id}]: {response}")
         return response
 
@@ -105,13 +106,12 @@ class LocationManagementInternal(Session):
             "CCS-Username": username,
             "Content-Type": "application/json",
         }
-        self.session.headers.update(headers)
 
         log.info(
             f"Sending request to delete location [platform id:{platform_customer_id}, location_id:{location_id}"
         )
         url = f"{self.base_url}{self.base_path}{self.api_version_v1}/locations/{location_id}"
         log.info(url)
-        response = self.delete(url=url, ignore_handle_response=True)
+        response = self.delete(url=url, headers=headers, ignore_handle_response=True)
         log.info(f"Response of API request[tx:{platform_customer_id}]: {response}")
         return response
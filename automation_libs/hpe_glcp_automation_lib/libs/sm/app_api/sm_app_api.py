@@ -32,11 +32,9 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Transaction-Id"] = uuid.uuid1().hex
         if username:
             headers["CCS-Username"] = username
-        if headers:
-            self.session.headers.update(headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/orders"
-        res = self.post(url=url, json=data)
+        res = self.post(url=url, json=data, headers=headers)
         log.info(f"response of subscription status check: {res}")
         return res
 
@@ -53,11 +51,9 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Transaction-Id"] = uuid.uuid1().hex
         if username:
             headers["CCS-Username"] = username
-        if headers:
-            self.session.headers.update(headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/orders/{quote_number}"
-        res = self.get(url=url)
+        res = self.get(url=url, headers=headers)
         log.info(f"response of subscription status check: {res}")
         return res
 
@@ -101,11 +97,9 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Transaction-Id"] = uuid.uuid1().hex
         if username:
             headers["CCS-Username"] = username
-        if headers:
-            self.session.headers.update(headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/orders/activation/error"
-        res = self.post(url=url, json=errorData)
+        res = self.post(url=url, json=errorData, headers=headers)
         log.info(f"response of Inform subscription entitlement error: {res}")
         return res
 
@@ -126,11 +120,9 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/device/{serial_no}"
-        res = self.get(url=url)
+        res = self.get(url=url, headers=headers)
         log.info(f"response of subscription status check: {res}")
         return res
 
@@ -152,11 +144,9 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/application/{acid}/stats"
-        res = self.get(url=url, params=params)
+        res = self.get(url=url, headers=headers, params=params)
         log.info(f"response of subscription stats for ACID: {res}")
         return res
 
@@ -183,13 +173,11 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         try:
             url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/application/{acid}/devices"
             log.info(f"{url} {params}")
-            res = self.get(url=url, params=params)
+            res = self.get(url=url, headers=headers, params=params)
             log.info(
                 f"response of Device subscription assignment information of an application customer: {res}"
             )
@@ -221,13 +209,11 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         try:
             url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/application/{acid}/stats"
             log.info(f"{url} {params}")
-            res = self.get(url=url, params=params)
+            res = self.get(url=url, headers=headers, params=params)
             log.info(
                 f"response of Get Subscription stats of an application customer: {res}"
             )
@@ -256,12 +242,10 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Transaction-Id"] = uuid.uuid1().hex
         if username:
             headers["CCS-Username"] = username
-        if headers:
-            self.session.headers.update(headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/application/{acid}/service"
         log.info(f"{url} {params}")
-        res = self.get(url=url, params=params)
+        res = self.get(url=url, headers=headers, params=params)
         log.info(
             f"response of Service Subscriptions of a platform customer by application customer: {res}"
         )
@@ -287,13 +271,11 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         try:
             url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/stats"
             log.info(f"{url} ")
-            res = self.get(url=url)
+            res = self.get(url=url, headers=headers)
             log.info(f"response of Get Subscription stats of a platform customer: {res}")
             return res
         except Exception as e:
@@ -321,13 +303,11 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         try:
             url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/stats"
             log.info(f"{url} {params}")
-            res = self.get(url=url, params=params)
+            res = self.get(url=url, headers=headers, params=params)
             log.info(f"response of Get Subscription stats of a platform customer: {res}")
             return res
         except Exception as e:
@@ -356,13 +336,11 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         try:
             url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/devices"
             log.info(f"{url} {params}")
-            res = self.get(url=url, params=params)
+            res = self.get(url=url, headers=headers, params=params)
             log.info(f"response of Get Subscription stats of a platform customer: {res}")
             return res
         except Exception as e:
@@ -388,13 +366,11 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         try:
             url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/devices/config/tiers"
             log.info(f"{url} {params}")
-            res = self.get(url=url, params=params, **kwargs)
+            res = self.get(url=url, headers=headers, params=params, **kwargs)
             log.info(
                 f"response of  Get subscription tiers that can be assigned for a device type: {res}"
             )
@@ -425,13 +401,11 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Transaction-Id"] = uuid.uuid1().hex
         if username:
             headers["CCS-Username"] = username
-        if headers:
-            self.session.headers.update(headers)
 
         try:
             url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/application/{acid}/service"
             log.info(f"{url} {params}")
-            res = self.get(url=url, params=params)
+            res = self.get(url=url, headers=headers, params=params)
             log.info(
                 f"response of Get list of service subscription assigned to application : {res}"
             )
@@ -460,13 +434,11 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         try:
             url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/application/{acid}/devices/trend"
             log.info(f"{url} {params}")
-            res = self.get(url=url, params=params)
+            res = self.get(url=url, headers=headers, params=params)
             log.info(
                 f"response of Get list of Get time-series trend for device subscription assignments : {res}"
             )
@@ -497,13 +469,11 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         try:
             url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/application/{acid}/autolicense"
             log.info(f"{url}")
-            res = self.get(url=url)
+            res = self.get(url=url, headers=headers)
             log.info(f"response of Get list of Get auto license: {res}")
             return res
         except Exception as e:
@@ -533,13 +503,11 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         try:
             url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/application/{acid}/"
             log.info(f"{url} {params}")
-            res = self.get(url=url, params=params)
+            res = self.get(url=url, headers=headers, params=params)
             log.info(
                 f"response of Device subscription assignment information of an application customer: {res}"
             )
@@ -576,15 +544,13 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         try:
             url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}"
             if secondary:
                 url = f"{self.get_secondary_app_api_hostname()}{self.base_path}{self.api_version}/subscription/{pcid}"
             log.info(f"{url} {params}")
-            res = self.get(url=url, params=params)
+            res = self.get(url=url, headers=headers, params=params)
             log.info(
                 f"response of Device subscription assignment information of an application customer: {res}"
             )
@@ -612,13 +578,11 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}"
         if secondary:
             url = f"{self.get_secondary_app_api_hostname()}{self.base_path}{self.api_version}/subscription/{pcid}"
-        res = self.get(url=url)
+        res = self.get(url=url, headers=headers)
         log.info(f"response of subscription info for PCID: {res}")
         return res
 
@@ -639,11 +603,9 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/device/mac/{mac}"
-        res = self.get(url=url)
+        res = self.get(url=url, headers=headers)
         log.info(f"response of device subscription using MAC: {res}")
         return res
 
@@ -665,15 +627,13 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         if secondary:
             return self.get_secondary(
                 f"{self.get_secondary_app_api_hostname()}{self.base_path}{self.api_version}/subscription/{pcid}/application/{acid}/devices"
             )
         url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/application/{acid}/devices"
-        res = self.get(url=url, params=params)
+        res = self.get(url=url, headers=headers, params=params)
         return res
 
     def subscription_assign(
@@ -696,8 +656,6 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/application/{acid}/devices"
 
@@ -705,7 +663,7 @@ class SubscriptionManagementApp(AppSession):
         license_data = {"device_serial": device, "subscription_key": license}
 
         data.append(license_data)
-        res = self.post(url=url, json=data, **kwargs)
+        res = self.post(url=url, headers=headers, json=data, **kwargs)
         log.info(f"Response of API request: {res}")
         return res
 
@@ -732,11 +690,9 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/application/{acid}/devices"
-        res = self.post(url=url, json=detail_list, **kwargs)
+        res = self.post(url=url, headers=headers, json=detail_list, **kwargs)
         log.info(f"Response of API request: {res}")
         return res
 
@@ -765,13 +721,11 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         params = {}
         params["deviceSerialNumbers"] = deviceSerialNumbers
         url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/application/{acid}/devices"
-        res = self.delete(url=url, params=params, **kwargs)
+        res = self.delete(url=url, headers=headers, params=params, **kwargs)
         log.info(f"response of unassign license: {res}")
         return res
 
@@ -795,11 +749,9 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/application/{acid}/devices?deviceSerialNumbers={','.join(device_list_lic)}"
-        res = self.delete(url=url, **kwargs)
+        res = self.delete(url=url, headers=headers, **kwargs)
         log.info(f"response of unassign license: {res}")
         return res
 
@@ -819,12 +771,10 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Transaction-Id"] = uuid.uuid1().hex
         if username:
             headers["CCS-Username"] = username
-        if headers:
-            self.session.headers.update(headers)
 
         add_path = "customers/aliases"
         url = self._get_path(add_path, params=params)
-        res = self.get(url=url)
+        res = self.get(url=url, headers=headers)
         log.info(f"The customer aliases are {res}")
         return res
 
@@ -858,13 +808,11 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         try:
             url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/management/subscriptions"
             log.info(f"{url} {params}")
-            res = self.get(url=url, params=params)
+            res = self.get(url=url, headers=headers, params=params)
             log.info(
                 f"response of  Get subscription tiers that can be assigned for a device type: {res}"
             )
@@ -893,8 +841,6 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/application/{acid}/devices"
 
@@ -902,7 +848,7 @@ class SubscriptionManagementApp(AppSession):
         license_data = {"device_serial": device, "subscription_key": license}
 
         data.append(license_data)
-        res = self.put(url=url, json=data)
+        res = self.put(url=url, headers=headers, json=data)
         log.info(f"Response of API request: {res}")
         return res
 
@@ -928,11 +874,9 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/management"
-        res = self.post(url=url, params=params)
+        res = self.post(url=url, headers=headers, params=params)
         log.info(f"Response of API request: {res}")
         return res
 
@@ -948,9 +892,7 @@ class SubscriptionManagementApp(AppSession):
         :param:subscription_key
         returns :Response of API call
         """
-        if headers:
-            self.session.headers.update(headers)
-        else:
+        if not headers:
             headers = {}
             if transaction_id:
                 headers["CCS-Transaction-Id"] = transaction_id
@@ -960,8 +902,6 @@ class SubscriptionManagementApp(AppSession):
                 headers["CCS-Username"] = username
             if pcid:
                 headers["CCS-Platform-Customer-Id"] = pcid
-            if headers:
-                self.session.headers.update(headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/management"
         res = self.delete(url=url, params=params, headers=headers)
@@ -976,9 +916,7 @@ class SubscriptionManagementApp(AppSession):
         :param:subscription_tiers
         returns :Response of API call
         """
-        if headers:
-            self.session.headers.update(headers)
-        else:
+        if not headers:
             headers = {}
             if transaction_id:
                 headers["CCS-Transaction-Id"] = transaction_id
@@ -988,8 +926,6 @@ class SubscriptionManagementApp(AppSession):
                 headers["CCS-Username"] = username
             if pcid:
                 headers["CCS-Platform-Customer-Id"] = pcid
-            if headers:
-                self.session.headers.update(headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/eval/vgw"
         res = self.post(url=url, params=params, headers=headers)
@@ -1024,8 +960,6 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         params = {}
         data = {}
@@ -1035,7 +969,7 @@ class SubscriptionManagementApp(AppSession):
 
         params["application_customer_id"] = acid
         url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/autolicense/include"
-        res = self.post(url=url, params=params, json=data)
+        res = self.post(url=url, headers=headers, params=params, json=data)
         log.info(f"Response of API request: {res}")
         return res
 
@@ -1068,8 +1002,6 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         params = {}
         params["application_customer_id"] = acid
@@ -1079,7 +1011,7 @@ class SubscriptionManagementApp(AppSession):
                 params, url, data
             )
         )
-        res = self.post(url=url, params=params, json=data)
+        res = self.post(url=url, headers=headers, params=params, json=data)
         log.info(f"Response of Modify AutoLicense API request: {res}")
         return res
 
@@ -1101,13 +1033,11 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         params = {}
         params["application_customer_id"] = acid
         url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/devices/include"
-        res = self.delete(url=url, params=params)
+        res = self.delete(url=url, headers=headers, params=params)
         log.info(f"Response of API request: {res}")
         return res
 
@@ -1129,13 +1059,11 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         params = {}
         params["application_customer_id"] = acid
         url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/devices/exclude"
-        res = self.delete(url=url, params=params)
+        res = self.delete(url=url, headers=headers, params=params)
         log.info(f"Response of API request: {res}")
         return res
 
@@ -1167,14 +1095,12 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{pcid}/devices/subscriptiontiers"
 
         data = {"serials": serials}
 
-        res = self.post(url=url, json=data)
+        res = self.post(url=url, headers=headers, json=data)
         log.info(f"Response of API request get_subscription_tier_devices: {res}")
         return res
 
@@ -1197,11 +1123,9 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
         add_path = f"customers/{pcid}/aliases"
         url = self._get_path(add_path)
-        res = self.get(url=url)
+        res = self.get(url=url, headers=headers)
         log.info(f"The customer aliases with pcid are {res}")
         return res
 
@@ -1226,10 +1150,8 @@ class SubscriptionManagementApp(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         url = f"{self.base_url}{self.base_path}{self.api_version}/subscription/{subscription_id}/unclaim"
-        res = self.delete(url=url, json=payload)
+        res = self.delete(url=url, headers=headers, json=payload)
         log.info(f"Response of API request: {res}")
         return res
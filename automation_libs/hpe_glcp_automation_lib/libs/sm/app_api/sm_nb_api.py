@@ -50,15 +50,13 @@ class SubscriptionManagementNBAPI(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         data = {}
         data["services"] = services
         params = {"application_customer_id": application_customer_id}
         end_point = "subscriptions/devices/all"
         url = f"{self.nbapi_base_url}{end_point}"
-        res = self.post(url=url, json=data, params=params, **kwargs)
+        res = self.post(url=url, headers=headers, json=data, params=params, **kwargs)
         log.info(f"Response of restAPI call : {res}")
         return res
 
@@ -86,14 +84,12 @@ class SubscriptionManagementNBAPI(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         data = {"services": [services]}
         params = {"application_customer_id": application_customer_id}
         end_point = "subscriptions/devices/all"
         url = f"{self.nbapi_base_url}{end_point}"
-        res = self.delete(url=url, json=data, params=params)
+        res = self.delete(url=url, headers=headers, json=data, params=params)
         log.info(f"Response of restAPI call : {res}")
         return res
 
@@ -124,8 +120,6 @@ class SubscriptionManagementNBAPI(AppSession):
             headers["CCS-Username"] = username
         if platform_customer_id:
             headers["CCS-Platform-Customer-Id"] = platform_customer_id
-        if headers:
-            self.session.headers.update(headers)
 
         data = {"services": services, "serials": serials}
         params = {
@@ -135,7 +129,7 @@ class SubscriptionManagementNBAPI(AppSession):
 
         end_point = "subscriptions/assign"
         url = f"{self.nbapi_base_url}{end_point}"
-        res = self.post(url=url, json=data, params=params, **kwargs)
+        res = self.post(url=url, headers=headers, json=data, params=params, **kwargs)
         log.info(f"Response of restAPI call : {res}")
         return res
 
@@ -166,8 +160,6 @@ class SubscriptionManagementNBAPI(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         data = {}
         data["services"] = services
@@ -177,7 +169,7 @@ class SubscriptionManagementNBAPI(AppSession):
 
         end_point = "msp/subscriptions/devices/all"
         url = f"{self.nbapi_base_url}{end_point}"
-        res = self.post(url=url, json=data, params=params, **kwargs)
+        res = self.post(url=url, headers=headers, json=data, params=params, **kwargs)
         log.info(f"Response of restAPI call : {res}")
         return res
 
@@ -213,7 +205,6 @@ class SubscriptionManagementNBAPI(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        self.session.headers.update(headers)
         data = {}
         data["services"] = services
         data["include_customers"] = include_customers
@@ -221,7 +212,7 @@ class SubscriptionManagementNBAPI(AppSession):
         params = {"application_customer_id": application_customer_id}
         end_point = "msp/subscriptions/devices/all"
         url = f"{self.nbapi_base_url}{end_point}"
-        res = self.delete(url=url, json=data, params=params, **kwargs)
+        res = self.delete(url=url, headers=headers, json=data, params=params, **kwargs)
         log.info(f"Response of restAPI call : {res}")
         return res
 
@@ -249,8 +240,6 @@ class SubscriptionManagementNBAPI(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         params = {
             "application_customer_id": application_customer_id,
@@ -259,7 +248,7 @@ class SubscriptionManagementNBAPI(AppSession):
 
         end_point = "msp/customer/settings/autolicense"
         url = f"{self.nbapi_base_url}{end_point}"
-        res = self.get(url=url, params=params, **kwargs)
+        res = self.get(url=url, headers=headers, params=params, **kwargs)
         log.info(f"Response of restAPI call : {res}")
         return res
 
@@ -289,8 +278,6 @@ class SubscriptionManagementNBAPI(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         data = {}
         data["services"] = services
@@ -300,7 +287,7 @@ class SubscriptionManagementNBAPI(AppSession):
 
         end_point = "msp/customer/settings/autolicense"
         url = f"{self.nbapi_base_url}{end_point}"
-        res = self.post(url=url, json=data, params=params)
+        res = self.post(url=url, headers=headers, json=data, params=params)
         log.info(f"Response of restAPI call : {res}")
         return res
 
@@ -336,7 +323,6 @@ class SubscriptionManagementNBAPI(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        self.session.headers.update(headers)
         data = {}
         data["services"] = services
         data["include_customers"] = include_customers
@@ -344,7 +330,7 @@ class SubscriptionManagementNBAPI(AppSession):
         params = {"application_customer_id": application_customer_id}
         end_point = "msp/customer/settings/autolicense"
         url = f"{self.nbapi_base_url}{end_point}"
-        res = self.delete(url=url, json=data, params=params, **kwargs)
+        res = self.delete(url=url, headers=headers, json=data, params=params, **kwargs)
         log.info(f"Response of restAPI call : {res}")
         return res
 
@@ -374,11 +360,10 @@ class SubscriptionManagementNBAPI(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        self.session.headers.update(headers)
         params = {"application_customer_id": application_customer_id}
         end_point = "customer/settings/autolicense"
         url = f"{self.nbapi_base_url}{end_point}"
-        res = self.get(url=url, params=params, **kwargs)
+        res = self.get(url=url, headers=headers, params=params, **kwargs)
         log.info(f"Response of restAPI call : {res}")
         return res
 
@@ -410,14 +395,13 @@ class SubscriptionManagementNBAPI(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        self.session.headers.update(headers)
 
         data = {}
         data["services"] = services
         params = {"application_customer_id": application_customer_id}
         end_point = "customer/settings/autolicense"
         url = f"{self.nbapi_base_url}{end_point}"
-        res = self.post(url=url, json=data, params=params, **kwargs)
+        res = self.post(url=url, headers=headers, json=data, params=params, **kwargs)
         log.info(f"Response of restAPI call : {res}")
         return res
 
@@ -449,14 +433,13 @@ class SubscriptionManagementNBAPI(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        self.session.headers.update(headers)
 
         data = {}
         data["services"] = services
         params = {"application_customer_id": application_customer_id}
         end_point = "customer/settings/autolicense"
         url = f"{self.nbapi_base_url}{end_point}"
-        res = self.delete(url=url, json=data, params=params, **kwargs)
+        res = self.delete(url=url, headers=headers, json=data, params=params, **kwargs)
         log.info(f"Response of restAPI call : {res}")
         return res
 
@@ -496,7 +479,6 @@ class SubscriptionManagementNBAPI(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        self.session.headers.update(headers)
         params = {
             "application_customer_id": application_customer_id,
             "limit": limit,
@@ -507,7 +489,7 @@ class SubscriptionManagementNBAPI(AppSession):
         }
         end_point = "subscriptions"
         url = f"{self.nbapi_base_url}{end_point}"
-        res = self.get(url=url, params=params, **kwargs)
+        res = self.get(url=url, headers=headers, params=params, **kwargs)
         log.info(f"Response of restAPI call : {res}")
         return res
 
@@ -547,7 +529,6 @@ class SubscriptionManagementNBAPI(AppSession):
             headers["CCS-Username"] = username
         if platform_customer_id:
             headers["CCS-Platform-Customer-Id"] = platform_customer_id
-        self.session.headers.update(headers)
         params = {
             "subscription_key": subscription_key,
             "license_type": license_type,
@@ -557,7 +538,7 @@ class SubscriptionManagementNBAPI(AppSession):
         }
         end_point = f"subscription/{platform_customer_id}/application/{application_customer_id}/stats"
         url = f"{self.nbapi_base_url}{end_point}"
-        res = self.get(url=url, params=params, **kwargs)
+        res = self.get(url=url, headers=headers, params=params, **kwargs)
         log.info(f"Response of restAPI call : {res}")
         return res
 
@@ -587,14 +568,13 @@ class SubscriptionManagementNBAPI(AppSession):
             headers["CCS-Username"] = username
         if platform_customer_id:
             headers["CCS-Platform-Customer-Id"] = platform_customer_id
-        self.session.headers.update(headers)
         params = {
             "platform_customer_id": platform_customer_id,
             "application_customer_id": application_customer_id,
         }
         end_point = f"services/enabled"
         url = f"{self.nbapi_base_url}{end_point}"
-        res = self.get(url=url, params=params, **kwargs)
+        res = self.get(url=url, headers=headers, params=params, **kwargs)
         log.info(f"Response of restAPI call : {res}")
         return res
 
@@ -622,13 +602,11 @@ class SubscriptionManagementNBAPI(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        if headers:
-            self.session.headers.update(headers)
 
         end_point = f"services/config"
         params = {"device_type": device_type, "service_category": service_category}
         url = f"{self.nbapi_base_url}{end_point}"
-        res = self.get(url=url, params=params, **kwargs)
+        res = self.get(url=url, headers=headers, params=params, **kwargs)
         log.info(f"Response of restAPI call : {res}")
         return res
 
@@ -657,8 +635,6 @@ class SubscriptionManagementNBAPI(AppSession):
             headers["CCS-Username"] = username
         if platform_customer_id:
             headers["CCS-Platform-Customer-Id"] = platform_customer_id
-        if headers:
-            self.session.headers.update(headers)
 
         end_point = f"autolicensing/services/{service}/status"
         params = {
@@ -666,7 +642,7 @@ class SubscriptionManagementNBAPI(AppSession):
             "application_customer_id": application_customer_id,
         }
         url = f"{self.nbapi_base_url}{end_point}"
-        res = self.get(url=url, params=params, **kwargs)
+        res = self.get(url=url, headers=headers, params=params, **kwargs)
         log.info(f"Response of restAPI call : {res}")
         return res
 
@@ -696,8 +672,6 @@ class SubscriptionManagementNBAPI(AppSession):
             headers["CCS-Username"] = username
         if platform_customer_id:
             headers["CCS-Platform-Customer-Id"] = platform_customer_id
-        if headers:
-            self.session.headers.update(headers)
 
         data = {}
         data["services"] = services
@@ -708,7 +682,7 @@ class SubscriptionManagementNBAPI(AppSession):
         }
         end_point = "subscription/{platform_customer_id}/application/{application_customer_id}/devices"
         url = f"{self.nbapi_base_url}{end_point}"
-        res = self.delete(url=url, json=data, params=params)
+        res = self.delete(url=url, headers=headers, json=data, params=params)
         log.info(f"Response of restAPI call : {res}")
         return res
 
@@ -747,7 +721,6 @@ class SubscriptionManagementNBAPI(AppSession):
             headers["CCS-Username"] = username
         if pcid:
             headers["CCS-Platform-Customer-Id"] = pcid
-        self.session.headers.update(headers)
 
         params = {
             "application_customer_id": application_customer_id,
@@ -760,6 +733,6 @@ class SubscriptionManagementNBAPI(AppSession):
 
         end_point = "subscriptions"
         url = f"{self.nbapi_base_url}{end_point}"
-        res = self.get(url=url, params=params)
+        res = self.get(url=url, headers=headers, params=params)
         log.info(f"Response of restAPI call : {res}")
         return res
@@ -2,17 +2,106 @@
 Helper function for New Subscription order App Api Class
 """
 import logging
-import time
+from copy import deepcopy
 from datetime import datetime, timedelta
 
 import pytz
 
+from hpe_glcp_automation_lib.libs.authn.user_api.session.core.exceptions import (
+    DeadlineExceededException,
+)
+from hpe_glcp_automation_lib.libs.authn.user_api.session.core.waiter import Waiter
 from hpe_glcp_automation_lib.libs.commons.utils.random_gens import RandomGenUtils
 from hpe_glcp_automation_lib.libs.sm.app_api.sm_app_api import SubscriptionManagementApp
 from hpe_glcp_automation_lib.libs.sm.helpers.sm_payload_constants import SmInputPayload
 
 log = logging.getLogger(__name__)
 
+# Order fields not returned as sent by get_subs_order()
+UNCHECKED_ORDER_FIELDS = ("reason",)
+
+
+def _get_order_changes(before, after, path=()):
+    """
+    :param before: Order (or its part) as fetched
+    :param after: Order (or its part) as updated
+    :param path: Path of the compared part
+    :return: List of (path, value) of the values changed in after
+    """
+    if isinstance(before, dict) and isinstance(after, dict):
+        changes = []
+        for key, value in after.items():
+            if key in before:
+                changes.extend(_get_order_changes(before[key], value, path + (key,)))
+            else:
+                changes.append((path + (key,), value))
+        return changes
+    if isinstance(before, list) and isinstance(after, list) and len(before) == len(after):
+        changes = []
+        for index, (item_before, item_after) in enumerate(zip(before, after)):
+            changes.extend(_get_order_changes(item_before, item_after, path + (index,)))
+        return changes
+    return [] if before == after else [(path, after)]
+
+
+def _parse_order_date(value):
+    """
+    :param value: Order field value
+    :return: datetime (UTC) if the value is a date ("%d.%m.%Y %H:%M:%S" or ISO 8601)
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        date = datetime.strptime(value, "%d.%m.%Y %H:%M:%S")
+    except ValueError:
+        try:
+            date = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if date.tzinfo is None:
+        return date.replace(tzinfo=pytz.utc)
+    return date.astimezone(pytz.utc)
+
+
+def _order_values_match(sent, returned):
+    """
+    :param sent: Value sent by update_subs_order()
+    :param returned: Value returned by get_subs_order()
+    :return: True if the backend returned the sent value (its format may differ,
+        e.g. "5" - 5 or "01.01.2025 10:00:00" - "2025-01-01T10:00:00.000Z")
+    """
+    if sent == returned:
+        return True
+    if isinstance(sent, (dict, list)) or isinstance(returned, (dict, list)):
+        return False
+    if str(sent).strip() == str(returned).strip():
+        return True
+    sent_date = _parse_order_date(sent)
+    returned_date = _parse_order_date(returned)
+    if sent_date is None or returned_date is None:
+        return False
+    return sent_date.replace(microsecond=0) == returned_date.replace(microsecond=0)
+
+
+def _get_order_mismatches(changes, lic_order):
+    """
+    :param changes: List of (path, value) returned by _get_order_changes()
+    :param lic_order: get_subs_order() response
+    :return: List of the paths whose values are not returned as sent
+    """
+    mismatches = []
+    for path, value in changes:
+        try:
+            current = lic_order[0]
+            for key in path:
+                current = current[key]
+        except (KeyError, IndexError, TypeError):
+            mismatches.append(path)
+            continue
+        if not _order_values_match(value, current):
+            mismatches.append(path)
+    return mismatches
+
 
 class NewSubsOrder:
     """
@@ -38,6 +127,38 @@ class NewSubsOrder:
         self.order = SubscriptionManagementApp(
             self.app_api_host, self.sso_host, self.aop_client_id, self.aop_client_secret
         )
+        # Updated orders are usually returned by get_subs_order() in under a second
+        self.waiter = Waiter(timeout=15, interval=0.25, max_interval=3)
+
+    def __update_subs_order(self, quote, original, lic_order):
+        """
+        Update the order and wait until get_subs_order() returns it updated
+        (instead of fixed sleeps), the last fetched order is returned on timeout
+        :param quote: Order quote
+        :param original: Order as fetched before the changes
+        :param lic_order: Changed order
+        :return: Updated order (get_subs_order() response) or False
+        """
+        if not self.order.update_subs_order(lic_order[0]):
+            return False
+        changes = [
+            (path, value)
+            for path, value in _get_order_changes(original[0], lic_order[0])
+            if path[0] not in UNCHECKED_ORDER_FIELDS
+        ]
+        lic_order_updated = self.waiter.until(
+            lambda: self.order.get_subs_order(quote),
+            lambda updated: not _get_order_mismatches(changes, updated),
+            name="subs_order_update",
+            raise_on_timeout=False,
+        )
+        mismatches = _get_order_mismatches(changes, lic_order_updated)
+        if mismatches:
+            log.warning(
+                f"Order {quote} is not returned updated after {self.waiter.timeout}s, "
+                f"fields not matching the update: {mismatches}"
+            )
+        return lic_order_updated
 
     def create_svc_order(self, order_type=None):
         """
@@ -904,6 +1025,7 @@ class NewSubsOrder:
         :return: license order key
         """
         lic_order = self.order.get_subs_order(quote)
+        original = deepcopy(lic_order)
 
         lic_order[0]["reason"] = "Update"
         now = datetime.now()
@@ -923,12 +1045,8 @@ class NewSubsOrder:
             ] = now_utc.strftime("%d.%m.%Y %H:%M:%S")
         try:
             log.info("\n\nOrder: {}\n\n".format(lic_order))
-            time.sleep(5)
-            res = self.order.update_subs_order(lic_order[0])
-            time.sleep(6)
-            if res:
-                lic_order_updated = self.order.get_subs_order(quote)
-                time.sleep(2)
+            lic_order_updated = self.__update_subs_order(quote, original, lic_order)
+            if lic_order_updated:
                 if licence:
                     for get_licence_order in lic_order_updated[0]["entitlements"]:
                         if get_licence_order["licenses"][0]["id"] == licence:
@@ -941,6 +1059,8 @@ class NewSubsOrder:
                 return lic_order_updated_key, lic_order_updated[0]["quote"]
             else:
                 return False
+        except DeadlineExceededException:
+            raise
         except Exception as e:
             log.error(
                 "Failed to update lic_order, with quote: {}\n. Exception details: {}".format(
@@ -956,6 +1076,7 @@ class NewSubsOrder:
         :return: license order key
         """
         lic_order = self.order.get_subs_order(quote)
+        original = deepcopy(lic_order)
 
         lic_order[0]["reason"] = "Update"
         now = datetime.now()
@@ -964,18 +1085,16 @@ class NewSubsOrder:
         ] = now.strftime("%d.%m.%Y %H:%M:%S")
         try:
             log.info("\n\nOrder: {}\n\n".format(lic_order))
-            time.sleep(5)
-            res = self.order.update_subs_order(lic_order[0])
-            time.sleep(6)
-            if res:
-                lic_order_updated = self.order.get_subs_order(quote)
-                time.sleep(2)
+            lic_order_updated = self.__update_subs_order(quote, original, lic_order)
+            if lic_order_updated:
                 lic_order_updated_key = lic_order_updated[0]["entitlements"][0][
                     "licenses"
                 ][0]["id"]
                 return lic_order_updated_key, lic_order_updated[0]["quote"]
             else:
                 return False
+        except DeadlineExceededException:
+            raise
         except Exception as e:
             log.error(
                 "Failed to update lic_order, with quote: {}\n. Exception details: {}".format(
@@ -998,6 +1117,7 @@ class NewSubsOrder:
         :return: license order key
         """
         lic_order = self.order.get_subs_order(quote)
+        original = deepcopy(lic_order)
         lic_order[0]["reason"] = "Update"
 
         if licence:
@@ -1032,12 +1152,8 @@ class NewSubsOrder:
 
         try:
             log.info("\n\nOrder: {}\n\n".format(lic_order))
-            time.sleep(5)
-            res = self.order.update_subs_order(lic_order[0])
-            time.sleep(6)
-            if res:
-                lic_order_updated = self.order.get_subs_order(quote)
-                time.sleep(2)
+            lic_order_updated = self.__update_subs_order(quote, original, lic_order)
+            if lic_order_updated:
                 if licence:
                     for get_licence_order in lic_order_updated[0]["entitlements"]:
                         if get_licence_order["licenses"][0]["id"] == licence:
@@ -1050,6 +1166,8 @@ class NewSubsOrder:
                 return lic_order_updated_key, lic_order_updated[0]["quote"]
             else:
                 return False
+        except DeadlineExceededException:
+            raise
         except Exception as e:
             log.error(
                 "Failed to extend lic_order, with quote: {}\n. Exception details: {}".format(
@@ -1072,6 +1190,7 @@ class NewSubsOrder:
         :return: license order key
         """
         lic_order = self.order.get_subs_order(quote)
+        original = deepcopy(lic_order)
         lic_order[0]["reason"] = "Update"
 
         if licence:
@@ -1106,12 +1225,8 @@ class NewSubsOrder:
 
         try:
             log.info("\n\nOrder: {}\n\n".format(lic_order))
-            time.sleep(5)
-            res = self.order.update_subs_order(lic_order[0])
-            time.sleep(6)
-            if res:
-                lic_order_updated = self.order.get_subs_order(quote)
-                time.sleep(2)
+            lic_order_updated = self.__update_subs_order(quote, original, lic_order)
+            if lic_order_updated:
                 if licence:
                     for get_licence_order in lic_order_updated[0]["entitlements"]:
                         if get_licence_order["licenses"][0]["id"] == licence:
@@ -1124,6 +1239,8 @@ class NewSubsOrder:
                 return lic_order_updated_key, lic_order_updated[0]["quote"]
             else:
                 return False
+        except DeadlineExceededException:
+            raise
         except Exception as e:
             log.error(
                 "Failed to extend lic_order, with quote: {}\n. Exception details: {}".format(
@@ -1139,6 +1256,7 @@ class NewSubsOrder:
         :return: license order key
         """
         lic_order = self.order.get_subs_order(quote)
+        original = deepcopy(lic_order)
 
         lic_order[0]["reason"] = "Cancellation"
         now = datetime.now()
@@ -1153,18 +1271,16 @@ class NewSubsOrder:
 
         try:
             log.info("\n\nOrder: {}\n\n".format(lic_order))
-            time.sleep(5)
-            res = self.order.update_subs_order(lic_order[0])
-            time.sleep(6)
-            if res:
-                lic_order_updated = self.order.get_subs_order(quote)
-                time.sleep(2)
+            lic_order_updated = self.__update_subs_order(quote, original, lic_order)
+            if lic_order_updated:
                 lic_order_updated_key = lic_order_updated[0]["entitlements"][0][
                     "licenses"
                 ][0]["id"]
                 return lic_order_updated_key, lic_order_updated[0]["quote"]
             else:
                 return False
+        except DeadlineExceededException:
+            raise
         except Exception as e:
             log.error(
                 "Failed to update lic_order to Cancellation, with quote: {}\n. Exception details: {}".format(
@@ -1181,6 +1297,7 @@ class NewSubsOrder:
         :return: Order quantity, license order quote
         """
         lic_order = self.order.get_subs_order(quote)
+        original = deepcopy(lic_order)
 
         lic_order[0]["reason"] = "Update"
         for i in range(0, len(lic_order[0]["entitlements"])):
@@ -1191,12 +1308,8 @@ class NewSubsOrder:
 
         try:
             log.info("\n\nOrder: {}\n\n".format(lic_order))
-            time.sleep(2)
-            res = self.order.update_subs_order(lic_order[0])
-            time.sleep(6)
-            if res:
-                lic_order_updated = self.order.get_subs_order(quote)
-                time.sleep(5)
+            lic_order_updated = self.__update_subs_order(quote, original, lic_order)
+            if lic_order_updated:
                 lic_order_updated_qty = lic_order_updated[0]["entitlements"][0][
                     "licenses"
                 ][0]["qty"]
@@ -1205,6 +1318,8 @@ class NewSubsOrder:
                 return lic_order_updated_qty, lic_order_updated[0]["quote"]
             else:
                 return False
+        except DeadlineExceededException:
+            raise
         except Exception as e:
             log.error(
                 "Failed to update lic_order, with quote: {}\n. Exception details: {}".format(
@@ -1220,7 +1335,7 @@ class NewSubsOrder:
         :return: Order quantity, license order quote
         """
         lic_order = self.order.get_subs_order(quote)
-        time.sleep(2)
+        original = deepcopy(lic_order)
 
         lic_order[0]["reason"] = "Update"
 
@@ -1246,17 +1361,14 @@ class NewSubsOrder:
 
         try:
             log.info("\n\nOrder: {}\n\n".format(lic_order))
-            time.sleep(2)
-            res = self.order.update_subs_order(lic_order[0])
-            time.sleep(3)
-            if res:
-                lic_order_updated = self.order.get_subs_order(quote)
-                time.sleep(2)
-
+            lic_order_updated = self.__update_subs_order(quote, original, lic_order)
+            if lic_order_updated:
                 log.info("Tier upgraded to Advanced.")
                 return lic_order_updated[0]["quote"]
             else:
                 return False
+        except DeadlineExceededException:
+            raise
         except Exception as e:
             log.error(
                 "Failed to update lic_order, with quote: {}\n. Exception details: {}".format(
@@ -1272,7 +1384,7 @@ class NewSubsOrder:
         :return: Order quantity, license order quote
         """
         lic_order = self.order.get_subs_order(quote)
-        time.sleep(2)
+        original = deepcopy(lic_order)
 
         lic_order[0]["reason"] = "Update"
 
@@ -1298,17 +1410,14 @@ class NewSubsOrder:
 
         try:
             log.info("\n\nOrder: {}\n\n".format(lic_order))
-            time.sleep(2)
-            res = self.order.update_subs_order(lic_order[0])
-            time.sleep(3)
-            if res:
-                lic_order_updated = self.order.get_subs_order(quote)
-                time.sleep(2)
-
+            lic_order_updated = self.__update_subs_order(quote, original, lic_order)
+            if lic_order_updated:
                 log.info("Tier downgraded to Foundation.")
                 return lic_order_updated[0]["quote"]
             else:
                 return False
+        except DeadlineExceededException:
+            raise
         except Exception as e:
             log.error(
                 "Failed to update lic_order, with quote: {}\n. Exception details: {}".format(
@@ -1325,18 +1434,15 @@ class NewSubsOrder:
         :return: boolvalue set, license order quote
         """
         lic_order = self.order.get_subs_order(quote)
+        original = deepcopy(lic_order)
 
         lic_order[0]["reason"] = "Update"
         lic_order[0]["future"] = boolvalue
 
         try:
             log.info("\n\nOrder: {}\n\n".format(lic_order))
-            time.sleep(2)
-            res = self.order.update_subs_order(lic_order[0])
-            time.sleep(6)
-            if res:
-                lic_order_updated = self.order.get_subs_order(quote)
-                time.sleep(5)
+            lic_order_updated = self.__update_subs_order(quote, original, lic_order)
+            if lic_order_updated:
                 lic_order_future_flag_val = lic_order_updated[0]["future"]
 
                 log.info(
@@ -1347,6 +1453,8 @@ class NewSubsOrder:
                 return lic_order_future_flag_val, lic_order_updated[0]["quote"]
             else:
                 return False
+        except DeadlineExceededException:
+            raise
         except Exception as e:
             log.error(
                 "Failed to update future flag value, with quote: {}\n. Exception details: {}".format(
@@ -1362,6 +1470,7 @@ class NewSubsOrder:
         :return: license order key
         """
         lic_order = self.order.get_subs_order(quote)
+        original = deepcopy(lic_order)
 
         lic_order[0]["reason"] = "Update"
 
@@ -1371,18 +1480,16 @@ class NewSubsOrder:
         ] = now.strftime("%d.%m.%Y %H:%M:%S")
         try:
             log.info("\n\nOrder: {}\n\n".format(lic_order))
-            time.sleep(5)
-            res = self.order.update_subs_order(lic_order[0])
-            time.sleep(6)
-            if res:
-                lic_order_updated = self.order.get_subs_order(quote)
-                time.sleep(2)
+            lic_order_updated = self.__update_subs_order(quote, original, lic_order)
+            if lic_order_updated:
                 lic_order_updated_key = lic_order_updated[0]["entitlements"][0][
                     "licenses"
                 ][0]["id"]
                 return lic_order_updated_key, lic_order_updated[0]["quote"]
             else:
                 return False
+        except DeadlineExceededException:
+            raise
         except Exception as e:
             log.error(
                 "Failed to update autoRenewalDate, with quote: {}\n. Exception details: {}".format(
@@ -448,6 +448,18 @@ class UIDoorway(UISession):
                 f"Could not fetch msp tenants for this account: {str(e)}. Check pre-conditions!"
             )
 
+    def iter_msp_tenants(self, count_per_page=20):
+        """
+        :returns a lazy iterator over all tenants associated with this MSP account,
+        the next page is requested only when the tenants of the previous one are consumed.
+        """
+        return self.paginate(
+            f"{self.base_path}{self.api_version}/tenants",
+            params={"sort_by": "-ACCOUNT_SORT_BY_RECENT"},
+            page_size=count_per_page,
+            limit_param="count_per_page",
+        )
+
     def delete_tenant(self, customer_id):
         """
         Delete a given customer/tenant if this is a valid MSP account.
@@ -460,6 +472,18 @@ class UIDoorway(UISession):
                 f"Delete tenant with customer_id {customer_id} failed: {str(e)}. Check pre-conditions!"
             )
 
+    def delete_tenants(self, customer_ids, concurrency=8, fail_fast=False):
+        """
+        Delete the given customers/tenants concurrently if this is a valid MSP account.
+        :param customer_ids: list of the tenant customer ids
+        :param concurrency: max number of deletions in flight
+        :param fail_fast: stop and raise BulkRequestException on the first failure
+        :return: list of BulkResult objects (result/error per customer id) in the input order
+        """
+        return self.submit_many(
+            self.delete_tenant, customer_ids, concurrency=concurrency, fail_fast=fail_fast
+        )
+
     def toggle_account_type(self):
         """
         This endpoint converts a given account from standard enterprise account to MSP and vice-versa,
@@ -520,6 +544,24 @@ class UIDoorway(UISession):
         log.info(f"Delete customer's device folder response: '{result}'.")
         return result
 
+    def delete_folders(
+        self, folder_ids: List[str], pcid: str = None, concurrency=8, fail_fast=False
+    ):
+        """Delete customer devices folders concurrently of specified (if pcid not None) or current customer.
+
+        :param folder_ids: list of folder ids.
+        :param pcid: targeted pcid.
+        :param concurrency: max number of deletions in flight.
+        :param fail_fast: stop and raise BulkRequestException on the first failure.
+        :return: list of BulkResult objects (result/error per folder id) in the input order.
+        """
+        return self.submit_many(
+            lambda folder_id: self.delete_folder(folder_id, pcid),
+            folder_ids,
+            concurrency=concurrency,
+            fail_fast=fail_fast,
+        )
+
     def get_folder_rules(self, pcid: str = None):
         """Get devices folders of specified (if pcid not None) or current customer.
         Note: call with specified target pcid supposed to be performed by TAC-user.
@@ -0,0 +1,36 @@
+import pytest
+
+from hpe_glcp_automation_lib.libs.authn.user_api.session.core.streaming import (
+    iter_json_items,
+)
+
+
+@pytest.mark.parametrize(
+    "chunks, key, expected",
+    [
+        ([b"[12345.", b"5]"], None, [12345.5]),
+        ([b"[1e", b"5, 2]"], None, [1e5, 2]),
+        ([b"[-", b"7, 8", b"9]"], None, [-7, 89]),
+        ([b'{"devices": [{"a": 1}, 12.', b"5]}"], "devices", [{"a": 1}, 12.5]),
+        (
+            [b'{"count": 2, "devices": [{"serial": "S', b'N1"}, true]}'],
+            "devices",
+            [{"serial": "SN1"}, True],
+        ),
+    ],
+)
+def test_iter_json_items_chunk_boundary(chunks, key, expected):
+    assert list(iter_json_items(chunks, key)) == expected
+
+
+def test_iter_json_items_every_split():
+    document = '{"items": [1.5e3, {"b": [2, 3]}, "x\\"y", -0.25, null]}'.encode()
+    expected = [1500.0, {"b": [2, 3]}, 'x"y', -0.25, None]
+    for split in range(1, len(document)):
+        chunks = [document[:split], document[split:]]
+        assert list(iter_json_items(chunks, "items")) == expected, split
+
+
+def test_iter_json_items_truncated():
+    with pytest.raises(ValueError):
+        list(iter_json_items([b"[1, 2"]))